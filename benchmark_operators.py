@@ -0,0 +1,67 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: benchmark_operators.py
+
+"""Benchmarks the cost-driven conversions of `propositions.operators.to_basis`
+against the fixed conversions of `propositions.operators` on large random
+formulas over all operators (which requires the Chapter 3 operators to be
+enabled in `propositions.syntax`)."""
+
+import time
+from random import Random
+from typing import Sequence
+
+from propositions.syntax import *
+from propositions.operators import *
+from propositions.workloads import random_formula
+
+#: The fixed conversions of `propositions.operators`, with the constants and
+#: operators of their bases.
+CONVERSIONS = [(to_not_and_or, {'~', '&', '|'}), (to_not_and, {'~', '&'}),
+               (to_nand, {'-&'}), (to_implies_not, {'->', '~'}),
+               (to_implies_false, {'->', 'F'})]
+
+#: The operators of the random formulas, with their relative weights.
+OPERATORS = {'~': 1, '&': 1, '|': 1, '->': 1, '+': 1, '<->': 1, '-&': 1,
+             '-|': 1}
+
+def benchmark_operators(depths: Sequence[int] = (10, 14, 18),
+                        seed: int = 0) -> None:
+    """Prints the size (as a DAG) of the conversion of a random formula of each
+    of the given depths to each basis, and the time to convert it, by the
+    fixed conversion and by `to_basis` under each cost model.
+
+    Parameters:
+        depths: depths of the random formulas.
+        seed: seed of the formulas.
+    """
+    assert is_binary('+'), 'Change is_binary() before benchmarking Chapter 3.'
+    print('| depth | input nodes | basis | conversion       |   nodes '
+          '| time (s) |')
+    print('|-------|-------------|-------|------------------|---------'
+          '|----------|')
+    rng = Random(seed)
+    for depth in depths:
+        formula = random_formula(rng, 8, depth, OPERATORS,
+                                 leaf_probability=0.05,
+                                 constant_probability=0.05)
+        size = node_count(formula)
+        for fixed, basis in CONVERSIONS:
+            name = ''.join(sorted(basis))
+            candidates = [(fixed.__name__, fixed)] + \
+                [(cost_model,
+                  lambda formula, cost_model=cost_model:
+                      to_basis(formula, basis, cost_model))
+                 for cost_model in COST_MODELS]
+            for label, convert in candidates:
+                start = time.perf_counter()
+                converted = convert(formula)
+                elapsed = time.perf_counter() - start
+                print('| %5d | %11d | %5s | %-16s | %7d | %8.4f |' %
+                      (depth, size, name, label, node_count(converted),
+                       elapsed))
+
+if __name__ == '__main__':
+    benchmark_operators()
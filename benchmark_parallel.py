@@ -0,0 +1,49 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: benchmark_parallel.py
+
+"""Benchmarks the sharded multi-process tautology check of
+`propositions.parallel` on tautologies, whose models must all be evaluated,
+against different numbers of worker processes."""
+
+import os
+import time
+from typing import Optional, Sequence
+
+from propositions.syntax import *
+from propositions.parallel import counterexample
+from propositions.workloads import balanced_formula
+
+def benchmark_parallel(sizes: Sequence[int] = (22, 24, 26),
+                       processes: Optional[Sequence[int]] = None) -> None:
+    """Prints the time to verify a tautology of each of the given numbers of
+    variable names with each of the given numbers of worker processes, and
+    the speedup over a single worker process.
+
+    Parameters:
+        sizes: numbers of variable names of the tautologies.
+        processes: numbers of worker processes, or ``None`` for the powers of
+            two up to the number of processors.
+    """
+    if processes is None:
+        n_processors = os.cpu_count() or 1
+        processes = [1 << k for k in range(n_processors.bit_length())]
+    print('| vars | processes | time (s) | speedup |')
+    print('|------|-----------|----------|---------|')
+    for n_variables in sizes:
+        names = [Formula('x' + str(i)) for i in range(1, n_variables + 1)]
+        formula = Formula('->', balanced_formula('&', names),
+                          balanced_formula('|', names))
+        single = None
+        for count in processes:
+            start = time.perf_counter()
+            assert counterexample(formula, count) is None
+            elapsed = time.perf_counter() - start
+            single = single or elapsed
+            print('| %4d | %9d | %8.3f | %7.2f |' %
+                  (n_variables, count, elapsed, single / elapsed))
+
+if __name__ == '__main__':
+    benchmark_parallel()
@@ -0,0 +1,150 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: benchmark_parse.py
+
+"""Benchmarks the cursor-based parser behind `propositions.syntax.Formula.parse`
+against the previous recursive, suffix-slicing parser."""
+
+import sys
+import time
+from typing import Callable, Tuple, Union
+
+from propositions.syntax import *
+
+def recursive_parse_prefix(string: str) -> Tuple[Union[Formula, None], str]:
+    """The previous implementation of `Formula._parse_prefix`, which recurses
+    once per nesting level and slices off a new suffix at every step.
+
+    Parameters:
+        string: string to parse.
+
+    Returns:
+        A pair of the parsed formula and the unparsed suffix of the string, or
+        of ``None`` and an error message.
+    """
+    if string == '':
+        return None, 'End of input'
+    sym = string[0]
+    if is_constant(sym):
+        return Formula(sym), string[1:]
+    if sym == '(':
+        now, ost = recursive_parse_prefix(string[1:])
+        if now is None:
+            return None, ost
+        if ost == '':
+            return None, 'Missing operator'
+        chr = None
+        for i in ['<->', '-&', '->', '-|', '&', '|', '+']:
+            if ost.startswith(i):
+                chr = i
+                ost = ost[len(i):]
+                break
+        if chr is None:
+            return None, 'Invalid operator'
+        if not is_binary(chr):
+            return None, 'Invalid operator'
+        next, ost = recursive_parse_prefix(ost)
+        if next is None:
+            return None, ost
+        if ost == '' or ost[0] != ')':
+            return None, 'Not closed'
+        return Formula(chr, now, next), ost[1:]
+    if sym == '~':
+        leaf, ost = recursive_parse_prefix(string[1:])
+        if leaf is None:
+            return None, ost
+        return Formula('~', leaf), ost
+    if 'p' <= sym <= 'z':
+        num = 1
+        while num < len(string) and string[num].isdecimal():
+            num += 1
+        res = string[:num]
+        if not is_variable(res):
+            return None, 'Invalid'
+        return Formula(res), string[num:]
+    return None, 'Invalid pref'
+
+def right_deep_formula_string(depth: int) -> str:
+    """Generates the standard string representation of a right-nested chain of
+    conjunctions.
+
+    Parameters:
+        depth: number of conjunctions in the chain.
+
+    Returns:
+        The string ``'(x1&(x2&(...&(x``\\ `depth`\\ ``&y)...)))'``.
+    """
+    return ''.join('(x' + str(i) + '&' for i in range(1, depth + 1)) + 'y' + \
+           ')' * depth
+
+def balanced_formula_string(depth: int) -> str:
+    """Generates the standard string representation of a balanced tree of
+    disjunctions.
+
+    Parameters:
+        depth: depth of the tree.
+
+    Returns:
+        The standard string representation of a complete binary tree of
+        disjunctions of the given depth, with ``2``\\ ``**``\\ `depth` leaves
+        ``'x1'``, ``'x2'``, ... .
+    """
+    pieces = []
+    counter = [0]
+    def build(depth: int) -> None:
+        if depth == 0:
+            counter[0] += 1
+            pieces.append('x' + str(counter[0]))
+        else:
+            pieces.append('(')
+            build(depth - 1)
+            pieces.append('|')
+            build(depth - 1)
+            pieces.append(')')
+    build(depth)
+    return ''.join(pieces)
+
+def time_parser(parser: Callable[[str], object], string: str) -> float:
+    """Times a single run of the given parser on the given string.
+
+    Parameters:
+        parser: parser to time.
+        string: string to parse.
+
+    Returns:
+        The number of seconds that the run took.
+    """
+    start = time.perf_counter()
+    parser(string)
+    return time.perf_counter() - start
+
+def benchmark_parse(right_deep_depths=(100, 300, 1000, 20000, 100000),
+                    balanced_depths=(8, 11, 14, 17)) -> None:
+    """Prints the parsing times of both parsers on right-nested formulas and on
+    balanced formulas of the given depths. The recursive parser is only run
+    while its recursion fits within the recursion limit.
+
+    Parameters:
+        right_deep_depths: nesting depths of the right-nested formulas to
+            parse.
+        balanced_depths: depths of the balanced formulas to parse.
+    """
+    print('| shape      | depth  | length   | recursive (s)  | cursor (s) |')
+    print('|------------|--------|----------|----------------|------------|')
+    for shape, depths, generator in \
+            [('right-deep', right_deep_depths, right_deep_formula_string),
+             ('balanced', balanced_depths, balanced_formula_string)]:
+        for depth in depths:
+            string = generator(depth)
+            new = time_parser(Formula._parse_prefix, string)
+            if 2 * depth + 50 < sys.getrecursionlimit():
+                old = '%14.4f' % time_parser(recursive_parse_prefix, string)
+            else:
+                old = '%14s' % 'RecursionError'
+            print('| %-10s | %-6d | %-8d | %s | %10.4f |' %
+                  (shape, depth, len(string), old, new))
+
+if __name__ == '__main__':
+    benchmark_parse()
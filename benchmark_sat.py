@@ -0,0 +1,67 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: benchmark_sat.py
+
+"""Benchmarks the SAT solver behind `propositions.semantics.is_satisfiable` on
+random 3-CNF formulas near the satisfiability phase transition, against
+bit-parallel truth tables where those are feasible."""
+
+import time
+from random import Random
+from typing import Sequence
+
+from propositions.bitparallel import is_constant_function
+from propositions.sat import Solver, tseitin
+from propositions.workloads import random_cnf
+
+def benchmark_sat(sizes: Sequence[int] = (20, 50, 100, 150),
+                  instances: int = 10, ratio: float = 4.26,
+                  max_truth_table_variables: int = 22, seed: int = 0) -> None:
+    """Prints the average time to decide random 3-CNF formulas of each of the
+    given numbers of variable names, with the SAT solver and (for small
+    formulas) with truth tables, and the numbers of satisfiable formulas,
+    decisions, and conflicts.
+
+    Parameters:
+        sizes: numbers of variable names of the formulas.
+        instances: number of formulas of each size.
+        ratio: number of clauses per variable name.
+        max_truth_table_variables: maximal number of variable names for which
+            truth tables are also timed.
+        seed: seed of the formulas.
+    """
+    print('| vars | clauses | sat/all | decisions | conflicts | SAT (s)  '
+          '| truth table (s) |')
+    print('|------|---------|---------|-----------|-----------|----------'
+          '|-----------------|')
+    rng = Random(seed)
+    for n_variables in sizes:
+        n_clauses = round(ratio * n_variables)
+        satisfiable = decisions = conflicts = 0
+        sat_time = truth_table_time = 0.0
+        for _ in range(instances):
+            formula = random_cnf(rng, n_variables, n_clauses)
+            start = time.perf_counter()
+            clauses, _, root, n = tseitin(formula)
+            solver = Solver(n, clauses + [[root]])
+            result = solver.solve() is not None
+            sat_time += time.perf_counter() - start
+            satisfiable += result
+            decisions += solver.decisions
+            conflicts += solver.conflicts
+            if n_variables <= max_truth_table_variables:
+                start = time.perf_counter()
+                assert result == (not is_constant_function(formula, False))
+                truth_table_time += time.perf_counter() - start
+        truth_table = '%15.4f' % (truth_table_time / instances) \
+                      if n_variables <= max_truth_table_variables else \
+                      '%15s' % '-'
+        print('| %4d | %7d | %3d/%-3d | %9.0f | %9.0f | %8.4f | %s |' %
+              (n_variables, n_clauses, satisfiable, instances,
+               decisions / instances, conflicts / instances,
+               sat_time / instances, truth_table))
+
+if __name__ == '__main__':
+    benchmark_sat()
@@ -0,0 +1,235 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: benchmark_syntax.py
+
+"""Micro-benchmarks for the propositions.syntax module.
+
+Each operation is run on generated formulas of controlled size and shape, and
+its throughput and peak memory are reported and compared against a stored JSON
+baseline. Run ``python benchmark_syntax.py --help`` for the options."""
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, \
+                   Tuple
+
+from propositions.syntax import *
+
+#: The default baseline file, next to this file.
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'benchmark_syntax_baseline.json')
+
+#: The shapes of generated formulas.
+SHAPES = ('balanced', 'left-deep', 'right-deep')
+
+#: The default numbers of nodes of generated formulas.
+SIZES = (10, 100, 1000, 10000, 100000, 1000000)
+
+_OPERATORS = ('&', '|', '->')
+
+def generate_formula(shape: str, size: int) -> Formula:
+    """Generates a formula of the given shape with about the given number of
+    nodes, whose binary operators cycle through ``'&'``, ``'|'``, and
+    ``'->'``, and whose leaves cycle through the variable names ``'p0'``, ...,
+    ``'p15'``, with every third leaf negated.
+
+    Parameters:
+        shape: ``'balanced'`` for a balanced tree, or ``'left-deep'`` or
+            ``'right-deep'`` for a chain of binary operators whose first or
+            second operand, respectively, is the rest of the chain.
+        size: requested number of nodes.
+
+    Returns:
+        The generated formula.
+    """
+    assert shape in SHAPES
+    leaves = max(1, size * 3 // 7)
+    formulas = []
+    for i in range(leaves):
+        leaf = Formula('p' + str(i % 16))
+        formulas.append(Formula('~', leaf) if i % 3 == 2 else leaf)
+    if shape == 'balanced':
+        level = 0
+        while len(formulas) > 1:
+            paired = [Formula(_OPERATORS[(level + i) % 3], formulas[i],
+                              formulas[i + 1])
+                      for i in range(0, len(formulas) - 1, 2)]
+            if len(formulas) % 2 == 1:
+                paired.append(formulas[-1])
+            formulas = paired
+            level += 1
+        return formulas[0]
+    formula = formulas[0]
+    for i, leaf in enumerate(formulas[1:]):
+        if shape == 'left-deep':
+            formula = Formula(_OPERATORS[i % 3], formula, leaf)
+        else:
+            formula = Formula(_OPERATORS[i % 3], leaf, formula)
+    return formula
+
+def _fresh(string: str) -> Formula:
+    """Parses the given string, so that memoized methods of the returned
+    formula are not yet memoized.
+
+    Parameters:
+        string: standard string representation of the formula to parse.
+
+    Returns:
+        A new formula whose standard string representation is the given string.
+    """
+    return Formula.parse(string)
+
+#: The benchmarked operations, each a pair of a function that computes the
+#: argument of the operation (untimed) from the standard string representation
+#: and the polish notation representation of a formula, and the (timed)
+#: operation on that argument.
+OPERATIONS: Dict[str, Tuple[Callable[[str, str], Any], Callable[[Any], Any]]] \
+    = {'parse': (lambda string, polish: string, Formula.parse),
+       'repr': (lambda string, polish: _fresh(string), repr),
+       'variables': (lambda string, polish: _fresh(string),
+                     lambda formula: formula.variables()),
+       'operators': (lambda string, polish: _fresh(string),
+                     lambda formula: formula.operators()),
+       'polish': (lambda string, polish: _fresh(string),
+                  lambda formula: formula.polish()),
+       'parse_polish': (lambda string, polish: polish, Formula.parse_polish),
+       'substitute_variables':
+           (lambda string, polish: _fresh(string),
+            lambda formula: formula.substitute_variables(
+                {'p0': Formula('&', Formula('q'), Formula('r')),
+                 'p1': Formula('p2')})),
+       'substitute_operators':
+           (lambda string, polish: _fresh(string),
+            lambda formula: formula.substitute_operators(
+                {'&': Formula('~', Formula('|', Formula('~', Formula('p')),
+                                           Formula('~', Formula('q'))))}))}
+
+def measure(prepare: Callable[[], Any], operation: Callable[[Any], Any],
+            min_time: float) -> Optional[Tuple[float, int]]:
+    """Measures the throughput and peak memory of the given operation.
+
+    Parameters:
+        prepare: function that computes a fresh argument for the operation.
+        operation: operation to measure.
+        min_time: minimal total number of seconds to run the operation for,
+            (the operation is run at least once).
+
+    Returns:
+        A pair of the number of operations per second and the peak number of
+        bytes allocated during a single operation, or ``None`` if the operation
+        is not implemented (i.e., returns ``None``).
+    """
+    argument = prepare()
+    tracemalloc.start()
+    try:
+        result = operation(argument)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    if result is None:
+        return None
+    del result
+    runs, elapsed = 0, 0.0
+    while runs == 0 or elapsed < min_time:
+        argument = prepare()
+        start = time.perf_counter()
+        operation(argument)
+        elapsed += time.perf_counter() - start
+        runs += 1
+    return runs / elapsed, peak
+
+def run(sizes: Sequence[int] = SIZES, shapes: Sequence[str] = SHAPES,
+        operations: Sequence[str] = tuple(OPERATIONS), min_time: float = 0.2,
+        baseline: Optional[Mapping[str, Mapping[str, float]]] = None,
+        tolerance: float = 0.2) -> Dict[str, Dict[str, float]]:
+    """Runs the benchmarks and prints a table of their results. Operations
+    that are not implemented or that exceed the recursion limit are reported as
+    such and omitted from the returned results.
+
+    Parameters:
+        sizes: numbers of nodes of the formulas to run on.
+        shapes: shapes of the formulas to run on.
+        operations: names of the operations to run, out of `OPERATIONS`.
+        min_time: minimal number of seconds to run each benchmark for.
+        baseline: results of a previous run to compare to, or ``None``.
+        tolerance: fraction of its baseline throughput below which a benchmark
+            is flagged as slower.
+
+    Returns:
+        A mapping from the key ``'``\\ `operation`\\ ``/``\\ `shape`\\ ``/``\\
+        `size`\\ ``'`` of each implemented benchmark to a mapping with the
+        number of operations per second (``'ops_per_second'``) and the peak
+        number of bytes allocated (``'peak_bytes'``).
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    print('| %-39s | %12s | %12s | %-16s |' %
+          ('benchmark', 'ops/s', 'peak KiB', 'vs. baseline'))
+    print('|-%s-|-%s-|-%s-|-%s-|' % ('-' * 39, '-' * 12, '-' * 12, '-' * 16))
+    for shape in shapes:
+        for size in sizes:
+            formula = generate_formula(shape, size)
+            string, polish = str(formula), formula.polish()
+            del formula
+            for name in operations:
+                prepare, operation = OPERATIONS[name]
+                key = name + '/' + shape + '/' + str(size)
+                try:
+                    measured = measure(lambda: prepare(string, polish),
+                                       operation, min_time)
+                except RecursionError:
+                    measured = 'RecursionError'
+                if measured is None or type(measured) is str:
+                    print('| %-39s | %12s | %12s | %-16s |' %
+                          (key, '-', '-', measured or 'not implemented'))
+                    continue
+                ops_per_second, peak = measured
+                results[key] = {'ops_per_second': ops_per_second,
+                                'peak_bytes': peak}
+                comparison = ''
+                if baseline is not None and key in baseline:
+                    ratio = ops_per_second / baseline[key]['ops_per_second']
+                    comparison = '%.2fx' % ratio
+                    if ratio < 1 - tolerance:
+                        comparison += ' SLOWER'
+                print('| %-39s | %12.1f | %12.1f | %-16s |' %
+                      (key, ops_per_second, peak / 1024, comparison))
+    return results
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    """Runs the benchmarks according to the given command-line arguments.
+
+    Parameters:
+        arguments: command-line arguments, or ``None`` for those of the current
+            process.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--shapes', nargs='+', choices=SHAPES, default=SHAPES)
+    parser.add_argument('--operations', nargs='+', choices=tuple(OPERATIONS),
+                        default=tuple(OPERATIONS))
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='minimal seconds per benchmark')
+    parser.add_argument('--baseline', default=BASELINE_PATH,
+                        help='JSON baseline to compare to or save')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='slowdown fraction that is flagged')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='save the results as the new baseline')
+    options = parser.parse_args(arguments)
+    baseline = None
+    if not options.save_baseline and os.path.exists(options.baseline):
+        with open(options.baseline) as file:
+            baseline = json.load(file)
+    results = run(options.sizes, options.shapes, options.operations,
+                  options.min_time, baseline, options.tolerance)
+    if options.save_baseline:
+        with open(options.baseline, 'w') as file:
+            json.dump(results, file, indent=1, sort_keys=True)
+
+if __name__ == '__main__':
+    main()
@@ -6,8 +6,10 @@
 
 """Python infrastructure for the Mathematical Logic through Programming book."""
 
-from functools import lru_cache, wraps
-from typing import Any, Callable, Dict, Iterator, Set, Type, TypeVar, cast
+from functools import wraps
+from threading import Lock
+from typing import AbstractSet, Any, Callable, Dict, FrozenSet, Iterator, \
+                   List, Optional, Set, Tuple, Type, TypeVar, cast
 
 T = TypeVar('T')
 
@@ -51,6 +53,79 @@ def frozen(cls: Type[T]) -> Type[T]:
     setattr(cls, '__init__', init_wrapper)
     return cls
 
+class _ImmutableMeta(type):
+    """The metaclass of `Immutable`.
+
+    Generates the ``__slots__`` of each class from the names of its annotated
+    instance variables and of its memoized methods, and pairs each class with
+    a mutable variant of it (with the same slots), in which new instances of
+    the class are constructed before being switched to the class itself.
+    """
+    def __new__(mcs, name: str, bases: Tuple[type, ...],
+                namespace: Dict[str, Any], mutable_variant: bool = False):
+        if not mutable_variant and '__slots__' not in namespace:
+            slots = [variable
+                     for variable in namespace.get('__annotations__', {})
+                     if variable not in namespace]
+            for value in namespace.values():
+                attribute = getattr(value, 'memoization_attribute', None)
+                if attribute is not None:
+                    slots.append(attribute)
+            namespace['__slots__'] = tuple(slots)
+        cls = super().__new__(mcs, name, bases, namespace)
+        if not mutable_variant:
+            cls._mutable_variant = _ImmutableMeta(
+                name, (cls,), {'__slots__': (), '__module__': cls.__module__,
+                               '__qualname__': cls.__qualname__,
+                               '__setattr__': object.__setattr__,
+                               '__delattr__': object.__delattr__},
+                mutable_variant=True)
+        return cls
+
+    def __init__(cls, name: str, bases: Tuple[type, ...],
+                 namespace: Dict[str, Any], mutable_variant: bool = False):
+        super().__init__(name, bases, namespace)
+
+    def __call__(cls, *args, **kwargs):
+        mutable_variant = cls._mutable_variant
+        instance = cls.__new__(mutable_variant, *args, **kwargs)
+        if type(instance) is mutable_variant:
+            instance.__init__(*args, **kwargs)
+            object.__setattr__(instance, '__class__', cls)
+        return instance
+
+class Immutable(metaclass=_ImmutableMeta):
+    """A base class for classes whose instance variables cannot be assigned to
+    or deleted after construction.
+
+    Instance variables are stored in ``__slots__``, which are generated from
+    the annotated instance variables of each class (and from the memoized
+    methods of each class, see `memoized_parameterless_method`). Assignment is
+    unrestricted during ``__init__``, and construction adds only a single
+    class switch on top of plain object construction. If ``__new__`` returns
+    an existing instance, then ``__init__`` is not called on it.
+    """
+    __slots__ = ('__weakref__',)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise Exception("Cannot assign to field '" + name +
+                        "' of immutable class '" + type(self).__name__ + "'")
+
+    def __delattr__(self, name: str) -> None:
+        raise Exception("Cannot delete field '" + name +
+                        "' of immutable class '" + type(self).__name__ + "'")
+
+    def __setstate__(self, state: Tuple[Any, Dict[str, Any]]) -> None:
+        """Restores the instance variables of the current object when it is
+        unpickled or copied.
+
+        Parameters:
+            state: pair of ``None`` and a mapping from instance variable names
+                to their values.
+        """
+        for name, value in state[1].items():
+            object.__setattr__(self, name, value)
+
 class frozendict(Dict[Any, Any]):
     """An immutable variant of the built-in `dict` class."""
 
@@ -64,6 +139,70 @@ class frozendict(Dict[Any, Any]):
                   popitem = setdefault =  cast(Callable[..., Any], update)
 S = TypeVar('S')
 
+#: Numbers of hits and misses of each memoized method, keyed by the qualified
+#: names of the methods, while counting is on (see
+#: `set_memoization_statistics`), or ``None`` while counting is off.
+_memoization_statistics: Optional[Dict[str, List[int]]] = None
+
+def set_memoization_statistics(enabled: bool) -> None:
+    """Turns counting of the hits and misses of memoized methods on or off. The
+    counts are reset either way.
+
+    Parameters:
+        enabled: whether to count hits and misses of memoized methods.
+    """
+    global _memoization_statistics
+    _memoization_statistics = {} if enabled else None
+
+def memoization_statistics() -> Dict[str, Tuple[int, int]]:
+    """Reports the hits and misses of memoized methods since counting was
+    turned on.
+
+    Returns:
+        A mapping from the qualified name of each memoized method that was
+        called since counting was turned on, to the number of calls that
+        returned the memoized value and the number of calls that calculated it.
+    """
+    assert _memoization_statistics is not None, 'Counting is off'
+    return {name: (hits, misses)
+            for name, (hits, misses) in _memoization_statistics.items()}
+
+def _memoize(method: Callable[[T], S], freeze: bool) -> Callable[[T], Any]:
+    """Memoizes the given parameterless method, as described in
+    `memoized_parameterless_method` and `memoized_parameterless_set_method`.
+
+    Parameters:
+        method: method to modify.
+        freeze: whether to memoize sets as frozen sets and return the memoized
+            value itself, rather than memoize the value as is and return a copy
+            of it if it has a `copy`\\ ``()`` method.
+
+    Returns:
+        The given method, modified to memoize its value.
+    """
+    attribute = '_memoized_' + method.__name__
+    name = method.__qualname__
+    @wraps(method)
+    def wrapper(obj):
+        try:
+            value = getattr(obj, attribute)
+        except AttributeError:
+            value = method(obj)
+            if freeze and isinstance(value, AbstractSet) and \
+               not isinstance(value, frozenset):
+                value = frozenset(value)
+            object.__setattr__(obj, attribute, value)
+            if _memoization_statistics is not None:
+                _memoization_statistics.setdefault(name, [0, 0])[1] += 1
+        else:
+            if _memoization_statistics is not None:
+                _memoization_statistics.setdefault(name, [0, 0])[0] += 1
+        if not freeze and hasattr(value, 'copy'):
+            return value.copy()
+        return value
+    wrapper.memoization_attribute = attribute # type: ignore
+    return wrapper
+
 def memoized_parameterless_method(method: Callable[[T], S]) -> Callable[[T], S]:
     """A method decorator for parameterless methods of immutable classes that
     memoizes the return value to avoid recalculation.
@@ -74,23 +213,125 @@ def memoized_parameterless_method(method: Callable[[T], S]) -> Callable[[T], S]:
     Returns:
         The given method, modified so that after its first execution, its
         functionality is replaced with simply returning the value calculated by
-        its first execution. If the value calculated by the given method has a
+        its first execution, which is stored in the instance variable
+        `memoization_attribute` of the returned method (a slot, in subclasses of
+        `Immutable`). If the value calculated by the given method has a
         `copy`\\ ``()`` method, then instead of returning this value, each
         execution of the returned method, including the first one, makes a fresh
         call to this `copy`\\ ``()`` method and returns the result.
     """
-    methodname = method.__name__
-    @wraps(method)
-    def wrapper(obj):
-        value = method(obj)
-        if hasattr(value, 'copy'):
-            new_wrapper = lambda:value.copy()
-        else:
-            new_wrapper = lambda:value
-        object.__setattr__(obj, methodname, wraps(method)(new_wrapper))
-        return new_wrapper()
-    return wrapper
+    return _memoize(method, False)
+
+def memoized_parameterless_set_method(method: Callable[[T], AbstractSet[S]]) \
+        -> Callable[[T], FrozenSet[S]]:
+    """A method decorator for set-returning parameterless methods of immutable
+    classes that memoizes the return value as a frozen set, to avoid both
+    recalculation and copying.
+
+    Parameters:
+        method: method to modify.
+
+    Returns:
+        The given method, modified so that after its first execution, its
+        functionality is replaced with simply returning the value calculated by
+        its first execution, converted to a `frozenset` (if it is a set that is
+        not already frozen). This same frozen set is returned by every
+        execution, without copying.
+    """
+    return _memoize(method, True)
+
+
+class SymbolTable:
+    """A table that interns symbol names (e.g., variable names or operators) of
+    some logic, assigning each name a consecutive integer id and a kind that is
+    computed only once, when the name is first interned.
+
+    Attributes:
+        kinds (`~typing.Dict`\\[`str`, `str`]): mapping from each interned name
+            to its kind. May be read directly as a fast path for `kind`, but
+            must not be modified.
+    """
+    kinds: Dict[str, str]
+
+    def __init__(self, classify: Callable[[str], Optional[str]]):
+        """Initializes an empty `SymbolTable` from the classifier of its logic.
+
+        Parameters:
+            classify: function that computes the kind of a given symbol name,
+                or ``None`` for a string that is not a symbol name.
+        """
+        self.kinds = {}
+        self._classify = classify
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """Computes the number of names interned in the current table.
+
+        Returns:
+            The number of names interned in the current table.
+        """
+        return len(self._names)
+
+    def kind(self, name: str) -> Optional[str]:
+        """Finds the kind of the given string, interning it if it is a symbol
+        name that is not yet interned.
+
+        Parameters:
+            name: string to find the kind of.
+
+        Returns:
+            The kind of the given string, or ``None`` if it is not a symbol
+            name.
+        """
+        kind = self.kinds.get(name)
+        if kind is None:
+            kind = self._classify(name)
+            if kind is not None:
+                self._intern(name, kind)
+        return kind
+
+    def id(self, name: str) -> int:
+        """Finds the id of the given symbol name, interning it if it is not yet
+        interned.
+
+        Parameters:
+            name: symbol name to find the id of.
+
+        Returns:
+            The id of the given symbol name.
+        """
+        id = self._ids.get(name)
+        if id is None:
+            assert self.kind(name) is not None, 'Not a symbol: ' + name
+            id = self._ids[name]
+        return id
+
+    def name(self, id: int) -> str:
+        """Finds the symbol name with the given id.
+
+        Parameters:
+            id: id of an interned symbol name.
+
+        Returns:
+            The symbol name with the given id.
+        """
+        return self._names[id]
+
+    def _intern(self, name: str, kind: str) -> None:
+        """Interns the given symbol name with the given kind, unless it is
+        already interned.
 
+        Parameters:
+            name: symbol name to intern.
+            kind: kind of the given symbol name.
+        """
+        with self._lock:
+            if name not in self._ids:
+                self._ids[name] = len(self._names)
+                self._names.append(name)
+                self.kinds[name] = kind
 
 class __prefix_with_index_sequence_generator:
     """ A generator for a sequence of the form 'z1', 'z2', 'z3', ..., where the
@@ -125,7 +366,6 @@ fresh_variable_name_generator: Iterator[str] = \
 fresh_constant_name_generator: Iterator[str] = \
     __prefix_with_index_sequence_generator('e')
 
-@lru_cache(maxsize=100) # Cache the return value of is_z_and_number
 def is_z_and_number(string: str) -> bool:
     """Checks if the given string is ``z`` followed by a number.
 
@@ -9,7 +9,7 @@
 from __future__ import annotations
 from typing import AbstractSet, FrozenSet, Mapping, Sequence, Tuple, Union
 
-from logic_utils import frozen, frozendict
+from logic_utils import Immutable, frozendict
 
 from propositions.semantics import is_tautology as is_propositional_tautology
 
@@ -19,8 +19,7 @@ from predicates.syntax import *
 #: terms, variable names, and formulas respectively.
 InstantiationMap = Mapping[str, Union[Term, str, Formula]]
 
-@frozen
-class Schema:
+class Schema(Immutable):
     """An immutable schema of predicate-logic formulas, comprised of a formula
     along with the constant names, variable names, and nullary or unary relation
     names in that formula that serve as templates. A template constant name is a
@@ -356,8 +355,7 @@ class Schema:
                 assert isinstance(instantiation_map[construct], Formula)
         # Task 9.4
 
-@frozen
-class Proof:
+class Proof(Immutable):
     """An immutable deductive proof in Predicate Logic, comprised of a list of
     assumptions/axioms, a conclusion, and a list of lines that prove the
     conclusion from (instances of) these assumptions/axioms and from
@@ -388,8 +386,7 @@ class Proof:
         self.conclusion = conclusion
         self.lines = tuple(lines)
 
-    @frozen
-    class AssumptionLine:
+    class AssumptionLine(Immutable):
         """An immutable proof line justified as an instance of an
         assumption/axiom.
 
@@ -459,8 +456,7 @@ class Proof:
             assert line_number < len(lines) and lines[line_number] is self
             # Task 9.5
     
-    @frozen
-    class MPLine:
+    class MPLine(Immutable):
         """An immutable proof line justified by the Modus Ponens (MP) inference
         rule.
 
@@ -524,8 +520,7 @@ class Proof:
             assert line_number < len(lines) and lines[line_number] is self
             # Task 9.6
 
-    @frozen
-    class UGLine:
+    class UGLine(Immutable):
         """An immutable proof line justified by the Universal Generalization
         (UG) inference rule.
 
@@ -579,8 +574,7 @@ class Proof:
             assert line_number < len(lines) and lines[line_number] is self
             # Task 9.7
 
-    @frozen
-    class TautologyLine:
+    class TautologyLine(Immutable):
         """An immutable proof line justified as a tautology.
 
         Attributes:
@@ -8,15 +8,14 @@
 
 from typing import AbstractSet, FrozenSet, Generic, Mapping, Tuple, TypeVar
 
-from logic_utils import frozen, frozendict
+from logic_utils import Immutable, frozendict
 
 from predicates.syntax import *
 
 #: A generic type for a universe element in a model.
 T = TypeVar('T')
 
-@frozen
-class Model(Generic[T]):
+class Model(Immutable, Generic[T]):
     """An immutable model for predicate-logic constructs.
 
     Attributes:
@@ -7,11 +7,12 @@
 """Syntactic handling of predicate-logic expressions."""
 
 from __future__ import annotations
-from functools import lru_cache
-from typing import AbstractSet, Mapping, Optional, Sequence, Set, Tuple, Union
+from typing import AbstractSet, FrozenSet, Mapping, Optional, Sequence, \
+                   Tuple, Union
 
-from logic_utils import fresh_variable_name_generator, frozen, \
-                        memoized_parameterless_method
+from logic_utils import Immutable, SymbolTable, fresh_variable_name_generator, \
+                        memoized_parameterless_method, \
+                        memoized_parameterless_set_method
 
 from propositions.syntax import Formula as PropositionalFormula, \
                                 is_variable as is_propositional_variable
@@ -37,7 +38,58 @@ class ForbiddenVariableError(Exception):
         assert is_variable(variable_name)
         self.variable_name = variable_name
 
-@lru_cache(maxsize=100) # Cache the return value of is_constant
+def _classify(string: str) -> Optional[str]:
+    """Computes the kind of the given string in predicate logic.
+
+    Parameters:
+        string: string to classify.
+
+    Returns:
+        ``'constant'``, ``'variable'``, ``'function'``, ``'equality'``,
+        ``'relation'``, ``'unary'``, ``'binary'``, or ``'quantifier'`` if the
+        given string is a constant name, a variable name, a function name, the
+        equality relation, a relation name, a unary operator, a binary
+        operator, or a quantifier, respectively; ``None`` otherwise.
+    """
+    if (((string[0] >= '0' and string[0] <= '9') or \
+         (string[0] >= 'a' and string[0] <= 'e')) and \
+        string.isalnum()) or string == '_':
+        return 'constant'
+    if string[0] >= 'u' and string[0] <= 'z' and string.isalnum():
+        return 'variable'
+    if string[0] >= 'f' and string[0] <= 't' and string.isalnum():
+        return 'function'
+    if string == '=':
+        return 'equality'
+    if string[0] >= 'F' and string[0] <= 'T' and string.isalnum():
+        return 'relation'
+    if string == '~':
+        return 'unary'
+    if string == '&' or string == '|' or string == '->':
+        return 'binary'
+    if string == 'A' or string == 'E':
+        return 'quantifier'
+    return None
+
+#: The symbol table of predicate logic, in which the kind of each constant
+#: name, variable name, function name, relation name, operator, and quantifier
+#: is computed once.
+SYMBOLS = SymbolTable(_classify)
+
+_symbol_kinds = SYMBOLS.kinds
+
+def symbol_kind(string: str) -> Optional[str]:
+    """Finds the kind of the given string in predicate logic.
+
+    Parameters:
+        string: string to check.
+
+    Returns:
+        The kind of the given string as computed by `_classify`, or ``None``
+        if the given string is not a symbol of predicate logic.
+    """
+    return _symbol_kinds.get(string) or SYMBOLS.kind(string)
+
 def is_constant(string: str) -> bool:
     """Checks if the given string is a constant name.
 
@@ -47,11 +99,8 @@ def is_constant(string: str) -> bool:
     Returns:
         ``True`` if the given string is a constant name, ``False`` otherwise.
     """
-    return  (((string[0] >= '0' and string[0] <= '9') or \
-              (string[0] >= 'a' and string[0] <= 'e')) and \
-             string.isalnum()) or string == '_'
+    return (_symbol_kinds.get(string) or SYMBOLS.kind(string)) == 'constant'
 
-@lru_cache(maxsize=100) # Cache the return value of is_variable
 def is_variable(string: str) -> bool:
     """Checks if the given string is a variable name.
 
@@ -61,9 +110,8 @@ def is_variable(string: str) -> bool:
     Returns:
         ``True`` if the given string is a variable name, ``False`` otherwise.
     """
-    return string[0] >= 'u' and string[0] <= 'z' and string.isalnum()
+    return (_symbol_kinds.get(string) or SYMBOLS.kind(string)) == 'variable'
 
-@lru_cache(maxsize=100) # Cache the return value of is_function
 def is_function(string: str) -> bool:
     """Checks if the given string is a function name.
 
@@ -73,10 +121,9 @@ def is_function(string: str) -> bool:
     Returns:
         ``True`` if the given string is a function name, ``False`` otherwise.
     """
-    return string[0] >= 'f' and string[0] <= 't' and string.isalnum()
+    return (_symbol_kinds.get(string) or SYMBOLS.kind(string)) == 'function'
 
-@frozen
-class Term:
+class Term(Immutable):
     """An immutable predicate-logic term in tree representation, composed from
     variable names and constant names, and function names applied to them.
 
@@ -97,11 +144,12 @@ class Term:
             arguments: the arguments for the root, if the root is a function
                 name.
         """
-        if is_constant(root) or is_variable(root):
+        kind = _symbol_kinds.get(root) or SYMBOLS.kind(root)
+        if kind == 'constant' or kind == 'variable':
             assert arguments is None
             self.root = root
         else:
-            assert is_function(root)
+            assert kind == 'function'
             assert arguments is not None and len(arguments) > 0
             self.root = root
             self.arguments = tuple(arguments)
@@ -170,7 +218,8 @@ class Term:
         """
         # Task 7.3b
 
-    def constants(self) -> Set[str]:
+    @memoized_parameterless_set_method
+    def constants(self) -> FrozenSet[str]:
         """Finds all constant names in the current term.
 
         Returns:
@@ -178,7 +227,8 @@ class Term:
         """
         # Task 7.5a
 
-    def variables(self) -> Set[str]:
+    @memoized_parameterless_set_method
+    def variables(self) -> FrozenSet[str]:
         """Finds all variable names in the current term.
 
         Returns:
@@ -186,7 +236,8 @@ class Term:
         """
         # Task 7.5b
 
-    def functions(self) -> Set[Tuple[str, int]]:
+    @memoized_parameterless_set_method
+    def functions(self) -> FrozenSet[Tuple[str, int]]:
         """Finds all function names in the current term, along with their
         arities.
 
@@ -237,7 +288,6 @@ class Term:
             assert is_variable(variable)
         # Task 9.1
 
-@lru_cache(maxsize=100) # Cache the return value of is_equality
 def is_equality(string: str) -> bool:
     """Checks if the given string is the equality relation.
 
@@ -248,9 +298,8 @@ def is_equality(string: str) -> bool:
         ``True`` if the given string is the equality relation, ``False``
         otherwise.
     """
-    return string == '='
+    return (_symbol_kinds.get(string) or SYMBOLS.kind(string)) == 'equality'
 
-@lru_cache(maxsize=100) # Cache the return value of is_relation
 def is_relation(string: str) -> bool:
     """Checks if the given string is a relation name.
 
@@ -260,9 +309,8 @@ def is_relation(string: str) -> bool:
     Returns:
         ``True`` if the given string is a relation name, ``False`` otherwise.
     """
-    return string[0] >= 'F' and string[0] <= 'T' and string.isalnum()
+    return (_symbol_kinds.get(string) or SYMBOLS.kind(string)) == 'relation'
 
-@lru_cache(maxsize=100) # Cache the return value of is_unary
 def is_unary(string: str) -> bool:
     """Checks if the given string is a unary operator.
 
@@ -272,9 +320,8 @@ def is_unary(string: str) -> bool:
     Returns:
         ``True`` if the given string is a unary operator, ``False`` otherwise.
     """
-    return string == '~'
+    return (_symbol_kinds.get(string) or SYMBOLS.kind(string)) == 'unary'
 
-@lru_cache(maxsize=100) # Cache the return value of is_binary
 def is_binary(string: str) -> bool:
     """Checks if the given string is a binary operator.
 
@@ -284,9 +331,8 @@ def is_binary(string: str) -> bool:
     Returns:
         ``True`` if the given string is a binary operator, ``False`` otherwise.
     """
-    return string == '&' or string == '|' or string == '->'
+    return (_symbol_kinds.get(string) or SYMBOLS.kind(string)) == 'binary'
 
-@lru_cache(maxsize=100) # Cache the return value of is_quantifier
 def is_quantifier(string: str) -> bool:
     """Checks if the given string is a quantifier.
 
@@ -296,10 +342,9 @@ def is_quantifier(string: str) -> bool:
     Returns:
         ``True`` if the given string is a quantifier, ``False`` otherwise.
     """
-    return string == 'A' or string == 'E'
+    return (_symbol_kinds.get(string) or SYMBOLS.kind(string)) == 'quantifier'
 
-@frozen
-class Formula:
+class Formula(Immutable):
     """An immutable predicate-logic formula in tree representation, composed
     from relation names applied to predicate-logic terms, and operators and
     quantifications applied to them.
@@ -344,28 +389,29 @@ class Formula:
                 a binary operator; the statement to be quantified by the root,
                 if the root is a quantification.
         """
-        if is_equality(root) or is_relation(root):
+        kind = _symbol_kinds.get(root) or SYMBOLS.kind(root)
+        if kind == 'equality' or kind == 'relation':
             # Populate self.root and self.arguments
             assert isinstance(arguments_or_first_or_variable, Sequence) and \
                    not isinstance(arguments_or_first_or_variable, str)
-            if is_equality(root):
+            if kind == 'equality':
                 assert len(arguments_or_first_or_variable) == 2
             assert second_or_statement is None
             self.root, self.arguments = \
                 root, tuple(arguments_or_first_or_variable)
-        elif is_unary(root):
+        elif kind == 'unary':
             # Populate self.first
             assert isinstance(arguments_or_first_or_variable, Formula)
             assert second_or_statement is None
             self.root, self.first = root, arguments_or_first_or_variable
-        elif is_binary(root):
+        elif kind == 'binary':
             # Populate self.first and self.second
             assert isinstance(arguments_or_first_or_variable, Formula)
             assert second_or_statement is not None
             self.root, self.first, self.second = \
                 root, arguments_or_first_or_variable, second_or_statement
         else:
-            assert is_quantifier(root)
+            assert kind == 'quantifier'
             # Populate self.variable and self.statement
             assert isinstance(arguments_or_first_or_variable, str) and \
                    is_variable(arguments_or_first_or_variable)
@@ -438,7 +484,8 @@ class Formula:
         """
         # Task 7.4b
 
-    def constants(self) -> Set[str]:
+    @memoized_parameterless_set_method
+    def constants(self) -> FrozenSet[str]:
         """Finds all constant names in the current formula.
 
         Returns:
@@ -446,7 +493,8 @@ class Formula:
         """
         # Task 7.6a
 
-    def variables(self) -> Set[str]:
+    @memoized_parameterless_set_method
+    def variables(self) -> FrozenSet[str]:
         """Finds all variable names in the current formula.
 
         Returns:
@@ -454,7 +502,8 @@ class Formula:
         """
         # Task 7.6b
 
-    def free_variables(self) -> Set[str]:
+    @memoized_parameterless_set_method
+    def free_variables(self) -> FrozenSet[str]:
         """Finds all variable names that are free in the current formula.
 
         Returns:
@@ -463,7 +512,8 @@ class Formula:
         """
         # Task 7.6c
 
-    def functions(self) -> Set[Tuple[str, int]]:
+    @memoized_parameterless_set_method
+    def functions(self) -> FrozenSet[Tuple[str, int]]:
         """Finds all function names in the current formula, along with their
         arities.
 
@@ -473,7 +523,8 @@ class Formula:
         """
         # Task 7.6d
 
-    def relations(self) -> Set[Tuple[str, int]]:
+    @memoized_parameterless_set_method
+    def relations(self) -> FrozenSet[Tuple[str, int]]:
         """Finds all relation names in the current formula, along with their
         arities.
 
@@ -366,6 +366,26 @@ def test_from_propositional_skeleton(debug=False):
                   'returned', formula)
         assert str(formula) == expected
 
+def test_symbol_kinds(debug=False):
+    for string, kind in [('c12', 'constant'), ('0', 'constant'),
+                         ('_', 'constant'), ('x12', 'variable'),
+                         ('plus', 'function'), ('=', 'equality'),
+                         ('R', 'relation'), ('GT', 'relation'),
+                         ('~', 'unary'), ('->', 'binary'), ('A', 'quantifier'),
+                         ('E', 'quantifier'), ('x+', None), ('(', None)]:
+        if debug:
+            print('Testing the kind of', string)
+        assert symbol_kind(string) == kind
+        for classifier, classifier_kind in [
+                (is_constant, 'constant'), (is_variable, 'variable'),
+                (is_function, 'function'), (is_equality, 'equality'),
+                (is_relation, 'relation'), (is_unary, 'unary'),
+                (is_binary, 'binary'), (is_quantifier, 'quantifier')]:
+            assert classifier(string) == (kind == classifier_kind)
+    for i in range(1, 10001):
+        assert is_variable('z' + str(i))
+        assert SYMBOLS.name(SYMBOLS.id('z' + str(i))) == 'z' + str(i)
+
 def test_ex7(debug=False):
     test_term_repr(debug) 
     test_formula_repr(debug)
@@ -389,5 +409,6 @@ def test_ex9(debug=False):
     test_from_propositional_skeleton(debug)
 
 def test_all(debug=False):
+    test_symbol_kinds(debug)
     test_ex7(debug)
     test_ex9(debug)
@@ -0,0 +1,131 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: predicates/workloads.py
+
+"""Seeded random workloads of predicate-logic terms, formulas, and models."""
+
+from itertools import product
+from random import Random
+from typing import Mapping, Sequence
+
+from logic_utils import frozendict
+
+from predicates.syntax import *
+from predicates.semantics import *
+
+from propositions.workloads import stream, write_lines
+
+def random_term(rng: Random, depth: int, constants: Sequence[str],
+                variables: Sequence[str],
+                functions: Mapping[str, int] = frozendict(),
+                leaf_probability: float = 0.25) -> Term:
+    """Generates a random term over the given signature.
+
+    Parameters:
+        rng: source of randomness.
+        depth: maximal depth of the term.
+        constants: constant names that the term may contain.
+        variables: variable names that the term may contain.
+        functions: mapping from each function name that the term may contain
+            to its arity.
+        leaf_probability: probability that a non-root node whose depth is
+            smaller than `depth` is a constant name or a variable name rather
+            than a function invocation.
+
+    Returns:
+        The generated term.
+    """
+    leaves = list(constants) + list(variables)
+    assert len(leaves) > 0
+    if depth == 0 or len(functions) == 0 or \
+       (leaf_probability > 0 and rng.random() < leaf_probability):
+        return Term(rng.choice(leaves))
+    function = rng.choice(sorted(functions))
+    return Term(function,
+                [random_term(rng, depth - 1, constants, variables, functions,
+                             leaf_probability)
+                 for _ in range(functions[function])])
+
+def random_formula(rng: Random, depth: int, constants: Sequence[str],
+                   variables: Sequence[str], relations: Mapping[str, int],
+                   functions: Mapping[str, int] = frozendict(),
+                   term_depth: int = 1, equality: bool = True,
+                   quantifier_probability: float = 0.2,
+                   leaf_probability: float = 0.25) -> Formula:
+    """Generates a random formula over the given signature.
+
+    Parameters:
+        rng: source of randomness.
+        depth: maximal depth of the formula, not counting its terms.
+        constants: constant names that the formula may contain.
+        variables: variable names that the formula may contain, free or
+            quantified.
+        relations: mapping from each relation name that the formula may
+            contain to its arity.
+        functions: mapping from each function name that the formula may
+            contain to its arity.
+        term_depth: maximal depth of the terms of the formula.
+        equality: whether the formula may contain equalities.
+        quantifier_probability: probability that a non-leaf node is a
+            quantification rather than an operator.
+        leaf_probability: probability that a non-root node whose depth is
+            smaller than `depth` is an equality or a relation invocation.
+
+    Returns:
+        The generated formula.
+    """
+    if depth == 0 or (leaf_probability > 0 and rng.random() < leaf_probability):
+        roots = sorted(relations) + (['='] if equality else [])
+        assert len(roots) > 0
+        root = rng.choice(roots)
+        arity = 2 if root == '=' else relations[root]
+        return Formula(root, [random_term(rng, term_depth, constants,
+                                          variables, functions)
+                              for _ in range(arity)])
+    def operand() -> Formula:
+        return random_formula(rng, depth - 1, constants, variables, relations,
+                              functions, term_depth, equality,
+                              quantifier_probability, leaf_probability)
+    if len(variables) > 0 and rng.random() < quantifier_probability:
+        return Formula(rng.choice(('A', 'E')), rng.choice(variables),
+                       operand())
+    root = rng.choice(('~', '&', '|', '->'))
+    if root == '~':
+        return Formula(root, operand())
+    return Formula(root, operand(), operand())
+
+def random_model(rng: Random, universe_size: int, constants: Sequence[str],
+                 relations: Mapping[str, int],
+                 functions: Mapping[str, int] = frozendict(),
+                 density: float = 0.5) -> Model[int]:
+    """Generates a random model over the given signature.
+
+    Parameters:
+        rng: source of randomness.
+        universe_size: number of elements of the universe of the model.
+        constants: constant names to interpret.
+        relations: mapping from each relation name to interpret to its arity.
+        functions: mapping from each function name to interpret to its arity.
+        density: probability of each argument tuple to be in the interpretation
+            of each relation name.
+
+    Returns:
+        The generated model, whose universe is ``{0,``...\\ ``,``\\
+        `universe_size`\\ ``-1}``.
+    """
+    assert universe_size > 0
+    universe = range(universe_size)
+    return Model(
+        set(universe),
+        {constant: rng.randrange(universe_size) for constant in constants},
+        {relation: {arguments
+                    for arguments in product(universe,
+                                             repeat=relations[relation])
+                    if rng.random() < density}
+         for relation in relations},
+        {function: {arguments: rng.randrange(universe_size)
+                    for arguments in product(universe,
+                                             repeat=functions[function])}
+         for function in functions})
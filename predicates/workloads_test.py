@@ -0,0 +1,93 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: predicates/workloads_test.py
+
+"""Tests for the predicates.workloads module."""
+
+from random import Random
+
+from predicates.workloads import *
+
+constants = ['c', 'd']
+variables = ['x', 'y']
+functions = {'f': 1, 'g': 2}
+relations = {'R': 1, 'S': 2}
+
+def _structure(construct):
+    if isinstance(construct, Term):
+        return (construct.root,) + tuple(_structure(argument) for argument in
+                                         getattr(construct, 'arguments', ()))
+    if is_equality(construct.root) or is_relation(construct.root):
+        return (construct.root,) + tuple(_structure(argument)
+                                         for argument in construct.arguments)
+    if is_unary(construct.root):
+        return construct.root, _structure(construct.first)
+    if is_binary(construct.root):
+        return construct.root, _structure(construct.first), \
+               _structure(construct.second)
+    return construct.root, construct.variable, _structure(construct.statement)
+
+def _depth(structure):
+    return max([_depth(child) + 1 for child in structure[1:]
+                if type(child) is tuple], default=0)
+
+def _terms(structure):
+    if is_equality(structure[0]) or is_relation(structure[0]):
+        return list(structure[1:])
+    return [term for child in structure[1:] if type(child) is tuple
+            for term in _terms(child)]
+
+def test_random_term(debug=False):
+    for seed in range(20):
+        if debug:
+            print('Testing random term with seed', seed)
+        term = _structure(random_term(Random(seed), 3, constants, variables,
+                                      functions))
+        assert term == _structure(random_term(Random(seed), 3, constants,
+                                              variables, functions))
+        assert _depth(term) <= 3
+        stack = [term]
+        while len(stack) > 0:
+            root, *arguments = stack.pop()
+            if len(arguments) == 0:
+                assert root in constants + variables
+            else:
+                assert functions[root] == len(arguments)
+                stack.extend(arguments)
+
+def test_random_formula(debug=False):
+    for seed in range(20):
+        if debug:
+            print('Testing random formula with seed', seed)
+        formula = _structure(random_formula(Random(seed), 4, constants,
+                                            variables, relations, functions))
+        assert formula == _structure(random_formula(
+            Random(seed), 4, constants, variables, relations, functions))
+        for term in _terms(formula):
+            assert _depth(term) <= 1
+    formula = random_formula(Random(0), 0, constants, variables, {'R': 3}, {},
+                             equality=False)
+    assert formula.root == 'R' and len(formula.arguments) == 3
+
+def test_random_model(debug=False):
+    if debug:
+        print('Testing random model')
+    model = random_model(Random(0), 3, constants, relations, functions)
+    assert model.universe == {0, 1, 2}
+    assert set(model.constant_interpretations) == set(constants)
+    assert model.function_arities == functions
+    assert len(model.function_interpretations['g']) == 9
+    for relation in relations:
+        assert model.relation_arities[relation] in (relations[relation], -1)
+    assert str(model) == str(random_model(Random(0), 3, constants, relations,
+                                          functions))
+    full = random_model(Random(0), 2, [], {'S': 2}, {}, 1)
+    assert full.relation_interpretations['S'] == \
+           {(0, 0), (0, 1), (1, 0), (1, 1)}
+
+def test_all(debug=False):
+    test_random_term(debug)
+    test_random_formula(debug)
+    test_random_model(debug)
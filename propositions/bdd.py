@@ -0,0 +1,858 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/bdd.py
+
+"""Reduced ordered binary decision diagrams of propositional formulas."""
+
+from __future__ import annotations
+
+import sys
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Set, \
+                   Tuple
+
+from logic_utils import Immutable
+
+from propositions.syntax import *
+from propositions.bitparallel import compile_program
+
+#: The node of the constant ``False`` function in every `BDD`.
+FALSE = 0
+
+#: The node of the constant ``True`` function in every `BDD`.
+TRUE = 1
+
+#: The static variable orderings supported by `variable_order`:
+#: ``'alphabetical'``; ``'appearance'``, by first occurrence from left to
+#: right; and ``'frequency'``, by decreasing number of occurrences in distinct
+#: subformulas, ties broken by first occurrence.
+ORDERINGS = ('alphabetical', 'appearance', 'frequency')
+
+#: The binary operators as 4-bit codes, bit ``2*a+b`` of which is the value of
+#: the operator applied to truth values ``a`` and ``b``.
+_OPERATOR_CODES = {'&': 0b1000, '|': 0b1110, '->': 0b1011, '+': 0b0110,
+                   '<->': 0b1001, '-&': 0b0111, '-|': 0b0001}
+
+#: The code in the computed table of negation.
+_NEGATION = 16
+
+def variable_order(formula: Formula, ordering: str = 'appearance') -> \
+        List[str]:
+    """Orders the variable names of the given formula by a static heuristic.
+
+    Parameters:
+        formula: formula to order the variable names of.
+        ordering: heuristic out of `ORDERINGS`.
+
+    Returns:
+        The variable names of the given formula, in the given order.
+    """
+    assert ordering in ORDERINGS
+    if ordering == 'alphabetical':
+        return sorted(formula.variables())
+    program = compile_program(formula)
+    appearance: List[str] = []
+    counts: Dict[str, int] = {}
+    for root, first, second, _ in program:
+        if first < 0 and is_variable(root) and root not in counts:
+            appearance.append(root)
+            counts[root] = 0
+        for operand in (first, second):
+            if operand >= 0 and program[operand][1] < 0 and \
+               is_variable(program[operand][0]):
+                counts[program[operand][0]] += 1
+    if ordering == 'appearance':
+        return appearance
+    positions = {variable: i for i, variable in enumerate(appearance)}
+    return sorted(appearance,
+                  key=lambda variable: (-counts[variable], positions[variable]))
+
+class BDD:
+    """A manager of reduced ordered binary decision diagrams over a common
+    sequence of variable names, all sharing one node store.
+
+    Every node other than `FALSE` and `TRUE` is a triplet of a variable, a low
+    child (for the variable being ``False``), and a high child, kept unique by
+    a unique table, so that equal functions are represented by the same node.
+    Binary operations are memoized in a computed table. Nodes that are not
+    reachable from any live `Function` are reclaimed by garbage collection,
+    which runs at the start of an operation once the number of nodes exceeds
+    a threshold. Variables may be reordered in place, which preserves the
+    function of every node.
+
+    Attributes:
+        gc_threshold (`int`): number of nodes above which the next operation
+            first collects garbage; doubled whenever at least half of the
+            nodes survive a collection.
+    """
+    gc_threshold: int
+
+    def __init__(self, variables: Sequence[str] = (),
+                 gc_threshold: int = 100000):
+        """Initializes an empty `BDD` manager.
+
+        Parameters:
+            variables: initial variable names, from the top level down.
+            gc_threshold: initial value for `gc_threshold`.
+        """
+        self.gc_threshold = gc_threshold
+        self._names: List[str] = []
+        self._indices: Dict[str, int] = {}
+        self._order: List[int] = []
+        self._levels: List[int] = []
+        self._variable = [-1, -1]
+        self._low = [FALSE, TRUE]
+        self._high = [FALSE, TRUE]
+        self._unique: Dict[Tuple[int, int, int], int] = {}
+        self._nodes_of: List[Set[int]] = []
+        self._free: List[int] = []
+        self._computed: Dict[Tuple[int, int, int], int] = {}
+        self._external: Dict[int, int] = {}
+        self._peak_nodes = 0
+        self._cache_hits = self._cache_misses = 0
+        self._collections = self._collected = self._swaps = 0
+        for variable in variables:
+            self.add_variable(variable)
+
+    @property
+    def variables(self) -> List[str]:
+        """The variable names of the current manager, from the top level
+        down."""
+        return [self._names[index] for index in self._order]
+
+    def add_variable(self, variable: str) -> None:
+        """Adds the given variable name at the bottom level of the current
+        manager, unless it is already there.
+
+        Parameters:
+            variable: variable name to add.
+        """
+        assert is_variable(variable)
+        if variable in self._indices:
+            return
+        index = len(self._names)
+        self._names.append(variable)
+        self._indices[variable] = index
+        self._levels.append(len(self._order))
+        self._order.append(index)
+        self._nodes_of.append(set())
+
+    def _level(self, node: int) -> int:
+        """Finds the level of the given node.
+
+        Parameters:
+            node: node of the current manager.
+
+        Returns:
+            The level of the variable of the given node, or the number of
+            variables for `FALSE` and `TRUE`.
+        """
+        variable = self._variable[node]
+        return self._levels[variable] if variable >= 0 else len(self._order)
+
+    def _make(self, variable: int, low: int, high: int) -> int:
+        """Finds or creates the unique node with the given variable and
+        children.
+
+        Parameters:
+            variable: index of the variable of the node.
+            low: low child, at a lower level than the given variable.
+            high: high child, at a lower level than the given variable.
+
+        Returns:
+            The node, or the given low child if it is the given high child.
+        """
+        if low == high:
+            return low
+        key = (variable, low, high)
+        node = self._unique.get(key)
+        if node is not None:
+            return node
+        if len(self._free) > 0:
+            node = self._free.pop()
+            self._variable[node] = variable
+            self._low[node] = low
+            self._high[node] = high
+        else:
+            node = len(self._variable)
+            self._variable.append(variable)
+            self._low.append(low)
+            self._high.append(high)
+        self._unique[key] = node
+        self._nodes_of[variable].add(node)
+        self._peak_nodes = max(self._peak_nodes, len(self._unique))
+        return node
+
+    def _negate(self, node: int) -> int:
+        """Negates the function of the given node.
+
+        Parameters:
+            node: node of the current manager.
+
+        Returns:
+            The node of the negation of the function of the given node.
+        """
+        # Pairs of a node and whether the negations of its children are
+        # already on top of the results
+        results: List[int] = []
+        stack = [(node, False)]
+        while len(stack) > 0:
+            node, done = stack.pop()
+            if done:
+                high = results.pop()
+                low = results.pop()
+                result = self._make(self._variable[node], low, high)
+                self._computed[(_NEGATION, node, node)] = result
+                results.append(result)
+                continue
+            if node <= TRUE:
+                results.append(TRUE - node)
+                continue
+            result = self._computed.get((_NEGATION, node, node))
+            if result is not None:
+                self._cache_hits += 1
+                results.append(result)
+                continue
+            self._cache_misses += 1
+            stack.append((node, True))
+            stack.append((self._high[node], False))
+            stack.append((self._low[node], False))
+        return results[0]
+
+    def _unary(self, pattern: int, node: int) -> int:
+        """Applies a unary Boolean function to the function of the given node.
+
+        Parameters:
+            pattern: 2-bit code, bit ``b`` of which is the value of the unary
+                function on the truth value ``b``.
+            node: node of the current manager.
+
+        Returns:
+            The node of the given unary function applied to the function of the
+            given node.
+        """
+        if pattern == 0b00:
+            return FALSE
+        if pattern == 0b11:
+            return TRUE
+        return node if pattern == 0b10 else self._negate(node)
+
+    def _apply_terminal(self, code: int, first: int, second: int) -> \
+            Optional[int]:
+        """Applies a binary operator to the functions of the given nodes, if
+        either of them is constant or if they are the same node.
+
+        Parameters:
+            code: 4-bit code of the operator, as in `_OPERATOR_CODES`.
+            first: node of the first operand.
+            second: node of the second operand.
+
+        Returns:
+            The node of the given operator applied to the functions of the
+            given nodes, or ``None`` if neither of them is constant and they
+            are distinct nodes.
+        """
+        if first <= TRUE:
+            if second <= TRUE:
+                return code >> (2 * first + second) & 1
+            return self._unary(code >> (2 * first) & 0b11, second)
+        if second <= TRUE:
+            return self._unary(code >> second & 1 |
+                               (code >> (2 + second) & 1) << 1, first)
+        if first == second:
+            return self._unary(code & 1 | (code >> 3 & 1) << 1, first)
+        return None
+
+    def _apply(self, code: int, first: int, second: int) -> int:
+        """Applies a binary operator to the functions of the given nodes.
+
+        Parameters:
+            code: 4-bit code of the operator, as in `_OPERATOR_CODES`.
+            first: node of the first operand.
+            second: node of the second operand.
+
+        Returns:
+            The node of the given operator applied to the functions of the
+            given nodes.
+        """
+        # Triplets of two operand nodes, or of a key of the computed table
+        # and the variable of its node once the results of applying the
+        # operator to the children are on top of the results
+        results: List[int] = []
+        stack: List[Tuple[object, int, bool]] = [(first, second, False)]
+        while len(stack) > 0:
+            first, second, done = stack.pop()
+            if done:
+                high = results.pop()
+                low = results.pop()
+                result = self._make(second, low, high)
+                self._computed[first] = result
+                results.append(result)
+                continue
+            result = self._apply_terminal(code, first, second)
+            if result is not None:
+                results.append(result)
+                continue
+            if first > second and (code >> 1 ^ code >> 2) & 1 == 0:
+                first, second = second, first
+            key = (code, first, second)
+            result = self._computed.get(key)
+            if result is not None:
+                self._cache_hits += 1
+                results.append(result)
+                continue
+            self._cache_misses += 1
+            first_level, second_level = self._level(first), self._level(second)
+            level = min(first_level, second_level)
+            first_low, first_high = \
+                (self._low[first], self._high[first]) \
+                if first_level == level else (first, first)
+            second_low, second_high = \
+                (self._low[second], self._high[second]) \
+                if second_level == level else (second, second)
+            stack.append((key, self._order[level], True))
+            stack.append((first_high, second_high, False))
+            stack.append((first_low, second_low, False))
+        return results[0]
+
+    def _maybe_collect_garbage(self) -> None:
+        """Collects garbage if the number of nodes exceeds `gc_threshold`."""
+        if len(self._unique) > self.gc_threshold:
+            self.collect_garbage()
+            if len(self._unique) > self.gc_threshold // 2:
+                self.gc_threshold *= 2
+
+    def _reachable(self) -> Set[int]:
+        """Finds the nodes reachable from live functions.
+
+        Returns:
+            The set of nodes, other than `FALSE` and `TRUE`, that are
+            reachable from the node of a live `Function`.
+        """
+        reachable = set()
+        stack = [node for node in self._external if node > TRUE]
+        while len(stack) > 0:
+            node = stack.pop()
+            if node in reachable:
+                continue
+            reachable.add(node)
+            for child in (self._low[node], self._high[node]):
+                if child > TRUE and child not in reachable:
+                    stack.append(child)
+        return reachable
+
+    def collect_garbage(self) -> int:
+        """Reclaims the nodes that are not reachable from any live `Function`,
+        and clears the computed table.
+
+        Returns:
+            The number of reclaimed nodes.
+        """
+        reachable = self._reachable()
+        collected = 0
+        for key, node in list(self._unique.items()):
+            if node not in reachable:
+                del self._unique[key]
+                self._nodes_of[key[0]].discard(node)
+                self._variable[node] = -1
+                self._free.append(node)
+                collected += 1
+        self._computed.clear()
+        self._collections += 1
+        self._collected += collected
+        return collected
+
+    def statistics(self) -> Dict[str, int]:
+        """Reports the sizes and counters of the current manager.
+
+        Returns:
+            A mapping from ``'variables'``, ``'nodes'`` (in the unique table),
+            ``'live_nodes'`` (reachable from live functions), ``'peak_nodes'``,
+            ``'free_slots'``, ``'computed_entries'``, ``'cache_hits'``,
+            ``'cache_misses'``, ``'garbage_collections'``,
+            ``'collected_nodes'``, ``'swaps'`` (of adjacent levels), and
+            ``'memory_bytes'`` (of the tables of the manager, excluding the
+            integers in them), to their current values.
+        """
+        tables = (self._variable, self._low, self._high, self._unique,
+                  self._computed, self._free, self._external)
+        return {'variables': len(self._order),
+                'nodes': len(self._unique),
+                'live_nodes': len(self._reachable()),
+                'peak_nodes': self._peak_nodes,
+                'free_slots': len(self._free),
+                'computed_entries': len(self._computed),
+                'cache_hits': self._cache_hits,
+                'cache_misses': self._cache_misses,
+                'garbage_collections': self._collections,
+                'collected_nodes': self._collected,
+                'swaps': self._swaps,
+                'memory_bytes': sum(sys.getsizeof(table) for table in tables)}
+
+    def true(self) -> Function:
+        """Computes the constant ``True`` function.
+
+        Returns:
+            The constant ``True`` function of the current manager.
+        """
+        return Function(self, TRUE)
+
+    def false(self) -> Function:
+        """Computes the constant ``False`` function.
+
+        Returns:
+            The constant ``False`` function of the current manager.
+        """
+        return Function(self, FALSE)
+
+    def variable(self, variable: str) -> Function:
+        """Computes the function of the given variable name, adding it at the
+        bottom level if it is new.
+
+        Parameters:
+            variable: variable name.
+
+        Returns:
+            The function that is ``True`` exactly when the given variable name
+            is ``True``.
+        """
+        self.add_variable(variable)
+        return Function(self, self._make(self._indices[variable], FALSE, TRUE))
+
+    def from_formula(self, formula: Formula) -> Function:
+        """Computes the function of the given formula, adding its new variable
+        names at the bottom levels in the order of their first occurrence.
+
+        Parameters:
+            formula: formula to convert. Its distinct subformulas are converted
+                once each, in a single non-recursive pass.
+
+        Returns:
+            The function of the given formula.
+        """
+        self._maybe_collect_garbage()
+        program = compile_program(formula)
+        nodes = [FALSE] * len(program)
+        for i, (root, first, second, frees) in enumerate(program):
+            if first < 0:
+                if is_variable(root):
+                    self.add_variable(root)
+                    nodes[i] = self._make(self._indices[root], FALSE, TRUE)
+                else:
+                    nodes[i] = TRUE if root == 'T' else FALSE
+            elif root == '~':
+                nodes[i] = self._negate(nodes[first])
+            else:
+                nodes[i] = self._apply(_OPERATOR_CODES[root], nodes[first],
+                                       nodes[second])
+        return Function(self, nodes[-1])
+
+    def _swap(self, level: int) -> None:
+        """Swaps the variables at the given level and the one below it, in
+        place, so that every node keeps its function.
+
+        Parameters:
+            level: level above the bottom level.
+        """
+        upper, lower = self._order[level], self._order[level + 1]
+        for node in list(self._nodes_of[upper]):
+            low, high = self._low[node], self._high[node]
+            low_split = self._variable[low] == lower
+            high_split = self._variable[high] == lower
+            if not low_split and not high_split:
+                continue
+            low_low, low_high = (self._low[low], self._high[low]) \
+                                if low_split else (low, low)
+            high_low, high_high = (self._low[high], self._high[high]) \
+                                  if high_split else (high, high)
+            del self._unique[upper, low, high]
+            self._nodes_of[upper].discard(node)
+            new_low = self._make(upper, low_low, high_low)
+            new_high = self._make(upper, low_high, high_high)
+            self._variable[node] = lower
+            self._low[node] = new_low
+            self._high[node] = new_high
+            self._unique[lower, new_low, new_high] = node
+            self._nodes_of[lower].add(node)
+        self._order[level], self._order[level + 1] = lower, upper
+        self._levels[upper], self._levels[lower] = level + 1, level
+        self._swaps += 1
+
+    def reorder(self, variables: Sequence[str]) -> None:
+        """Reorders the variable names of the current manager in place, by
+        swapping adjacent levels.
+
+        Parameters:
+            variables: permutation of the variable names of the current
+                manager, from the top level down.
+        """
+        assert sorted(variables) == sorted(self._names)
+        for level, variable in enumerate(variables):
+            current = self._levels[self._indices[variable]]
+            while current > level:
+                self._swap(current - 1)
+                current -= 1
+
+    def sift(self, max_growth: float = 1.2) -> int:
+        """Reorders the variable names of the current manager by Rudell's
+        sifting: each variable, from the one with the most nodes down, is moved
+        through all levels and then left at the level where the number of live
+        nodes was the smallest.
+
+        Parameters:
+            max_growth: factor of growth in the number of live nodes over the
+                best number so far, beyond which a variable is not moved
+                further in the same direction.
+
+        Returns:
+            The number of live nodes after sifting.
+        """
+        self.collect_garbage()
+        size = len(self._unique)
+        for index in sorted(range(len(self._names)),
+                            key=lambda index: -len(self._nodes_of[index])):
+            best_size, best_level = size, self._levels[index]
+            level = best_level
+            # Down to the bottom, then up to the top
+            for step, end in ((1, len(self._order) - 1), (-1, 0)):
+                while level != end:
+                    self._swap(level if step == 1 else level - 1)
+                    level += step
+                    size = len(self._reachable())
+                    if size < best_size:
+                        best_size, best_level = size, level
+                    if size > max_growth * best_size:
+                        break
+            while level < best_level:
+                self._swap(level)
+                level += 1
+            while level > best_level:
+                self._swap(level - 1)
+                level -= 1
+            self.collect_garbage()
+            size = len(self._unique)
+        return size
+
+class Function(Immutable):
+    """A Boolean function represented by a node of a `BDD` manager, which keeps
+    the node alive for as long as the function exists.
+
+    Attributes:
+        bdd (`BDD`): the manager of the node.
+        node (`int`): the node.
+    """
+    bdd: BDD
+    node: int
+
+    def __init__(self, bdd: BDD, node: int):
+        """Initializes a `Function` from its manager and node.
+
+        Parameters:
+            bdd: the manager of the node.
+            node: the node.
+        """
+        self.bdd = bdd
+        self.node = node
+        bdd._external[node] = bdd._external.get(node, 0) + 1
+
+    def __del__(self) -> None:
+        external = self.bdd._external
+        external[self.node] -= 1
+        if external[self.node] == 0:
+            del external[self.node]
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the current function with the given one, in constant time.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            ``True`` if the given object is a `Function` object of the same
+            manager that equals the current function, ``False`` otherwise.
+        """
+        return isinstance(other, Function) and self.bdd is other.bdd and \
+               self.node == other.node
+
+    def __ne__(self, other: object) -> bool:
+        """Compares the current function with the given one, in constant time.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            ``True`` if the given object is not a `Function` object of the same
+            manager that equals the current function, ``False`` otherwise.
+        """
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash(self.node)
+
+    def _binary(self, operator: str, other: Function) -> Function:
+        """Applies the given binary operator to the current function and the
+        given one.
+
+        Parameters:
+            operator: binary operator.
+            other: function of the same manager.
+
+        Returns:
+            The function of the given operator applied to the two functions.
+        """
+        assert self.bdd is other.bdd
+        self.bdd._maybe_collect_garbage()
+        return Function(self.bdd, self.bdd._apply(_OPERATOR_CODES[operator],
+                                                  self.node, other.node))
+
+    def __invert__(self) -> Function:
+        """Negates the current function.
+
+        Returns:
+            The negation of the current function.
+        """
+        return Function(self.bdd, self.bdd._negate(self.node))
+
+    def __and__(self, other: Function) -> Function:
+        """Conjoins the current function with the given one.
+
+        Parameters:
+            other: function of the same manager.
+
+        Returns:
+            The conjunction of the two functions.
+        """
+        return self._binary('&', other)
+
+    def __or__(self, other: Function) -> Function:
+        """Disjoins the current function with the given one.
+
+        Parameters:
+            other: function of the same manager.
+
+        Returns:
+            The disjunction of the two functions.
+        """
+        return self._binary('|', other)
+
+    def __xor__(self, other: Function) -> Function:
+        """Computes the exclusive or of the current function and the given one.
+
+        Parameters:
+            other: function of the same manager.
+
+        Returns:
+            The exclusive or of the two functions.
+        """
+        return self._binary('+', other)
+
+    def implies(self, other: Function) -> Function:
+        """Computes the implication from the current function to the given one.
+
+        Parameters:
+            other: function of the same manager.
+
+        Returns:
+            The implication from the current function to the given one.
+        """
+        return self._binary('->', other)
+
+    def iff(self, other: Function) -> Function:
+        """Computes the equivalence of the current function and the given one.
+
+        Parameters:
+            other: function of the same manager.
+
+        Returns:
+            The equivalence of the two functions.
+        """
+        return self._binary('<->', other)
+
+    def is_tautology(self) -> bool:
+        """Checks if the current function is constantly ``True``, in constant
+        time.
+
+        Returns:
+            ``True`` if the current function is constantly ``True``, ``False``
+            otherwise.
+        """
+        return self.node == TRUE
+
+    def is_contradiction(self) -> bool:
+        """Checks if the current function is constantly ``False``, in constant
+        time.
+
+        Returns:
+            ``True`` if the current function is constantly ``False``, ``False``
+            otherwise.
+        """
+        return self.node == FALSE
+
+    def is_satisfiable(self) -> bool:
+        """Checks if the current function is ever ``True``, in constant time.
+
+        Returns:
+            ``True`` if the current function is ever ``True``, ``False``
+            otherwise.
+        """
+        return self.node != FALSE
+
+    def _nodes(self) -> List[int]:
+        """Lists the nodes reachable from the current function, children first.
+
+        Returns:
+            The nodes, other than `FALSE` and `TRUE`, that are reachable from
+            the node of the current function, in postorder.
+        """
+        order = []
+        visited = set()
+        stack = [(self.node, False)]
+        while len(stack) > 0:
+            node, done = stack.pop()
+            if done:
+                order.append(node)
+            elif node > TRUE and node not in visited:
+                visited.add(node)
+                stack.append((node, True))
+                stack.append((self.bdd._high[node], False))
+                stack.append((self.bdd._low[node], False))
+        return order
+
+    def size(self) -> int:
+        """Counts the nodes of the current function.
+
+        Returns:
+            The number of nodes, other than `FALSE` and `TRUE`, that are
+            reachable from the node of the current function.
+        """
+        return len(self._nodes())
+
+    def support(self) -> Set[str]:
+        """Finds the variable names that the current function depends on.
+
+        Returns:
+            The variable names of the nodes of the current function.
+        """
+        bdd = self.bdd
+        return {bdd._names[bdd._variable[node]] for node in self._nodes()}
+
+    def count_models(self, variables: Optional[Sequence[str]] = None) -> int:
+        """Counts the models in which the current function is ``True``, in time
+        linear in the number of its nodes.
+
+        Parameters:
+            variables: variable names of the models (a superset of those that
+                the current function depends on), or ``None`` for the variable
+                names of the manager.
+
+        Returns:
+            The number of models over the given variable names in which the
+            current function is ``True``.
+        """
+        bdd = self.bdd
+        n_levels = len(bdd._order)
+        # The number of models over the variables from the level of each node
+        # down to the bottom level
+        counts = {FALSE: 0, TRUE: 1}
+        for node in self._nodes():
+            level = bdd._level(node)
+            low, high = bdd._low[node], bdd._high[node]
+            counts[node] = \
+                (counts[low] << (bdd._level(low) - level - 1)) + \
+                (counts[high] << (bdd._level(high) - level - 1))
+        total = counts[self.node] << bdd._level(self.node)
+        if variables is None:
+            return total
+        assert self.support().issubset(variables)
+        inside = sum(1 for variable in set(variables)
+                     if variable in bdd._indices)
+        return (total >> (n_levels - inside)) << (len(set(variables)) - inside)
+
+    def models(self, variables: Optional[Sequence[str]] = None) -> \
+            Iterator[Mapping[str, bool]]:
+        """Lazily enumerates the models in which the current function is
+        ``True``, one path of the diagram at a time.
+
+        Parameters:
+            variables: variable names of the models (a superset of those that
+                the current function depends on), or ``None`` for the variable
+                names of the manager.
+
+        Returns:
+            An iterator over all models over the given variable names in which
+            the current function is ``True``, each exactly once.
+        """
+        bdd = self.bdd
+        if variables is None:
+            variables = bdd.variables
+        assert self.support().issubset(variables)
+        stack: List[Tuple[int, Dict[str, bool]]] = [(self.node, {})]
+        while len(stack) > 0:
+            node, path = stack.pop()
+            if node == FALSE:
+                continue
+            if node != TRUE:
+                variable = bdd._names[bdd._variable[node]]
+                stack.append((bdd._high[node], dict(path, **{variable: True})))
+                stack.append((bdd._low[node], dict(path, **{variable: False})))
+                continue
+            # The variables that the path skips can take any value
+            unset = [variable for variable in variables
+                     if variable not in path]
+            for values in range(1 << len(unset)):
+                model = dict(path)
+                for i, variable in enumerate(unset):
+                    model[variable] = values >> (len(unset) - 1 - i) & 1 == 1
+                yield model
+
+    def to_formula(self) -> Formula:
+        """Converts the current function to a formula, as nested if-then-else
+        combinations of the nodes, with equal nodes sharing subformulas.
+
+        Returns:
+            A formula of the current function, containing only the variable
+            names that it depends on, and containing constants only if it is
+            constant.
+        """
+        bdd = self.bdd
+        formulas = {FALSE: Formula('F'), TRUE: Formula('T')}
+        for node in self._nodes():
+            variable = Formula(bdd._names[bdd._variable[node]])
+            low, high = bdd._low[node], bdd._high[node]
+            if low == FALSE and high == TRUE:
+                formula = variable
+            elif low == TRUE and high == FALSE:
+                formula = Formula('~', variable)
+            elif low == FALSE:
+                formula = Formula('&', variable, formulas[high])
+            elif high == FALSE:
+                formula = Formula('&', Formula('~', variable), formulas[low])
+            elif low == TRUE:
+                formula = Formula('->', variable, formulas[high])
+            elif high == TRUE:
+                formula = Formula('|', variable, formulas[low])
+            else:
+                formula = Formula('|', Formula('&', variable, formulas[high]),
+                                  Formula('&', Formula('~', variable),
+                                          formulas[low]))
+            formulas[node] = formula
+        return formulas[self.node]
+
+def to_bdd(formula: Formula, ordering: str = 'appearance',
+           sifting: bool = False) -> Function:
+    """Converts the given formula to a function of a new `BDD` manager.
+
+    Parameters:
+        formula: formula to convert.
+        ordering: static variable ordering out of `ORDERINGS`.
+        sifting: whether to then improve the order by `BDD.sift`.
+
+    Returns:
+        The function of the given formula.
+    """
+    bdd = BDD(variable_order(formula, ordering))
+    function = bdd.from_formula(formula)
+    if sifting:
+        bdd.sift()
+    return function
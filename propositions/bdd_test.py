@@ -0,0 +1,161 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/bdd_test.py
+
+"""Tests for the propositions.bdd module."""
+
+from random import Random
+
+from propositions.bdd import *
+from propositions.bitparallel import truth_table_bits
+from propositions.workloads import balanced_formula, random_formula, \
+                                   random_tautology
+
+def test_variable_order(debug=False):
+    formula = Formula.parse('((q&(p|r))->(r&~s))')
+    if debug:
+        print('Testing variable orders of', formula)
+    assert variable_order(formula, 'alphabetical') == ['p', 'q', 'r', 's']
+    assert variable_order(formula, 'appearance') == ['q', 'p', 'r', 's']
+    assert variable_order(formula, 'frequency') == ['r', 'q', 'p', 's']
+    assert variable_order(Formula.parse('~T')) == []
+
+def test_from_formula(debug=False):
+    rng = Random(0)
+    bdd = BDD(['x1', 'x2', 'x3', 'x4', 'x5', 'x6'])
+    functions = {}
+    for _ in range(100):
+        formula = random_formula(rng, 6, 5, constant_probability=0.05)
+        if debug:
+            print('Testing conversion of', formula)
+        function = bdd.from_formula(formula)
+        bits = truth_table_bits(formula, bdd.variables)
+        assert function.count_models() == bin(bits).count('1')
+        assert function.is_tautology() == (bits == 2 ** 64 - 1)
+        assert function.is_contradiction() == (bits == 0)
+        assert function.is_satisfiable() == (bits != 0)
+        assert function.support().issubset(formula.variables())
+        # Canonicity: equal functions are the same node
+        assert functions.setdefault(bits, function) == function
+        back = function.to_formula()
+        assert back.variables() == function.support() or \
+               function.node <= TRUE
+        assert truth_table_bits(back, bdd.variables) == bits
+    assert len(functions) > 10
+    assert bdd.statistics()['cache_hits'] > 0
+
+def test_operators(debug=False):
+    if debug:
+        print('Testing operators of BDD functions')
+    bdd = BDD()
+    p, q = bdd.variable('p'), bdd.variable('q')
+    for function, string in [(p & q, '(p&q)'), (p | q, '(p|q)'), (~p, '~p'),
+                             (p.implies(q), '(p->q)'),
+                             (p ^ q, '((p|q)&~(p&q))'),
+                             (p.iff(q), '((p->q)&(q->p))')]:
+        assert function == bdd.from_formula(Formula.parse(string)), string
+    assert (p | ~p) == bdd.true()
+    assert (p & ~p) == bdd.false()
+    assert p != q
+
+def test_tautologies(debug=False):
+    rng = Random(1)
+    for _ in range(20):
+        formula = random_tautology(rng, 5, 3)
+        if debug:
+            print('Testing BDD tautology check of', formula)
+        assert to_bdd(formula).is_tautology()
+
+def test_count_and_models(debug=False):
+    formula = Formula.parse('((p&q)|(~p&r))')
+    if debug:
+        print('Testing model counting and enumeration of', formula)
+    function = to_bdd(formula)
+    assert function.count_models() == 4
+    assert function.count_models(['p', 'q', 'r', 's']) == 8
+    models = list(function.models(['s', 'r', 'q', 'p']))
+    assert len(models) == 8
+    assert len({tuple(sorted(model.items())) for model in models}) == 8
+    for model in models:
+        assert set(model) == {'p', 'q', 'r', 's'}
+        assert (model['p'] and model['q']) or (not model['p'] and model['r'])
+    # Far beyond enumeration: at least one of 120 variables is True
+    names = ['x' + str(i) for i in range(120)]
+    function = to_bdd(balanced_formula('|', [Formula(name)
+                                             for name in names]))
+    assert function.count_models() == 2 ** 120 - 1
+    assert function.size() == 120
+
+def test_reordering(debug=False):
+    # (x1&y1)|...|(xn&yn) is linear in the interleaved order and exponential
+    # when all xi precede all yi
+    n = 6
+    pairs = [Formula('&', Formula('x' + str(i)), Formula('y' + str(i)))
+             for i in range(n)]
+    formula = balanced_formula('|', pairs)
+    bad = ['x' + str(i) for i in range(n)] + ['y' + str(i) for i in range(n)]
+    bdd = BDD(bad)
+    function = bdd.from_formula(formula)
+    if debug:
+        print('Testing reordering of', formula, 'of size', function.size())
+    assert function.size() == 2 ** (n + 1) - 2
+    bits = truth_table_bits(formula, bad)
+    good = [name for i in range(n) for name in ('x' + str(i), 'y' + str(i))]
+    bdd.reorder(good)
+    assert bdd.variables == good
+    assert function.size() == 2 * n
+    assert truth_table_bits(function.to_formula(), bad) == bits
+    bdd.reorder(bad)
+    assert function.size() == 2 ** (n + 1) - 2
+    size = bdd.sift()
+    if debug:
+        print('Sifted to', bdd.variables, 'of size', function.size())
+    assert size == function.size() == 2 * n
+    assert truth_table_bits(function.to_formula(), bad) == bits
+    assert function == bdd.from_formula(formula)
+    assert bdd.statistics()['swaps'] > 0
+
+def test_garbage_collection(debug=False):
+    if debug:
+        print('Testing garbage collection of BDD nodes')
+    bdd = BDD(gc_threshold=50)
+    rng = Random(2)
+    kept = bdd.from_formula(Formula.parse('((x1&x2)|(x3&~x4))'))
+    for _ in range(50):
+        bdd.from_formula(random_formula(rng, 8, 6))
+    statistics = bdd.statistics()
+    assert statistics['garbage_collections'] > 0
+    assert statistics['collected_nodes'] > 0
+    bdd.collect_garbage()
+    assert bdd.statistics()['nodes'] == kept.size() == 4
+    assert kept == bdd.from_formula(Formula.parse('((x3&~x4)|(x2&x1))'))
+
+def test_deep_order(debug=False):
+    if debug:
+        print('Testing functions with 1000 and 1500 levels')
+    names = [Formula('x' + str(i)) for i in range(1, 1001)]
+    bdd = BDD()
+    function = bdd.from_formula(balanced_formula('&', names))
+    negation = ~function
+    assert negation.size() == function.size() == 1000
+    assert negation.count_models() == 2 ** 1000 - 1
+    assert ~negation == function
+    assert (function | negation).is_tautology()
+    names = [Formula('x' + str(i)) for i in range(1, 1501)]
+    function = to_bdd(Formula('->', balanced_formula('|', names),
+                              balanced_formula('&', names)))
+    assert function.size() == 2 * 1500 - 1
+    assert function.count_models() == 2
+    assert set(map(len, function.models())) == {1500}
+
+def test_all(debug=False):
+    test_variable_order(debug)
+    test_from_formula(debug)
+    test_operators(debug)
+    test_tautologies(debug)
+    test_count_and_models(debug)
+    test_reordering(debug)
+    test_garbage_collection(debug)
+    test_deep_order(debug)
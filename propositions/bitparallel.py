@@ -0,0 +1,538 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/bitparallel.py
+
+"""Bit-parallel evaluation of propositional formulas over many models at
+once."""
+
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, \
+                   Optional, Sequence, Tuple
+from weakref import WeakKeyDictionary
+
+from propositions.syntax import *
+
+#: The maximal number of variable names whose models are evaluated together,
+#: i.e., each evaluation operates on bitvectors of at most
+#: ``2``\ ``**``\ `CHUNK_VARIABLES` bits, and formulas over more variable names
+#: are evaluated in several chunks.
+CHUNK_VARIABLES = 20
+
+#: The number of arbitrary models evaluated together by `evaluate_models`.
+MODELS_PER_BATCH = 4096
+
+#: The number of evaluations of a formula after which `evaluator` compiles it.
+COMPILE_THRESHOLD = 8
+
+#: An evaluation program: a sequence of instructions in topological order,
+#: each a quadruplet of a root, the indices of the two instructions that
+#: compute its operands (or ``-1``), and the indices of the instructions whose
+#: values are no longer needed after it.
+Program = List[Tuple[str, int, int, Tuple[int, ...]]]
+
+def compile_program(formula: Formula) -> Program:
+    """Flattens the given formula into a program that computes the value of
+    each of its distinct subformulas exactly once, and discards it once it is
+    no longer needed.
+
+    Parameters:
+        formula: formula to flatten. Subformulas that are the same object are
+            computed only once.
+
+    Returns:
+        A program whose last instruction computes the given formula.
+    """
+    # Postorder of the distinct subformulas, and the number of uses of each
+    order: List[Formula] = []
+    uses = {}
+    expanded = set()
+    stack: List[Tuple[Formula, bool]] = [(formula, False)]
+    while len(stack) > 0:
+        current, done = stack.pop()
+        if done:
+            order.append(current)
+            continue
+        if id(current) in expanded:
+            continue
+        expanded.add(id(current))
+        stack.append((current, True))
+        for attribute in ('next', 'now'):
+            operand = getattr(current, attribute, None)
+            if operand is not None:
+                uses[id(operand)] = uses.get(id(operand), 0) + 1
+                stack.append((operand, False))
+    indices = {}
+    program: Program = []
+    for current in order:
+        operands = []
+        frees = []
+        for attribute in ('now', 'next'):
+            operand = getattr(current, attribute, None)
+            if operand is None:
+                operands.append(-1)
+                continue
+            index = indices[id(operand)]
+            operands.append(index)
+            uses[id(operand)] -= 1
+            if uses[id(operand)] == 0:
+                frees.append(index)
+        indices[id(current)] = len(program)
+        program.append((current.root, operands[0], operands[1], tuple(frees)))
+    return program
+
+def compile_shared_program(formulas: Sequence[Formula]) -> \
+        Tuple[Program, List[int]]:
+    """Flattens the given formulas into a single program that computes the
+    value of each distinct subformula of any of them exactly once, where
+    subformulas are distinct if they differ in structure rather than in
+    identity, and keeps the values of the given formulas until the end.
+
+    Parameters:
+        formulas: formulas to flatten.
+
+    Returns:
+        A pair of the program and the respective indices of the instructions
+        that compute the given formulas.
+    """
+    # Instructions are shared by their roots and operand instructions, so
+    # subformulas that are equal but distinct objects are computed only once
+    shared: Dict[Tuple[str, int, int], int] = {}
+    indices: Dict[int, int] = {}
+    instructions: List[Tuple[str, int, int]] = []
+    outputs: List[int] = []
+    for formula in formulas:
+        stack: List[Tuple[Formula, bool]] = [(formula, False)]
+        while len(stack) > 0:
+            current, done = stack.pop()
+            if id(current) in indices:
+                continue
+            operands = [getattr(current, attribute, None)
+                        for attribute in ('now', 'next')]
+            if not done:
+                stack.append((current, True))
+                stack.extend((operand, False) for operand in reversed(operands)
+                             if operand is not None)
+                continue
+            key = (current.root,
+                   -1 if operands[0] is None else indices[id(operands[0])],
+                   -1 if operands[1] is None else indices[id(operands[1])])
+            index = shared.get(key)
+            if index is None:
+                index = shared[key] = len(instructions)
+                instructions.append(key)
+            indices[id(current)] = index
+        outputs.append(indices[id(formula)])
+    # Each value is discarded after its last use, unless it is an output
+    last_uses: Dict[int, int] = {}
+    for i, (_, first, second) in enumerate(instructions):
+        for operand in (first, second):
+            if operand >= 0:
+                last_uses[operand] = i
+    for output in outputs:
+        last_uses.pop(output, None)
+    frees: List[List[int]] = [[] for _ in instructions]
+    for operand, i in last_uses.items():
+        frees[i].append(operand)
+    program: Program = [(root, first, second, tuple(frees[i]))
+                        for i, (root, first, second)
+                        in enumerate(instructions)]
+    return program, outputs
+
+def run_program(program: Program, patterns: Mapping[str, int],
+                mask: int) -> int:
+    """Runs the given program on bitvectors.
+
+    Parameters:
+        program: program to run.
+        patterns: mapping from each variable name of the program to a
+            bitvector of its truth values in the evaluated models.
+        mask: bitvector whose bits are set exactly in the evaluated models.
+
+    Returns:
+        The bitvector of the truth values of the formula of the program in the
+        evaluated models.
+    """
+    return _run_values(program, patterns, mask)[-1]
+
+def _run_values(program: Program, patterns: Mapping[str, int],
+                mask: int) -> List[Optional[int]]:
+    """Runs the given program on bitvectors, as `run_program`.
+
+    Parameters:
+        program: program to run.
+        patterns: mapping from each variable name of the program to a
+            bitvector of its truth values in the evaluated models.
+        mask: bitvector whose bits are set exactly in the evaluated models.
+
+    Returns:
+        The respective bitvectors of the values of the instructions of the
+        program in the evaluated models, or ``None`` for values that were
+        discarded.
+    """
+    values: List[Optional[int]] = [None] * len(program)
+    for i, (root, first, second, frees) in enumerate(program):
+        if first < 0:
+            if root == 'T':
+                value = mask
+            elif root == 'F':
+                value = 0
+            else:
+                value = patterns[root]
+        elif second < 0:
+            value = mask ^ values[first]
+        else:
+            now, next = values[first], values[second]
+            if root == '&':
+                value = now & next
+            elif root == '|':
+                value = now | next
+            elif root == '->':
+                value = (mask ^ now) | next
+            elif root == '+':
+                value = now ^ next
+            elif root == '<->':
+                value = mask ^ now ^ next
+            elif root == '-&':
+                value = mask ^ (now & next)
+            else:
+                assert root == '-|'
+                value = mask ^ (now | next)
+        for index in frees:
+            values[index] = None
+        values[i] = value
+    return values
+
+#: A compiled formula: a function that takes the truth values of the variable
+#: names of the formula (in a fixed order), as bits or as bitvectors, and a
+#: mask whose bits are set exactly in the evaluated models (``1`` by default),
+#: and returns the bit or bitvector of the truth values of the formula.
+CompiledFormula = Callable[..., int]
+
+_compiled_formulas: WeakKeyDictionary = WeakKeyDictionary()
+_evaluation_counts: WeakKeyDictionary = WeakKeyDictionary()
+
+#: Python expression templates for the binary operators, over the operand
+#: values ``{0}`` and ``{1}`` and the mask ``mask``.
+_BINARY_TEMPLATES = {'&': '{0} & {1}', '|': '{0} | {1}',
+                     '->': 'mask ^ {0} | {1}', '+': '{0} ^ {1}',
+                     '<->': 'mask ^ {0} ^ {1}', '-&': 'mask ^ ({0} & {1})',
+                     '-|': 'mask ^ ({0} | {1})'}
+
+def _generate_source(program: Program, variable_order: Sequence[str]) -> str:
+    """Generates the Python source of a compiled formula.
+
+    Parameters:
+        program: program of the formula to compile.
+        variable_order: variable names of the arguments of the compiled
+            formula, in order.
+
+    Returns:
+        The source of a function named ``evaluate``, that computes each
+        instruction of the given program in a single statement, reusing the
+        local variables of values that are no longer needed.
+    """
+    names = {variable: 'x' + str(i)
+             for i, variable in enumerate(variable_order)}
+    lines = ['def evaluate(values, mask=1):']
+    if len(names) > 0:
+        lines.append('    ' + ', '.join(names.values()) + ', = values')
+    expressions: List[str] = []
+    free_registers: List[str] = []
+    n_registers = 0
+    for root, first, second, frees in program:
+        for index in frees:
+            if expressions[index].startswith('r'):
+                free_registers.append(expressions[index])
+        if first < 0:
+            if root == 'T':
+                expressions.append('mask')
+            elif root == 'F':
+                expressions.append('0')
+            else:
+                assert root in names, 'Variable name ' + root + ' not in order'
+                expressions.append(names[root])
+            continue
+        if second < 0:
+            expression = 'mask ^ ' + expressions[first]
+        else:
+            expression = _BINARY_TEMPLATES[root].format(expressions[first],
+                                                        expressions[second])
+        if len(free_registers) > 0:
+            register = free_registers.pop()
+        else:
+            register = 'r' + str(n_registers)
+            n_registers += 1
+        lines.append('    ' + register + ' = ' + expression)
+        expressions.append(register)
+    lines.append('    return ' + expressions[-1])
+    return '\n'.join(lines)
+
+def compile_formula(formula: Formula, variable_order: Sequence[str]) -> \
+        CompiledFormula:
+    """Compiles the given formula into a Python function, which is cached for
+    as long as the formula exists.
+
+    Parameters:
+        formula: formula to compile.
+        variable_order: variable names, a superset of those of the given
+            formula, in the order in which their truth values are to be passed
+            to the compiled formula.
+
+    Returns:
+        The compiled formula.
+
+    Examples:
+        >>> function = compile_formula(Formula.parse('(p->~q)'), ['q', 'p'])
+        >>> function((True, True))
+        0
+
+        >>> function((0b0011, 0b0101), 0b1111)
+        14
+    """
+    order = tuple(variable_order)
+    functions = _compiled_formulas.get(formula)
+    if functions is None:
+        functions = _compiled_formulas[formula] = {}
+    function = functions.get(order)
+    if function is None:
+        function = functions[order] = \
+            compile_program_function(compile_program(formula), order)
+    return function
+
+def compile_program_function(program: Program,
+                             variable_order: Sequence[str]) -> \
+        CompiledFormula:
+    """Compiles the given program into a Python function, without caching it.
+
+    Parameters:
+        program: program to compile.
+        variable_order: variable names, a superset of those of the given
+            program, in the order in which their truth values are to be passed
+            to the compiled program.
+
+    Returns:
+        The compiled program, as a compiled formula.
+    """
+    namespace: Dict[str, CompiledFormula] = {}
+    exec(compile(_generate_source(program, variable_order), '<formula>',
+                 'exec'), namespace)
+    return namespace['evaluate']
+
+def evaluator(formula: Formula, variable_order: Sequence[str]) -> \
+        CompiledFormula:
+    """Returns a function that evaluates the given formula like a compiled
+    formula. The first `COMPILE_THRESHOLD` requested functions interpret the
+    formula, and the following ones compile it (once) via `compile_formula`.
+
+    Parameters:
+        formula: formula to evaluate.
+        variable_order: variable names, a superset of those of the given
+            formula, in the order in which their truth values are to be passed
+            to the returned function.
+
+    Returns:
+        A function with the interface of a compiled formula.
+    """
+    count = _evaluation_counts.get(formula, 0)
+    if count >= COMPILE_THRESHOLD:
+        return compile_formula(formula, variable_order)
+    _evaluation_counts[formula] = count + 1
+    program = compile_program(formula)
+    order = tuple(variable_order)
+    return lambda values, mask=1: \
+        run_program(program, dict(zip(order, values)), mask)
+
+def evaluate_model(formula: Formula, model: Mapping[str, bool]) -> bool:
+    """Evaluates the given formula in the given model via `evaluator`.
+
+    Parameters:
+        formula: formula to evaluate.
+        model: model over (possibly a superset of) the variable names of the
+            given formula.
+
+    Returns:
+        The truth value of the given formula in the given model.
+    """
+    order = sorted(formula.variables())
+    return evaluator(formula, order)(tuple(model[variable]
+                                           for variable in order)) == 1
+
+def variable_pattern(index: int, n_variables: int) -> int:
+    """Computes the bitvector of the truth values of a variable name in all
+    models over a sequence of variable names, in the order returned by
+    `~propositions.semantics.all_models`.
+
+    Parameters:
+        index: index of the variable name in the sequence.
+        n_variables: length of the sequence.
+
+    Returns:
+        The bitvector whose ``m``\\ th bit is set if and only if the variable
+        name is ``True`` in the ``m``\\ th model.
+    """
+    assert 0 <= index < n_variables
+    stride = 1 << (n_variables - 1 - index)
+    pattern = ((1 << stride) - 1) << stride
+    width = 2 * stride
+    while width < 1 << n_variables:
+        pattern |= pattern << width
+        width *= 2
+    return pattern
+
+def truth_table_chunks(formula: Formula, variables: Sequence[str]) -> \
+        Iterator[Tuple[int, int]]:
+    """Lazily evaluates the given formula in all models over the given variable
+    names, in chunks of at most ``2``\\ ``**``\\ `CHUNK_VARIABLES` models.
+
+    Parameters:
+        formula: formula to evaluate.
+        variables: variable names, a superset of those of the given formula.
+
+    Returns:
+        An iterator over pairs of a number of models, and the bitvector of the
+        truth values of the given formula in these models, whose
+        concatenation is the bitvector of the truth values of the given formula
+        in all models over the given variable names, in the order returned by
+        `~propositions.semantics.all_models`\\ ``(``\\ `variables`\\ ``)``.
+    """
+    assert formula.variables().issubset(variables)
+    n_fixed = max(0, len(variables) - CHUNK_VARIABLES)
+    n_free = len(variables) - n_fixed
+    width = 1 << n_free
+    mask = (1 << width) - 1
+    if n_fixed > 0:
+        function = compile_formula(formula, variables)
+    else:
+        function = evaluator(formula, variables)
+    values = [0] * n_fixed + [variable_pattern(i, n_free)
+                              for i in range(n_free)]
+    for chunk in range(1 << n_fixed):
+        for i in range(n_fixed):
+            values[i] = mask if chunk >> (n_fixed - 1 - i) & 1 else 0
+        yield width, function(values, mask)
+
+def truth_table_bits(formula: Formula, variables: Sequence[str]) -> int:
+    """Evaluates the given formula in all models over the given variable names.
+
+    Parameters:
+        formula: formula to evaluate.
+        variables: variable names, a superset of those of the given formula.
+
+    Returns:
+        The bitvector whose ``m``\\ th bit is the truth value of the given
+        formula in the ``m``\\ th model returned by
+        `~propositions.semantics.all_models`\\ ``(``\\ `variables`\\ ``)``.
+    """
+    bits = 0
+    offset = 0
+    for width, chunk in truth_table_chunks(formula, variables):
+        bits |= chunk << offset
+        offset += width
+    return bits
+
+def is_constant_function(formula: Formula, value: bool) -> bool:
+    """Checks if the given formula has the given truth value in all models over
+    its variable names, stopping at the first chunk of models in which it does
+    not.
+
+    Parameters:
+        formula: formula to check.
+        value: truth value to check for.
+
+    Returns:
+        ``True`` if the given formula evaluates to the given truth value in
+        every model, ``False`` otherwise.
+    """
+    for width, bits in truth_table_chunks(formula,
+                                          sorted(formula.variables())):
+        if bits != ((1 << width) - 1 if value else 0):
+            return False
+    return True
+
+def evaluate_models(formula: Formula, models: Iterable[Mapping[str, bool]]) \
+        -> Iterator[bool]:
+    """Lazily evaluates the given formula in each of the given models, in
+    batches of `MODELS_PER_BATCH` models, each evaluated via `evaluator`.
+
+    Parameters:
+        formula: formula to evaluate.
+        models: iterable over models over (possibly supersets of) the variable
+            names of the given formula.
+
+    Returns:
+        An iterator over the respective truth values of the given formula in
+        the given models.
+    """
+    variables = sorted(formula.variables())
+    models = iter(models)
+    while True:
+        batch = list(islice(models, MODELS_PER_BATCH))
+        if len(batch) == 0:
+            return
+        values = _batch_patterns(variables, batch)
+        bits = evaluator(formula, variables)(values, (1 << len(batch)) - 1)
+        for digit in reversed(format(bits, '0' + str(len(batch)) + 'b')):
+            yield digit == '1'
+
+def _batch_patterns(variables: Sequence[str],
+                    batch: Sequence[Mapping[str, bool]]) -> List[int]:
+    """Computes the bitvectors of the truth values of the given variable names
+    in the given models.
+
+    Parameters:
+        variables: variable names to compute the bitvectors of.
+        batch: models over (possibly supersets of) the given variable names.
+
+    Returns:
+        The respective bitvectors of the given variable names, whose ``i``\\ th
+        bits are their truth values in the ``i``\\ th given model.
+    """
+    patterns = []
+    for variable in variables:
+        pattern = 0
+        for i, model in enumerate(batch):
+            if model[variable]:
+                pattern |= 1 << i
+        patterns.append(pattern)
+    return patterns
+
+def evaluate_matrix(formulas: Sequence[Formula],
+                    models: Iterable[Mapping[str, bool]]) -> List[int]:
+    """Evaluates each of the given formulas in each of the given models, in
+    batches of `MODELS_PER_BATCH` models, computing each subformula that is
+    shared (structurally) by several of the given formulas only once per
+    batch, via `compile_shared_program`.
+
+    Parameters:
+        formulas: formulas to evaluate.
+        models: iterable over models over (possibly supersets of) the variable
+            names of the given formulas.
+
+    Returns:
+        The respective rows of the matrix of truth values, packed as
+        bitvectors, whose ``m``\\ th bits are the truth values of the given
+        formulas in the ``m``\\ th given model.
+
+    Examples:
+        >>> evaluate_matrix([Formula.parse('(p&q)'), Formula.parse('~(p&q)')],
+        ...                 [{'p': True, 'q': True}, {'p': True, 'q': False}])
+        [1, 2]
+    """
+    program, outputs = compile_shared_program(formulas)
+    variables = sorted({root for root, first, _, _ in program
+                        if first < 0 and is_variable(root)})
+    rows = [0] * len(outputs)
+    offset = 0
+    models = iter(models)
+    while True:
+        batch = list(islice(models, MODELS_PER_BATCH))
+        if len(batch) == 0:
+            return rows
+        values = _run_values(
+            program, dict(zip(variables, _batch_patterns(variables, batch))),
+            (1 << len(batch)) - 1)
+        for i, output in enumerate(outputs):
+            rows[i] |= values[output] << offset
+        offset += len(batch)
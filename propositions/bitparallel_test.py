@@ -0,0 +1,171 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/bitparallel_test.py
+
+"""Tests for the propositions.bitparallel module."""
+
+from random import Random
+
+import propositions.bitparallel as bitparallel
+from propositions.bitparallel import *
+from propositions.compact import CompactFormula
+from propositions.semantics import all_models, is_tautology
+from propositions.workloads import random_formula
+
+def test_variable_pattern(debug=False):
+    if debug:
+        print('Testing variable patterns')
+    assert variable_pattern(0, 1) == 0b10
+    assert variable_pattern(0, 2) == 0b1100
+    assert variable_pattern(1, 2) == 0b1010
+    for n_variables in range(1, 7):
+        for index in range(n_variables):
+            pattern = variable_pattern(index, n_variables)
+            for m, model in enumerate(all_models(
+                    ['x' + str(i) for i in range(n_variables)])):
+                assert (pattern >> m & 1 == 1) == model['x' + str(index)]
+
+def test_truth_table_bits(debug=False):
+    rng = Random(0)
+    for _ in range(50):
+        formula = random_formula(rng, 5, 5, {'~': 1, '&': 1, '|': 1, '->': 1},
+                                 constant_probability=0.1)
+        if debug:
+            print('Testing truth table of', formula)
+        variables = sorted(formula.variables() | {'x1', 'x3'})
+        compact = CompactFormula.from_formula(formula)
+        bits = truth_table_bits(formula, variables)
+        for m, model in enumerate(all_models(variables)):
+            assert (bits >> m & 1 == 1) == compact.evaluate(model)
+
+def test_shared_subformulas(debug=False):
+    if debug:
+        print('Testing truth table of a formula with shared subformulas')
+    formula = Formula('p')
+    for i in range(200):
+        formula = Formula('&' if i % 2 == 0 else '|', formula, formula)
+    program = compile_program(formula)
+    assert len(program) == 201
+    assert truth_table_bits(formula, ['p']) == 0b10
+
+def test_chunks(debug=False):
+    if debug:
+        print('Testing truth table in chunks')
+    chunk_variables = bitparallel.CHUNK_VARIABLES
+    try:
+        bitparallel.CHUNK_VARIABLES = 2
+        rng = Random(1)
+        for _ in range(20):
+            formula = random_formula(rng, 5, 6)
+            variables = sorted(formula.variables())
+            chunks = list(truth_table_chunks(formula, variables))
+            assert len(chunks) == 2 ** max(0, len(variables) - 2)
+            bits = truth_table_bits(formula, variables)
+            bitparallel.CHUNK_VARIABLES = 20
+            assert bits == truth_table_bits(formula, variables)
+            bitparallel.CHUNK_VARIABLES = 2
+    finally:
+        bitparallel.CHUNK_VARIABLES = chunk_variables
+
+def test_evaluate_models(debug=False):
+    if debug:
+        print('Testing evaluation in batches of models')
+    models_per_batch = bitparallel.MODELS_PER_BATCH
+    try:
+        bitparallel.MODELS_PER_BATCH = 3
+        formula = Formula.parse('((p->q)&~r)')
+        models = list(all_models(['r', 'q', 'p', 's']))
+        assert list(evaluate_models(formula, models)) == \
+               [CompactFormula.from_formula(formula).evaluate(model)
+                for model in models]
+        assert list(evaluate_models(formula, [])) == []
+    finally:
+        bitparallel.MODELS_PER_BATCH = models_per_batch
+
+def test_evaluate_matrix(debug=False):
+    if debug:
+        print('Testing evaluation of many formulas in many models')
+    rng = Random(4)
+    formulas = [random_formula(rng, 4, 5, constant_probability=0.1)
+                for _ in range(30)]
+    # Equal subformulas that are distinct objects are computed only once
+    formulas += [Formula.parse(str(formula)) for formula in formulas[:5]]
+    program, outputs = compile_shared_program(formulas)
+    assert outputs[-5:] == outputs[:5]
+    assert len({instruction[:3] for instruction in program}) == len(program)
+    models_per_batch = bitparallel.MODELS_PER_BATCH
+    try:
+        bitparallel.MODELS_PER_BATCH = 5
+        models = list(all_models(['x1', 'x2', 'x3', 'x4', 'x5']))
+        rows = evaluate_matrix(formulas, models)
+        assert len(rows) == len(formulas)
+        for formula, row in zip(formulas, rows):
+            compact = CompactFormula.from_formula(formula)
+            for m, model in enumerate(models):
+                assert (row >> m & 1 == 1) == compact.evaluate(model)
+        assert evaluate_matrix(formulas, []) == [0] * len(formulas)
+        assert evaluate_matrix([], models) == []
+    finally:
+        bitparallel.MODELS_PER_BATCH = models_per_batch
+
+def test_many_variables(debug=False):
+    if debug:
+        print('Testing tautologies over 24 variables')
+    formula = Formula('x1')
+    for i in range(2, 25):
+        formula = Formula('->' if i % 3 == 0 else '|', formula,
+                          Formula('~', Formula('x' + str(i))))
+    assert len(formula.variables()) == 24
+    assert is_tautology(Formula('->', Formula('&', formula, Formula('x5')),
+                                formula))
+    assert not is_tautology(formula)
+    assert is_tautology(Formula('|', formula, Formula('~', formula)))
+
+def test_compile_formula(debug=False):
+    rng = Random(3)
+    for _ in range(30):
+        formula = random_formula(rng, 4, 5, constant_probability=0.1)
+        if debug:
+            print('Testing compilation of', formula)
+        order = sorted(formula.variables() | {'x2'}, reverse=True)
+        function = compile_formula(formula, order)
+        assert compile_formula(formula, order) is function
+        compact = CompactFormula.from_formula(formula)
+        for model in all_models(order):
+            assert function(tuple(model[variable] for variable in order)) == \
+                   compact.evaluate(model)
+        patterns = [variable_pattern(i, len(order)) for i in range(len(order))]
+        assert function(patterns, (1 << 2 ** len(order)) - 1) == \
+               truth_table_bits(formula, order)
+    deep = Formula('p')
+    for i in range(20000):
+        deep = Formula('~', deep) if i % 2 == 0 else Formula('&', deep, deep)
+    assert compile_formula(deep, ['p'])((1,)) == 1
+    assert compile_formula(deep, ['p'])((0b10,), 0b11) == 0b10
+
+def test_evaluator(debug=False):
+    if debug:
+        print('Testing switching from interpretation to compilation')
+    formula = Formula.parse('((p|q)->~r)')
+    functions = [evaluator(formula, ['p', 'q', 'r'])
+                 for _ in range(bitparallel.COMPILE_THRESHOLD + 2)]
+    assert functions[-1] is functions[-2] is \
+           compile_formula(formula, ['p', 'q', 'r'])
+    assert functions[0] is not functions[-1]
+    for function in functions:
+        assert function((1, 0, 1)) == 0
+        assert function((0b1100, 0b1010, 0b0110), 0b1111) == 0b1001
+    assert evaluate_model(formula, {'p': False, 'q': False, 'r': True})
+
+def test_all(debug=False):
+    test_variable_pattern(debug)
+    test_truth_table_bits(debug)
+    test_shared_subformulas(debug)
+    test_chunks(debug)
+    test_evaluate_models(debug)
+    test_evaluate_matrix(debug)
+    test_compile_formula(debug)
+    test_evaluator(debug)
+    test_many_variables(debug)
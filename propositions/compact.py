@@ -0,0 +1,297 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/compact.py
+
+"""Compact array-backed representation of propositional formulas."""
+
+from __future__ import annotations
+from array import array
+from typing import Dict, List, Mapping, Set, Tuple
+
+from logic_utils import Immutable
+
+from propositions.syntax import *
+
+#: The constants and operators that may appear in a compact formula, indexed by
+#: their opcodes.
+OPERATORS = ('T', 'F', '~', '&', '|', '->', '+', '<->', '-&', '-|')
+
+#: The opcode of a variable name.
+VARIABLE = len(OPERATORS)
+
+_OPCODES = {operator: opcode for opcode, operator in enumerate(OPERATORS)}
+_UNARY = _OPCODES['~']
+
+class CompactFormula(Immutable):
+    """An immutable propositional formula in flat postfix representation.
+
+    Node ``i`` of the formula has the opcode `opcodes`\\ ``[i]``, and the
+    operands of every node precede it, so that the root of the formula is its
+    last node. For a variable name node, `operands`\\ ``[i]`` is the id of the
+    variable name in `~propositions.syntax.SYMBOLS`; for a unary or binary
+    operator node, it is the index of the root of the first operand, and the
+    root of the second operand of a binary operator node is node ``i-1``.
+
+    Attributes:
+        opcodes (`~array.array`): the opcodes of the nodes of the formula, each
+            an index into `OPERATORS` or `VARIABLE`.
+        operands (`~array.array`): the variable name ids or first-operand
+            indices of the nodes of the formula.
+    """
+    opcodes: array
+    operands: array
+
+    def __init__(self, opcodes: array, operands: array):
+        """Initializes a `CompactFormula` from its opcode and operand arrays.
+
+        Parameters:
+            opcodes: the opcodes for the nodes of the formula.
+            operands: the variable name ids or first-operand indices for the
+                nodes of the formula.
+        """
+        assert len(opcodes) == len(operands) > 0
+        self.opcodes = opcodes
+        self.operands = operands
+
+    @staticmethod
+    def from_formula(formula: Formula) -> CompactFormula:
+        """Converts the given formula to its compact representation.
+
+        Parameters:
+            formula: formula to convert.
+
+        Returns:
+            The compact representation of the given formula.
+        """
+        opcodes = array('B')
+        operands = array('I')
+        # Triplets of a subformula, the number of its operands that were
+        # already added, and the index of the root of its first operand
+        stack = [(formula, 0, 0)]
+        while len(stack) > 0:
+            current, added, first = stack.pop()
+            root = current.root
+            kind = symbol_kind(root)
+            if kind == 'variable':
+                opcodes.append(VARIABLE)
+                operands.append(SYMBOLS.id(root))
+            elif kind == 'constant':
+                opcodes.append(_OPCODES[root])
+                operands.append(0)
+            elif added == 0:
+                stack.append((current, 1, 0))
+                stack.append((current.now, 0, 0))
+            elif added == 1 and kind == 'binary':
+                stack.append((current, 2, len(opcodes) - 1))
+                stack.append((current.next, 0, 0))
+            else:
+                opcodes.append(_OPCODES[root])
+                operands.append(len(opcodes) - 2 if added == 1 else first)
+        return CompactFormula(opcodes, operands)
+
+    def to_formula(self) -> Formula:
+        """Converts the current compact formula to a formula in tree
+        representation.
+
+        Returns:
+            The formula in tree representation that the current compact formula
+            represents.
+        """
+        operands = self.operands
+        stack: List[Formula] = []
+        for i, opcode in enumerate(self.opcodes):
+            if opcode == VARIABLE:
+                stack.append(Formula(SYMBOLS.name(operands[i])))
+            elif opcode == _UNARY:
+                stack.append(Formula('~', stack.pop()))
+            elif opcode <= 1:
+                stack.append(Formula(OPERATORS[opcode]))
+            else:
+                next = stack.pop()
+                stack.append(Formula(OPERATORS[opcode], stack.pop(), next))
+        assert len(stack) == 1
+        return stack[0]
+
+    def __len__(self) -> int:
+        """Computes the number of nodes of the current compact formula.
+
+        Returns:
+            The number of nodes (variable names, constants, and operators) of
+            the current compact formula.
+        """
+        return len(self.opcodes)
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the current compact formula with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            ``True`` if the given object is a `CompactFormula` object that
+            equals the current compact formula, ``False`` otherwise.
+        """
+        return isinstance(other, CompactFormula) and \
+               self.opcodes == other.opcodes and \
+               self.operands == other.operands
+
+    def __ne__(self, other: object) -> bool:
+        """Compares the current compact formula with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            ``True`` if the given object is not a `CompactFormula` object or
+            does not equal the current compact formula, ``False`` otherwise.
+        """
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash((self.opcodes.tobytes(), self.operands.tobytes()))
+
+    def __reduce__(self) -> Tuple[object, ...]:
+        """Reduces the current compact formula for pickling. Variable name ids
+        are local to each process, so the ids are replaced by indices into a
+        tuple of the variable names of the formula, and are looked up again
+        upon unpickling.
+
+        Returns:
+            A pair of `_unpickle` and its arguments.
+        """
+        operands = array('I', self.operands)
+        indices: Dict[int, int] = {}
+        for i, opcode in enumerate(self.opcodes):
+            if opcode == VARIABLE:
+                operands[i] = indices.setdefault(operands[i], len(indices))
+        names = tuple(SYMBOLS.name(id) for id in indices)
+        return _unpickle, (self.opcodes, operands, names)
+
+    def _render(self, infix: bool) -> str:
+        """Computes the standard string representation or the polish notation
+        representation of the current compact formula.
+
+        Parameters:
+            infix: whether to compute the standard string representation rather
+                than the polish notation representation.
+
+        Returns:
+            The requested representation of the current compact formula.
+        """
+        opcodes, operands = self.opcodes, self.operands
+        pieces: List[str] = []
+        # Node indices still to render, and pieces of text (in infix only)
+        stack: List[object] = [len(opcodes) - 1]
+        while len(stack) > 0:
+            i = stack.pop()
+            if type(i) is str:
+                pieces.append(i)
+                continue
+            opcode = opcodes[i]
+            if opcode == VARIABLE:
+                pieces.append(SYMBOLS.name(operands[i]))
+            elif opcode <= _UNARY:
+                pieces.append(OPERATORS[opcode])
+                if opcode == _UNARY:
+                    stack.append(i - 1)
+            elif infix:
+                pieces.append('(')
+                stack.extend((')', i - 1, OPERATORS[opcode], operands[i]))
+            else:
+                pieces.append(OPERATORS[opcode])
+                stack.extend((i - 1, operands[i]))
+        return ''.join(pieces)
+
+    def __repr__(self) -> str:
+        """Computes the string representation of the current compact formula.
+
+        Returns:
+            The standard string representation of the current compact formula.
+        """
+        return self._render(True)
+
+    def polish(self) -> str:
+        """Computes the polish notation representation of the current compact
+        formula.
+
+        Returns:
+            The polish notation representation of the current compact formula.
+        """
+        return self._render(False)
+
+    def variables(self) -> Set[str]:
+        """Finds all variable names in the current compact formula.
+
+        Returns:
+            A set of all variable names used in the current compact formula.
+        """
+        operands = self.operands
+        return {SYMBOLS.name(operands[i])
+                for i, opcode in enumerate(self.opcodes) if opcode == VARIABLE}
+
+    def operators(self) -> Set[str]:
+        """Finds all operators in the current compact formula.
+
+        Returns:
+            A set of all operators (including ``'T'`` and ``'F'``) used in the
+            current compact formula.
+        """
+        return {OPERATORS[opcode] for opcode in set(self.opcodes)
+                if opcode != VARIABLE}
+
+    def evaluate(self, model: Mapping[str, bool]) -> bool:
+        """Calculates the truth value of the current compact formula in the
+        given model.
+
+        Parameters:
+            model: model over (possibly a superset of) the variable names of the
+                current compact formula, to calculate the truth value in.
+
+        Returns:
+            The truth value of the current compact formula in the given model.
+        """
+        operands = self.operands
+        stack: List[bool] = []
+        for i, opcode in enumerate(self.opcodes):
+            if opcode == VARIABLE:
+                stack.append(model[SYMBOLS.name(operands[i])])
+            elif opcode == _UNARY:
+                stack.append(not stack.pop())
+            elif opcode <= 1:
+                stack.append(opcode == 0)
+            else:
+                next = stack.pop()
+                now = stack.pop()
+                stack.append(_BINARY_EVALUATORS[opcode](now, next))
+        return stack[0]
+
+#: Truth functions of the binary operators, indexed by their opcodes.
+_BINARY_EVALUATORS = (None, None, None,
+                      lambda p, q: p and q,
+                      lambda p, q: p or q,
+                      lambda p, q: not p or q,
+                      lambda p, q: p != q,
+                      lambda p, q: p == q,
+                      lambda p, q: not (p and q),
+                      lambda p, q: not (p or q))
+
+def _unpickle(opcodes: array, operands: array,
+              names: Tuple[str, ...]) -> CompactFormula:
+    """Reconstructs a compact formula reduced by `CompactFormula.__reduce__`.
+
+    Parameters:
+        opcodes: the opcodes of the nodes of the formula.
+        operands: the operands of the nodes of the formula, with indices into
+            the given variable names in place of variable name ids.
+        names: the variable names of the formula.
+
+    Returns:
+        The reconstructed compact formula.
+    """
+    ids = [SYMBOLS.id(name) for name in names]
+    for i, opcode in enumerate(opcodes):
+        if opcode == VARIABLE:
+            operands[i] = ids[operands[i]]
+    return CompactFormula(opcodes, operands)
@@ -0,0 +1,96 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/compact_test.py
+
+"""Tests for the propositions.compact module."""
+
+import pickle
+from itertools import product
+
+from propositions.compact import *
+
+formulas = ['x12', 'T', '~~F', '(p|p)', '~(p&q7)', '((p->q)->(~q->~p))',
+            '(r&(y|(z->w)))', '(((~T->s45)&s45)|~y)',
+            '~((~x17->p)&~~(~F|~p))']
+
+def test_round_trip(debug=False):
+    for string in formulas:
+        if debug:
+            print('Testing compact representation of', string)
+        formula = Formula.parse(string)
+        compact = CompactFormula.from_formula(formula)
+        assert compact.to_formula() == formula
+        assert str(compact) == string
+        assert compact.polish() == formula.polish()
+        assert compact == CompactFormula.from_formula(Formula.parse(string))
+        assert hash(compact) == \
+               hash(CompactFormula.from_formula(Formula.parse(string)))
+
+def test_variables_and_operators(debug=False):
+    for string in formulas:
+        if debug:
+            print('Testing variables and operators of compact', string)
+        formula = Formula.parse(string)
+        compact = CompactFormula.from_formula(formula)
+        assert compact.variables() == formula.variables()
+        assert compact.operators() == formula.operators()
+
+def test_evaluate(debug=False):
+    for string in formulas:
+        if debug:
+            print('Testing evaluation of compact', string)
+        formula = Formula.parse(string)
+        compact = CompactFormula.from_formula(formula)
+        variables = sorted(formula.variables())
+        for values in product([False, True], repeat=len(variables)):
+            model = dict(zip(variables, values))
+            assert compact.evaluate(model) == _evaluate(formula, model)
+
+def _evaluate(formula, model):
+    if is_variable(formula.root):
+        return model[formula.root]
+    if is_constant(formula.root):
+        return formula.root == 'T'
+    if is_unary(formula.root):
+        return not _evaluate(formula.now, model)
+    now, next = _evaluate(formula.now, model), _evaluate(formula.next, model)
+    return {'&': now and next, '|': now or next,
+            '->': not now or next}[formula.root]
+
+def test_deep(debug=False):
+    depth = 100000
+    if debug:
+        print('Testing compact representation of', depth,
+              'nested negations and conjunctions')
+    string = '(p&' * depth + '~' * depth + 'q' + ')' * depth
+    formula = Formula.parse(string)
+    compact = CompactFormula.from_formula(formula)
+    assert len(compact) == 3 * depth + 1
+    assert str(compact) == string
+    assert compact.polish() == '&p' * depth + '~' * depth + 'q'
+    assert compact.evaluate({'p': True, 'q': False}) == (depth % 2 == 1)
+    assert compact.variables() == {'p', 'q'}
+    assert CompactFormula.from_formula(compact.to_formula()) == compact
+
+def test_pickle(debug=False):
+    for string in formulas + ['(z&~(q|z))']:
+        if debug:
+            print('Testing pickling of compact', string)
+        compact = CompactFormula.from_formula(Formula.parse(string))
+        unpickled = pickle.loads(pickle.dumps(compact))
+        assert unpickled == compact
+        assert str(unpickled) == string
+    # The pickled form names the variables rather than their process-local ids
+    function, arguments = \
+        CompactFormula.from_formula(Formula.parse('(z&~(q|z))')).__reduce__()
+    assert arguments[2] == ('z', 'q')
+    assert list(arguments[1]) == [0, 1, 0, 1, 3, 0]
+
+def test_all(debug=False):
+    test_round_trip(debug)
+    test_variables_and_operators(debug)
+    test_evaluate(debug)
+    test_deep(debug)
+    test_pickle(debug)
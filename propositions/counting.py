@@ -0,0 +1,258 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/counting.py
+
+"""Exact model counting of propositional formulas."""
+
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from propositions.syntax import *
+from propositions.sat import Clause, tseitin
+
+def cnf_clauses(formula: Formula) -> Optional[Tuple[List[Clause],
+                                                    Dict[str, int]]]:
+    """Reads the clauses of the given formula, if it is in CNF.
+
+    Parameters:
+        formula: formula to read, which is in CNF if it is a conjunction (in
+            any nesting) of disjunctions (in any nesting) of literals, i.e., of
+            variable names, constants, and their negations.
+
+    Returns:
+        ``None`` if the given formula is not in CNF, or otherwise a pair of its
+        clauses, without clauses that contain ``T`` or a complementary pair
+        of literals, and without occurrences of ``F``; and the mapping from
+        each of its variable names to its variable number, consecutively from
+        ``1``.
+    """
+    clauses: List[Clause] = []
+    ids: Dict[str, int] = {}
+    conjuncts = [formula]
+    while len(conjuncts) > 0:
+        conjunct = conjuncts.pop()
+        if conjunct.root == '&':
+            conjuncts.append(conjunct.next)
+            conjuncts.append(conjunct.now)
+            continue
+        clause: Set[int] = set()
+        satisfied = False
+        disjuncts = [conjunct]
+        while len(disjuncts) > 0:
+            disjunct = disjuncts.pop()
+            if disjunct.root == '|':
+                disjuncts.append(disjunct.next)
+                disjuncts.append(disjunct.now)
+                continue
+            positive = True
+            if disjunct.root == '~':
+                positive = False
+                disjunct = disjunct.now
+            if is_constant(disjunct.root):
+                satisfied |= (disjunct.root == 'T') == positive
+            elif is_variable(disjunct.root):
+                variable = ids.setdefault(disjunct.root, len(ids) + 1)
+                literal = variable if positive else -variable
+                satisfied |= -literal in clause
+                clause.add(literal)
+            else:
+                return None
+        if not satisfied:
+            clauses.append(sorted(clause, key=abs))
+    return clauses, ids
+
+def _simplify(clauses: Sequence[Tuple[int, ...]], units: Sequence[int]) -> \
+        Optional[Tuple[List[Tuple[int, ...]], Set[int]]]:
+    """Assigns the given literals and propagates unit clauses.
+
+    Parameters:
+        clauses: clauses to simplify.
+        units: literals to assign.
+
+    Returns:
+        ``None`` if a conflict is reached, or otherwise a pair of the clauses
+        that are not yet satisfied, without their assigned literals, and the
+        set of assigned variables.
+    """
+    true: Set[int] = set()
+    pending = units
+    while True:
+        for literal in pending:
+            if -literal in true:
+                return None
+            true.add(literal)
+        pending = []
+        remaining = []
+        for clause in clauses:
+            if not true.isdisjoint(clause):
+                continue
+            kept = tuple(literal for literal in clause if -literal not in true)
+            if len(kept) <= 1:
+                if len(kept) == 0:
+                    return None
+                pending.append(kept[0])
+            remaining.append(kept)
+        if len(pending) == 0:
+            return remaining, {abs(literal) for literal in true}
+        clauses = remaining
+
+def _components(clauses: Sequence[Tuple[int, ...]]) -> \
+        List[Tuple[List[Tuple[int, ...]], Set[int]]]:
+    """Splits the given clauses into groups that share no variables.
+
+    Parameters:
+        clauses: clauses to split.
+
+    Returns:
+        The connected components of the given clauses, where clauses are
+        connected if they share a variable, each as a pair of its clauses and
+        its variables.
+    """
+    # Each variable's component, as a pair of its clauses and its variables,
+    # merging the smaller component into the larger one
+    component_of: Dict[int, Tuple[List[Tuple[int, ...]], Set[int]]] = {}
+    for clause in clauses:
+        component = None
+        for literal in clause:
+            other = component_of.get(abs(literal))
+            if other is None or other is component:
+                continue
+            if component is None:
+                component = other
+                continue
+            if len(other[1]) > len(component[1]):
+                component, other = other, component
+            component[0].extend(other[0])
+            component[1].update(other[1])
+            for variable in other[1]:
+                component_of[variable] = component
+        if component is None:
+            component = ([], set())
+        component[0].append(clause)
+        for literal in clause:
+            if abs(literal) not in component[1]:
+                component[1].add(abs(literal))
+                component_of[abs(literal)] = component
+    unique = {id(component): component
+              for component in component_of.values()}
+    return list(unique.values())
+
+class ModelCounter:
+    """An exact model counter for sets of clauses: a DPLL search with unit
+    propagation that splits the clauses into connected components after every
+    decision, counts each component separately, and caches the count of every
+    component.
+
+    Attributes:
+        n_variables (`int`): the number of variables.
+        decisions (`int`): the number of decisions made so far.
+        cache_hits (`int`): the number of components whose count was found in
+            the cache.
+    """
+    n_variables: int
+    decisions: int
+    cache_hits: int
+
+    def __init__(self, n_variables: int, clauses: Sequence[Clause]):
+        """Initializes a `ModelCounter` for the given clauses.
+
+        Parameters:
+            n_variables: number of variables, numbered from ``1``.
+            clauses: clauses over these variables.
+        """
+        self.n_variables = n_variables
+        self.decisions = self.cache_hits = 0
+        self._clauses = [tuple(clause) for clause in clauses]
+        self._cache: Dict[FrozenSet[Tuple[int, ...]], int] = {}
+
+    def count(self) -> int:
+        """Counts the satisfying assignments of the clauses.
+
+        Returns:
+            The number of assignments to all variables in which every clause
+            holds.
+        """
+        return self._count_under(self._clauses,
+                                 set(range(1, self.n_variables + 1)), ())
+
+    def _count_under(self, clauses: Sequence[Tuple[int, ...]],
+                     variables: Set[int], units: Sequence[int]) -> int:
+        """Counts the satisfying assignments of the given clauses that assign
+        the given literals.
+
+        Parameters:
+            clauses: clauses to satisfy.
+            variables: variables to count the assignments to, a superset of
+                those of the given clauses and literals.
+            units: literals to assign.
+
+        Returns:
+            The number of assignments to the given variables in which every
+            given clause and literal holds.
+        """
+        simplified = _simplify(clauses, units)
+        if simplified is None:
+            return 0
+        remaining, assigned = simplified
+        components = _components(remaining)
+        # Variables that are neither assigned nor constrained are free
+        count = 1 << (len(variables) - len(assigned) -
+                      sum(len(component[1]) for component in components))
+        for component_clauses, component_variables in components:
+            count *= self._count_component(component_clauses,
+                                           component_variables)
+            if count == 0:
+                break
+        return count
+
+    def _count_component(self, clauses: List[Tuple[int, ...]],
+                         variables: Set[int]) -> int:
+        """Counts the satisfying assignments of the given connected clauses,
+        by branching on their most frequent variable.
+
+        Parameters:
+            clauses: connected clauses, none of which is a unit clause.
+            variables: the variables of the given clauses.
+
+        Returns:
+            The number of assignments to the given variables in which every
+            given clause holds.
+        """
+        key = frozenset(clauses)
+        count = self._cache.get(key)
+        if count is not None:
+            self.cache_hits += 1
+            return count
+        occurrences: Dict[int, int] = {}
+        for clause in clauses:
+            for literal in clause:
+                occurrences[abs(literal)] = \
+                    occurrences.get(abs(literal), 0) + 1
+        variable = max(occurrences, key=occurrences.__getitem__)
+        self.decisions += 1
+        count = self._count_under(clauses, variables, (variable,)) + \
+                self._count_under(clauses, variables, (-variable,))
+        self._cache[key] = count
+        return count
+
+def count_models(formula: Formula) -> int:
+    """Counts the models in which the given formula holds, via `ModelCounter`,
+    over the clauses of the given formula if it is in CNF, and otherwise over
+    its `~propositions.sat.tseitin` encoding, which extends every model of the
+    formula in exactly one way.
+
+    Parameters:
+        formula: formula to count the models of.
+
+    Returns:
+        The number of models over the variable names of the given formula in
+        which it holds.
+    """
+    extracted = cnf_clauses(formula)
+    if extracted is not None:
+        clauses, ids = extracted
+        return ModelCounter(len(ids), clauses).count()
+    clauses, _, root, n_variables = tseitin(formula)
+    clauses.append([root])
+    return ModelCounter(n_variables, clauses).count()
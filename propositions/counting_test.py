@@ -0,0 +1,102 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/counting_test.py
+
+"""Tests for the propositions.counting module."""
+
+from random import Random
+
+from propositions.counting import *
+from propositions.bdd import to_bdd
+from propositions.bitparallel import truth_table_bits
+from propositions.semantics import BACKENDS, set_backend
+from propositions.semantics import count_models as semantics_count_models
+from propositions.workloads import balanced_formula, random_cnf, \
+                                   random_formula
+
+def _enumerated_count(formula):
+    return bin(truth_table_bits(formula, sorted(formula.variables()))).count(
+        '1')
+
+def test_cnf_clauses(debug=False):
+    if debug:
+        print('Testing cnf_clauses')
+    assert cnf_clauses(Formula.parse('((p|~q)&(q|(r|~p)))')) == \
+           ([[1, -2], [-1, 2, 3]], {'p': 1, 'q': 2, 'r': 3})
+    assert cnf_clauses(Formula.parse('((p|~p)&(q|T))')) == \
+           ([], {'p': 1, 'q': 2})
+    assert cnf_clauses(Formula.parse('(p&(F|~q))')) == \
+           ([[1], [-2]], {'p': 1, 'q': 2})
+    assert cnf_clauses(Formula.parse('(p|(q&r))')) is None
+    assert cnf_clauses(Formula.parse('~~p')) is None
+
+def test_count_models(debug=False):
+    for string, count in [('p', 1), ('~p', 1), ('(p|q)', 3), ('(p->q)', 3),
+                          ('T', 1), ('F', 0), ('(p&~p)', 0), ('(p|~p)', 2),
+                          ('((p|q)&(~p|~q))', 2)]:
+        formula = Formula.parse(string)
+        if debug:
+            print('Testing count_models of', formula)
+        assert count_models(formula) == count, string
+    rng = Random(0)
+    for _ in range(200):
+        formula = random_formula(rng, 8, 6, constant_probability=0.05)
+        if debug:
+            print('Testing count_models of', formula)
+        assert count_models(formula) == _enumerated_count(formula)
+    for _ in range(50):
+        formula = random_cnf(rng, 14, rng.randrange(5, 60))
+        if debug:
+            print('Testing count_models of', formula)
+        assert count_models(formula) == _enumerated_count(formula)
+
+def test_large_instances(debug=False):
+    # Independent blocks, which only component decomposition can count fast
+    rng = Random(1)
+    blocks = []
+    for block in range(20):
+        names = ['x' + str(5 * block + i) for i in range(1, 6)]
+        clause = balanced_formula('|', [Formula(name) for name in names[:3]])
+        blocks.append(Formula('&', clause,
+                              Formula('->', Formula(names[3]),
+                                      Formula(names[4]))))
+    formula = balanced_formula('&', blocks)
+    if debug:
+        print('Testing count_models of a formula with 100 variable names')
+    assert count_models(formula) == (7 * 3) ** 20
+    formula = random_cnf(rng, 60, 210)
+    if debug:
+        print('Testing count_models of a random 3-CNF formula with 60 '
+              'variable names')
+    clauses, ids = cnf_clauses(formula)
+    counter = ModelCounter(len(ids), clauses)
+    assert counter.count() == 136431
+    assert counter.decisions > 0 and counter.cache_hits > 0
+    for _ in range(5):
+        formula = random_cnf(rng, 30, 90)
+        if debug:
+            print('Testing count_models of', formula, 'against a BDD')
+        assert count_models(formula) == \
+               to_bdd(formula, 'frequency').count_models()
+
+def test_backends(debug=False):
+    rng = Random(2)
+    formulas = [random_formula(rng, 10, 6) for _ in range(20)]
+    for backend in BACKENDS:
+        if debug:
+            print('Testing count_models with the', backend, 'backend')
+        previous = set_backend(backend)
+        try:
+            for formula in formulas:
+                assert semantics_count_models(formula) == \
+                       _enumerated_count(formula)
+        finally:
+            set_backend(previous)
+
+def test_all(debug=False):
+    test_cnf_clauses(debug)
+    test_count_models(debug)
+    test_large_instances(debug)
+    test_backends(debug)
@@ -0,0 +1,132 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/graycode.py
+
+"""Incremental evaluation of propositional formulas over all models in
+Gray-code order."""
+
+from typing import Iterator, List, Sequence, Tuple
+
+from propositions.syntax import *
+from propositions.bitparallel import compile_program
+
+def _apply(root: str, now: int, next: int) -> int:
+    """Computes the truth value of an operator or constant.
+
+    Parameters:
+        root: operator or constant.
+        now: truth value (``0`` or ``1``) of the first operand, if any.
+        next: truth value of the second operand, if any.
+
+    Returns:
+        The truth value (``0`` or ``1``) of the given operator applied to the
+        given operands, or of the given constant.
+    """
+    if root == '~':
+        return 1 ^ now
+    if root == '&':
+        return now & next
+    if root == '|':
+        return now | next
+    if root == '->':
+        return (1 ^ now) | next
+    if root == '+':
+        return now ^ next
+    if root == '<->':
+        return 1 ^ now ^ next
+    if root == '-&':
+        return 1 ^ (now & next)
+    if root == '-|':
+        return 1 ^ (now | next)
+    assert root == 'T' or root == 'F'
+    return 1 if root == 'T' else 0
+
+def gray_code_values(formula: Formula, variables: Sequence[str]) -> \
+        Iterator[Tuple[int, bool]]:
+    """Lazily evaluates the given formula in all models over the given variable
+    names, in Gray-code order, so that consecutive models differ in the value
+    of a single variable name. The truth value of every distinct subformula is
+    cached, and after each flip only the subformulas that contain the flipped
+    variable name and at least one of whose operands changed are re-evaluated.
+
+    Parameters:
+        formula: formula to evaluate.
+        variables: variable names, a superset of those of the given formula.
+
+    Returns:
+        An iterator over pairs of the index of a model in the order returned by
+        `~propositions.semantics.all_models`\\ ``(``\\ `variables`\\ ``)``, and
+        the truth value of the given formula in that model, covering all
+        models, starting from the model with all variable names ``False``.
+    """
+    assert formula.variables().issubset(variables)
+    program = compile_program(formula)
+    n_variables = len(variables)
+    positions = {variable: i for i, variable in enumerate(variables)}
+    users: List[List[int]] = [[] for _ in program]
+    leaves: List[List[int]] = [[] for _ in variables]
+    values = bytearray(len(program))
+    for i, (root, first, second, _) in enumerate(program):
+        if first < 0:
+            if root in positions:
+                leaves[positions[root]].append(i)
+            else:
+                values[i] = _apply(root, 0, 0)
+            continue
+        users[first].append(i)
+        if second >= 0 and second != first:
+            users[second].append(i)
+        values[i] = _apply(root, values[first],
+                           values[second] if second >= 0 else 0)
+    # The subformulas that contain each variable name, in topological order
+    affected: List[List[int]] = []
+    for variable_leaves in leaves:
+        marked = set()
+        stack = list(variable_leaves)
+        while len(stack) > 0:
+            for user in users[stack.pop()]:
+                if user not in marked:
+                    marked.add(user)
+                    stack.append(user)
+        affected.append(sorted(marked))
+    yield 0, values[-1] == 1
+    changed = [0] * len(program)
+    for step in range(1, 1 << n_variables):
+        position = n_variables - (step & -step).bit_length()
+        value = 1 ^ values[leaves[position][0]] \
+                if len(leaves[position]) > 0 else 0
+        for leaf in leaves[position]:
+            values[leaf] = value
+            changed[leaf] = step
+        for i in affected[position]:
+            root, first, second, _ = program[i]
+            if changed[first] != step and \
+               (second < 0 or changed[second] != step):
+                continue
+            value = _apply(root, values[first],
+                           values[second] if second >= 0 else 0)
+            if value != values[i]:
+                values[i] = value
+                changed[i] = step
+        yield step ^ (step >> 1), values[-1] == 1
+
+def gray_code_truth_table(formula: Formula, variables: Sequence[str]) -> \
+        bytearray:
+    """Evaluates the given formula in all models over the given variable names
+    via `gray_code_values`.
+
+    Parameters:
+        formula: formula to evaluate.
+        variables: variable names, a superset of those of the given formula.
+
+    Returns:
+        An array whose ``m``\\ th element is the truth value (``0`` or ``1``)
+        of the given formula in the ``m``\\ th model returned by
+        `~propositions.semantics.all_models`\\ ``(``\\ `variables`\\ ``)``.
+    """
+    table = bytearray(1 << len(variables))
+    for index, value in gray_code_values(formula, variables):
+        table[index] = value
+    return table
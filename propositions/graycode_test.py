@@ -0,0 +1,44 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/graycode_test.py
+
+"""Tests for the propositions.graycode module."""
+
+from random import Random
+
+from propositions.graycode import *
+from propositions.bitparallel import truth_table_bits
+from propositions.workloads import random_formula
+
+def test_gray_code_values(debug=False):
+    if debug:
+        print('Testing the Gray-code order of models')
+    indices = [index for index, _ in
+               gray_code_values(Formula.parse('(p|(q&r))'), ['p', 'q', 'r'])]
+    assert indices == [0, 1, 3, 2, 6, 7, 5, 4]
+    for previous, index in zip(indices, indices[1:]):
+        assert bin(previous ^ index).count('1') == 1
+    assert list(gray_code_values(Formula.parse('~T'), [])) == [(0, False)]
+
+def test_gray_code_truth_table(debug=False):
+    rng = Random(0)
+    for _ in range(100):
+        formula = random_formula(rng, 6, 6, constant_probability=0.05)
+        variables = sorted(formula.variables() | {'x2'})
+        if debug:
+            print('Testing Gray-code truth table of', formula)
+        bits = truth_table_bits(formula, variables)
+        assert gray_code_truth_table(formula, variables) == \
+               bytearray(bits >> m & 1 for m in range(2 ** len(variables)))
+    shared = Formula('p')
+    for i in range(50):
+        shared = Formula('->', shared, Formula('|', shared, Formula('q')))
+    assert gray_code_truth_table(shared, ['q', 'p']) == \
+           bytearray(truth_table_bits(shared, ['q', 'p']) >> m & 1
+                     for m in range(4))
+
+def test_all(debug=False):
+    test_gray_code_values(debug)
+    test_gray_code_truth_table(debug)
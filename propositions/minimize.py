@@ -0,0 +1,252 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/minimize.py
+
+"""Two-level minimization of Boolean functions given by their truth tables."""
+
+from typing import Dict, Iterator, List, Set, Tuple
+
+from propositions.bitparallel import variable_pattern
+
+#: A cube, i.e., a conjunction of literals over ``n`` variable names, given as
+#: a pair of a mask and a value: for every ``i``, if bit ``n-1-i`` of the mask
+#: is set then the ``i``\ th variable name appears in the cube, negated if and
+#: only if bit ``n-1-i`` of the value is clear. The cube thus holds in the
+#: ``m``\ th model returned by `~propositions.semantics.all_models` if and only
+#: if ``m & mask == value``.
+Cube = Tuple[int, int]
+
+#: The maximal number of variable names for which `minimal_cover` uses
+#: `quine_mccluskey` rather than `espresso`.
+QUINE_MCCLUSKEY_VARIABLES = 10
+
+#: The inverse of the fraction of all models up to which `espresso` enumerates
+#: the models of a cube, rather than handle them as a bitvector.
+ENUMERATED_MODELS_FRACTION = 512
+
+def _popcount(bits: int) -> int:
+    """Counts the set bits of the given nonnegative integer.
+
+    Parameters:
+        bits: integer to count the set bits of.
+
+    Returns:
+        The number of set bits of the given integer.
+    """
+    return bin(bits).count('1')
+
+def cube_bits(cube: Cube, n_variables: int) -> int:
+    """Computes the bitvector of the models in which the given cube holds.
+
+    Parameters:
+        cube: cube over the given number of variable names.
+        n_variables: number of variable names.
+
+    Returns:
+        The bitvector whose ``m``\\ th bit is set if and only if the given cube
+        holds in the ``m``\\ th model over the given number of variable names.
+    """
+    mask, value = cube
+    full = (1 << (1 << n_variables)) - 1
+    bits = full
+    for k in range(n_variables):
+        if mask >> k & 1:
+            pattern = variable_pattern(n_variables - 1 - k, n_variables)
+            bits &= pattern if value >> k & 1 else full ^ pattern
+    return bits
+
+def prime_implicants(n_variables: int, minterms: Set[int]) -> List[Cube]:
+    """Computes the prime implicants of the Boolean function over the given
+    number of variable names that holds exactly in the given models, by
+    repeatedly merging pairs of cubes that differ in a single literal.
+
+    Parameters:
+        n_variables: number of variable names.
+        minterms: indices of the models in which the function holds.
+
+    Returns:
+        The maximal cubes all of whose models are among the given ones.
+    """
+    full = (1 << n_variables) - 1
+    cubes = {(full, minterm) for minterm in minterms}
+    primes = []
+    while len(cubes) > 0:
+        values_by_mask: Dict[int, Set[int]] = {}
+        for mask, value in cubes:
+            values_by_mask.setdefault(mask, set()).add(value)
+        merged = set()
+        used = set()
+        for mask, values in values_by_mask.items():
+            for value in values:
+                for k in range(n_variables):
+                    bit = 1 << k
+                    if mask & bit and not value & bit and value | bit in values:
+                        merged.add((mask ^ bit, value))
+                        used.add((mask, value))
+                        used.add((mask, value | bit))
+        primes.extend(cubes - used)
+        cubes = merged
+    return sorted(primes)
+
+def _cube_minterms(cube: Cube, n_variables: int) -> Iterator[int]:
+    """Lazily enumerates the models in which the given cube holds.
+
+    Parameters:
+        cube: cube over the given number of variable names.
+        n_variables: number of variable names.
+
+    Returns:
+        An iterator over the indices of the models over the given number of
+        variable names in which the given cube holds.
+    """
+    mask, value = cube
+    free = ((1 << n_variables) - 1) ^ mask
+    subset = 0
+    while True:
+        yield value | subset
+        subset = (subset - free) & free
+        if subset == 0:
+            return
+
+def _irredundant(cubes: List[Cube], n_variables: int) -> List[Cube]:
+    """Removes cubes that are covered by the other given cubes, smallest cubes
+    first.
+
+    Parameters:
+        cubes: cubes over the given number of variable names.
+        n_variables: number of variable names.
+
+    Returns:
+        A sublist of the given list with the same disjunction, none of whose
+        cubes is covered by the others.
+    """
+    counts = [0] * (1 << n_variables)
+    for cube in cubes:
+        for minterm in _cube_minterms(cube, n_variables):
+            counts[minterm] += 1
+    kept = []
+    for cube in sorted(cubes, key=lambda cube: -_popcount(cube[0])):
+        if all(counts[minterm] > 1
+               for minterm in _cube_minterms(cube, n_variables)):
+            for minterm in _cube_minterms(cube, n_variables):
+                counts[minterm] -= 1
+        else:
+            kept.append(cube)
+    return kept
+
+def quine_mccluskey(n_variables: int, bits: int) -> List[Cube]:
+    """Computes a small set of cubes whose disjunction is the given Boolean
+    function, via the Quine--McCluskey method: all prime implicants are
+    computed, the essential ones are taken, the remaining models are covered
+    greedily by the prime implicants that cover the most of them, and prime
+    implicants covered by the others are then removed.
+
+    Parameters:
+        n_variables: number of variable names.
+        bits: bitvector whose ``m``\\ th bit is set if and only if the function
+            holds in the ``m``\\ th model over the given number of variable
+            names.
+
+    Returns:
+        Prime implicants of the given function, such that each model in which
+        it holds is covered by at least one of them.
+    """
+    minterms = {m for m in range(1 << n_variables) if bits >> m & 1}
+    primes = [(cube, cube_bits(cube, n_variables))
+              for cube in prime_implicants(n_variables, minterms)]
+    cover = []
+    uncovered = bits
+    for minterm in sorted(minterms):
+        if not uncovered >> minterm & 1:
+            continue
+        covering = [prime for prime in primes if prime[1] >> minterm & 1]
+        if len(covering) == 1:
+            cover.append(covering[0][0])
+            uncovered &= ~covering[0][1]
+    while uncovered != 0:
+        cube, cube_set = max(primes,
+                             key=lambda prime: _popcount(prime[1] & uncovered))
+        cover.append(cube)
+        uncovered &= ~cube_set
+    return _irredundant(cover, n_variables)
+
+def espresso(n_variables: int, bits: int) -> List[Cube]:
+    """Computes a small set of cubes whose disjunction is the given Boolean
+    function, via the expand and irredundant steps of the Espresso heuristic:
+    each model that is not yet covered is expanded into a prime implicant by
+    dropping every literal whose removal keeps the cube within the function,
+    and cubes covered by other cubes are then removed. No prime implicants are
+    enumerated, and the models of a cube are enumerated while there are at
+    most `ENUMERATED_MODELS_FRACTION` of all models, and are handled as a
+    bitvector otherwise.
+
+    Parameters:
+        n_variables: number of variable names.
+        bits: bitvector whose ``m``\\ th bit is set if and only if the function
+            holds in the ``m``\\ th model over the given number of variable
+            names.
+
+    Returns:
+        Prime implicants of the given function, such that each model in which
+        it holds is covered by at least one of them.
+    """
+    n_models = 1 << n_variables
+    values = format(bits, '0' + str(n_models) + 'b')[::-1]
+    off = ((1 << n_models) - 1) ^ bits
+    patterns = None
+    max_enumerated = n_models // ENUMERATED_MODELS_FRACTION
+    covered = bytearray(n_models)
+    cubes = []
+    minterm = values.find('1')
+    while minterm >= 0:
+        if covered[minterm]:
+            minterm = values.find('1', minterm + 1)
+            continue
+        mask = (1 << n_variables) - 1
+        members = [minterm]
+        cube_set = 0
+        for k in range(n_variables):
+            bit = 1 << k
+            if len(members) <= max_enumerated:
+                flipped = [member ^ bit for member in members]
+                if all(values[member] == '1' for member in flipped):
+                    mask ^= bit
+                    members.extend(flipped)
+                continue
+            if cube_set == 0:
+                patterns = patterns or \
+                           [variable_pattern(n_variables - 1 - j, n_variables)
+                            for j in range(n_variables)]
+                cube_set = cube_bits((mask, minterm & mask), n_variables)
+            # The models of the cube with the k-th literal flipped
+            flipped_set = (cube_set & patterns[k]) >> bit | \
+                          (cube_set & ~patterns[k]) << bit
+            if flipped_set & off == 0:
+                mask ^= bit
+                cube_set |= flipped_set
+        cube = (mask, minterm & mask)
+        cubes.append(cube)
+        for member in _cube_minterms(cube, n_variables):
+            covered[member] = 1
+    return _irredundant(cubes, n_variables)
+
+def minimal_cover(n_variables: int, bits: int) -> List[Cube]:
+    """Computes a small set of cubes whose disjunction is the given Boolean
+    function, via `quine_mccluskey` for at most `QUINE_MCCLUSKEY_VARIABLES`
+    variable names and via `espresso` otherwise.
+
+    Parameters:
+        n_variables: number of variable names.
+        bits: bitvector whose ``m``\\ th bit is set if and only if the function
+            holds in the ``m``\\ th model over the given number of variable
+            names.
+
+    Returns:
+        Prime implicants of the given function, such that each model in which
+        it holds is covered by at least one of them.
+    """
+    if n_variables <= QUINE_MCCLUSKEY_VARIABLES:
+        return quine_mccluskey(n_variables, bits)
+    return espresso(n_variables, bits)
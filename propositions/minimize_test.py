@@ -0,0 +1,92 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/minimize_test.py
+
+"""Tests for the propositions.minimize module."""
+
+from random import Random
+
+from propositions.minimize import *
+from propositions.bitparallel import truth_table_bits
+from propositions.semantics import synthesize, synthesize_cnf
+from propositions.syntax import Formula
+from propositions.workloads import random_formula
+
+def _check_cover(cubes, n_variables, bits):
+    cube_sets = [cube_bits(cube, n_variables) for cube in cubes]
+    assert all(cube_set & ~bits == 0 for cube_set in cube_sets)
+    once = twice = 0
+    for cube_set in cube_sets:
+        twice |= once & cube_set
+        once |= cube_set
+    assert once == bits
+    assert all(cube_set & ~twice != 0 for cube_set in cube_sets)
+
+def test_cube_bits(debug=False):
+    if debug:
+        print('Testing cube_bits')
+    assert cube_bits((0b00, 0b00), 2) == 0b1111
+    assert cube_bits((0b10, 0b10), 2) == 0b1100
+    assert cube_bits((0b01, 0b00), 2) == 0b0101
+    assert cube_bits((0b11, 0b01), 2) == 0b0010
+
+def test_prime_implicants(debug=False):
+    if debug:
+        print('Testing prime_implicants')
+    # (p&q)|(~p&~r)|(q&~r) over p, q, r: the consensus (q&~r) is also prime
+    assert prime_implicants(3, {0, 2, 6, 7}) == \
+           [(0b011, 0b010), (0b101, 0b000), (0b110, 0b110)]
+    assert quine_mccluskey(3, 0b11000101) == [(0b101, 0b000), (0b110, 0b110)]
+    assert prime_implicants(2, set()) == []
+    assert prime_implicants(2, {0, 1, 2, 3}) == [(0, 0)]
+
+def test_minimal_cover(debug=False):
+    rng = Random(0)
+    for n_variables in range(1, 11):
+        for _ in range(10):
+            bits = rng.getrandbits(2 ** n_variables)
+            if debug:
+                print('Testing minimal_cover over', n_variables,
+                      'variable names of', hex(bits))
+            for minimizer in [quine_mccluskey, espresso]:
+                if minimizer is quine_mccluskey and n_variables > 8:
+                    continue
+                _check_cover(minimizer(n_variables, bits), n_variables, bits)
+    for n_variables in [4, 11]:
+        variables = ['x' + str(i) for i in range(1, n_variables + 1)]
+        formula = Formula.parse('((x1&x2)|(~x3&(x4->x2)))')
+        bits = truth_table_bits(formula, variables)
+        if debug:
+            print('Testing minimal_cover of', formula, 'over', variables)
+        assert len(minimal_cover(n_variables, bits)) == 3
+    formula = Formula.parse('(((x1&x2)&x3)|(x4&(x5|x6)))')
+    bits = truth_table_bits(formula, ['x' + str(i) for i in range(1, 21)])
+    assert len(espresso(20, bits)) == 3
+
+def test_minimized_synthesis(debug=False):
+    rng = Random(1)
+    for n_variables in [1, 3, 6, 12]:
+        for _ in range(5):
+            formula = random_formula(rng, n_variables, 6,
+                                     constant_probability=0.05)
+            variables = ['x' + str(i) for i in range(1, n_variables + 1)]
+            bits = truth_table_bits(formula, variables)
+            values = [bits >> m & 1 == 1 for m in range(2 ** n_variables)]
+            for synthesizer in [synthesize, synthesize_cnf]:
+                if debug:
+                    print('Testing minimized', synthesizer.__qualname__,
+                          'of', formula)
+                clause_counts = []
+                synthesized = synthesizer(variables, values, True,
+                                          clause_counts)
+                assert truth_table_bits(synthesized, variables) == bits
+                assert len(clause_counts) == 2
+                assert clause_counts[1] <= max(clause_counts[0], 1)
+
+def test_all(debug=False):
+    test_cube_bits(debug)
+    test_prime_implicants(debug)
+    test_minimal_cover(debug)
+    test_minimized_synthesis(debug)
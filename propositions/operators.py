@@ -7,8 +7,171 @@
 """Syntactic conversion of propositional formulas to use only specific sets of
 operators."""
 
+from typing import AbstractSet, Dict, FrozenSet, List, Mapping, Optional, \
+                   Tuple
+
 from propositions.syntax import *
 from propositions.semantics import *
+from propositions.bitparallel import compile_program
+
+#: Templates of the constants and operators that `to_not_and_or` replaces,
+#: over the operands ``p`` and ``q``.
+_NOT_AND_OR_TEMPLATES = {'T': '(p|~p)', 'F': '(p&~p)', '->': '(~p|q)',
+                         '+': '((p&~q)|(~p&q))', '<->': '((p&q)|(~p&~q))',
+                         '-&': '~(p&q)', '-|': '~(p|q)'}
+
+#: Templates of the constants and operators that `to_not_and` replaces.
+_NOT_AND_TEMPLATES = {'T': '~(p&~p)', 'F': '(p&~p)', '|': '~(~p&~q)',
+                      '->': '~(p&~q)', '+': '(~(p&q)&~(~p&~q))',
+                      '<->': '(~(p&~q)&~(~p&q))', '-&': '~(p&q)',
+                      '-|': '(~p&~q)'}
+
+#: Templates of the constants and operators that `to_nand` replaces.
+_NAND_TEMPLATES = {'T': '(p-&(p-&p))', 'F': '((p-&(p-&p))-&(p-&(p-&p)))',
+                   '~': '(p-&p)', '&': '((p-&q)-&(p-&q))',
+                   '|': '((p-&p)-&(q-&q))', '->': '(p-&(q-&q))',
+                   '+': '((p-&(p-&q))-&(q-&(p-&q)))',
+                   '<->': '(((p-&p)-&(q-&q))-&(p-&q))',
+                   '-|': '(((p-&p)-&(q-&q))-&((p-&p)-&(q-&q)))'}
+
+#: Templates of the constants and operators that `to_implies_not` replaces.
+_IMPLIES_NOT_TEMPLATES = {'T': '(p->p)', 'F': '~(p->p)', '&': '~(p->~q)',
+                          '|': '(~p->q)', '+': '((p->q)->~(q->p))',
+                          '<->': '~((p->q)->~(q->p))', '-&': '(p->~q)',
+                          '-|': '~(~p->q)'}
+
+#: Templates of the constants and operators that `to_implies_false` replaces.
+_IMPLIES_FALSE_TEMPLATES = {'T': '(F->F)', '~': '(p->F)',
+                            '&': '((p->(q->F))->F)', '|': '((p->F)->q)',
+                            '+': '((p->q)->((q->p)->F))',
+                            '<->': '(((p->q)->((q->p)->F))->F)',
+                            '-&': '(p->(q->F))', '-|': '(((p->F)->q)->F)'}
+
+class _DAGBuilder:
+    """A builder of formulas that constructs each distinct node (a root
+    applied to operand objects) only once, so that the formulas that it
+    builds share their equal subformulas."""
+    def __init__(self):
+        """Initializes an empty `_DAGBuilder`."""
+        self._nodes: Dict[Tuple[str, int, int], Formula] = {}
+
+    def build(self, root: str, now: Optional[Formula] = None,
+              next: Optional[Formula] = None,
+              existing: Optional[Formula] = None) -> Formula:
+        """Returns the node with the given root and operands.
+
+        Parameters:
+            root: the root of the node.
+            now: the now operand of the node, if any.
+            next: the next operand of the node, if any.
+            existing: a formula with the given root and operands to use as the
+                node if it was not built yet.
+
+        Returns:
+            The node with the given root and operands, which is the same
+            object for all calls with the same arguments.
+        """
+        key = (root, id(now), id(next))
+        node = self._nodes.get(key)
+        if node is None:
+            if existing is not None:
+                node = existing
+            elif next is not None:
+                node = Formula(root, now, next)
+            elif now is not None:
+                node = Formula(root, now)
+            else:
+                node = Formula(root)
+            self._nodes[key] = node
+        return node
+
+    def instantiate(self, template: Formula, now: Optional[Formula],
+                    next: Optional[Formula]) -> Formula:
+        """Substitutes the given operands for ``p`` and ``q`` in the given
+        template, without copying them.
+
+        Parameters:
+            template: template to instantiate, over the variable names ``p``
+                and ``q``.
+            now: formula to substitute for ``p``, or ``None`` to keep ``p``.
+            next: formula to substitute for ``q``, or ``None`` to keep ``q``.
+
+        Returns:
+            The instantiated template.
+        """
+        instances: Dict[int, Formula] = {}
+        stack: List[Tuple[Formula, bool]] = [(template, False)]
+        while len(stack) > 0:
+            current, done = stack.pop()
+            if id(current) in instances:
+                continue
+            if current.root == 'p' and now is not None:
+                instances[id(current)] = now
+            elif current.root == 'q' and next is not None:
+                instances[id(current)] = next
+            elif is_variable(current.root) or is_constant(current.root):
+                instances[id(current)] = self.build(current.root)
+            elif not done:
+                stack.append((current, True))
+                stack.append((current.now, False))
+                if is_binary(current.root):
+                    stack.append((current.next, False))
+            elif is_unary(current.root):
+                instances[id(current)] = \
+                    self.build(current.root, instances[id(current.now)])
+            else:
+                instances[id(current)] = \
+                    self.build(current.root, instances[id(current.now)],
+                               instances[id(current.next)])
+        return instances[id(template)]
+
+def _convert(formula: Formula, templates: Mapping[str, str]) -> Formula:
+    """Replaces each constant or operator of the given formula that has a
+    template with the template applied to its converted operands. Each
+    distinct subformula (object) is converted only once, and equal nodes of
+    the conversion are constructed only once, so that the size of the result
+    (as a DAG) is linear in the size of the given formula (as a DAG), even
+    though templates may use their operands several times.
+
+    Parameters:
+        formula: formula to convert.
+        templates: mapping from constants and operators to the standard
+            string representations of their templates, over the operands
+            ``p`` and ``q``.
+
+    Returns:
+        The converted formula, which shares the subformulas of the given
+        formula that need no conversion.
+    """
+    builder = _DAGBuilder()
+    parsed: Dict[str, Formula] = {}
+    converted: Dict[int, Formula] = {}
+    stack: List[Tuple[Formula, bool]] = [(formula, False)]
+    while len(stack) > 0:
+        current, done = stack.pop()
+        if id(current) in converted:
+            continue
+        now = getattr(current, 'now', None)
+        next = getattr(current, 'next', None)
+        if not done and now is not None:
+            stack.append((current, True))
+            stack.append((now, False))
+            if next is not None:
+                stack.append((next, False))
+            continue
+        new_now = None if now is None else converted[id(now)]
+        new_next = None if next is None else converted[id(next)]
+        if current.root in templates:
+            if current.root not in parsed:
+                parsed[current.root] = Formula.parse(templates[current.root])
+            result = builder.instantiate(parsed[current.root], new_now,
+                                         new_next)
+        elif new_now is now and new_next is next:
+            result = builder.build(current.root, now, next, current)
+        else:
+            result = builder.build(current.root, new_now, new_next)
+        converted[id(current)] = result
+    return converted[id(formula)]
 
 def to_not_and_or(formula: Formula) -> Formula:
     """Syntactically converts the given formula to an equivalent formula that
@@ -23,6 +186,7 @@ def to_not_and_or(formula: Formula) -> Formula:
         ``'|'``.
     """
     # Task 3.5
+    return _convert(formula, _NOT_AND_OR_TEMPLATES)
 
 def to_not_and(formula: Formula) -> Formula:
     """Syntactically converts the given formula to an equivalent formula that
@@ -36,6 +200,7 @@ def to_not_and(formula: Formula) -> Formula:
         contains no constants or operators beyond ``'~'`` and ``'&'``.
     """
     # Task 3.6a
+    return _convert(formula, _NOT_AND_TEMPLATES)
 
 def to_nand(formula: Formula) -> Formula:
     """Syntactically converts the given formula to an equivalent formula that
@@ -49,6 +214,7 @@ def to_nand(formula: Formula) -> Formula:
         contains no constants or operators beyond ``'-&'``.
     """
     # Task 3.6b
+    return _convert(formula, _NAND_TEMPLATES)
 
 def to_implies_not(formula: Formula) -> Formula:
     """Syntactically converts the given formula to an equivalent formula that
@@ -62,6 +228,7 @@ def to_implies_not(formula: Formula) -> Formula:
         contains no constants or operators beyond ``'->'`` and ``'~'``.
     """
     # Task 3.6c
+    return _convert(formula, _IMPLIES_NOT_TEMPLATES)
 
 def to_implies_false(formula: Formula) -> Formula:
     """Syntactically converts the given formula to an equivalent formula that
@@ -75,3 +242,272 @@ def to_implies_false(formula: Formula) -> Formula:
         contains no constants or operators beyond ``'->'`` and ``'F'``.
     """
     # Task 3.6d
+    return _convert(formula, _IMPLIES_FALSE_TEMPLATES)
+
+#: The conversions of this module, by the operators that their results may
+#: contain.
+BASES = {'~&|': to_not_and_or, '~&': to_not_and, '-&': to_nand,
+         '->~': to_implies_not, '->F': to_implies_false}
+
+def node_count(formula: Formula) -> int:
+    """Counts the distinct subformulas (objects) of the given formula, i.e.,
+    its size as a DAG.
+
+    Parameters:
+        formula: formula to count the subformulas of.
+
+    Returns:
+        The number of distinct subformulas of the given formula.
+    """
+    return len(compile_program(formula))
+
+def conversion_sizes(formula: Formula) -> Dict[str, int]:
+    """Computes the size of the conversion of the given formula to each of the
+    bases of `BASES`.
+
+    Parameters:
+        formula: formula to convert.
+
+    Returns:
+        A mapping from each key of `BASES` to the `node_count` of the
+        conversion of the given formula to that basis.
+    """
+    return {basis: node_count(convert(formula))
+            for basis, convert in BASES.items()}
+
+def basis_definitions(formula: Formula, basis: str) -> \
+        Tuple[Formula, List[Tuple[str, Formula]]]:
+    """Converts the given formula to the given basis as Tseitin-style
+    definitions: a fresh variable name for each distinct operator subformula
+    of the conversion, defined as that operator applied to (the variable names
+    for) its operands.
+
+    Parameters:
+        formula: formula to convert.
+        basis: key of `BASES` of the basis to convert to.
+
+    Returns:
+        A pair of a formula and a list of pairs of a fresh variable name and
+        its definition, in which operands are defined before their uses. The
+        formula is a constant, a variable name of the given formula, or the
+        fresh variable name of the last definition. Substituting the
+        definitions for the fresh variable names in the formula yields a
+        formula that has the same truth table as the given formula, and
+        contains no constants or operators beyond those of the basis.
+
+    Examples:
+        >>> basis_definitions(Formula.parse('(p->(q&p))'), '->~')
+        (z4, [('z1', ~p), ('z2', (q->z1)), ('z3', ~z2), ('z4', (p->z3))])
+    """
+    program = compile_program(BASES[basis](formula))
+    # Fresh variable names, avoiding those of the formula
+    taken = {root for root, first, _, _ in program
+             if first < 0 and is_variable(root)}
+    counter = 0
+    operands: List[Formula] = []
+    definitions: List[Tuple[str, Formula]] = []
+    for root, first, second, _ in program:
+        if first < 0:
+            operands.append(Formula(root))
+            continue
+        counter += 1
+        while 'z' + str(counter) in taken:
+            counter += 1
+        name = 'z' + str(counter)
+        if second < 0:
+            definitions.append((name, Formula(root, operands[first])))
+        else:
+            definitions.append((name, Formula(root, operands[first],
+                                              operands[second])))
+        operands.append(Formula(name))
+    return operands[-1], definitions
+
+#: The cost models of `optimal_templates`: ``'size'`` for the number of
+#: distinct operator subformulas, ``'depth'`` for the maximal number of nested
+#: operators, and ``'evaluation'`` for the total `EVALUATION_COSTS` of the
+#: distinct operator subformulas.
+COST_MODELS = ('size', 'depth', 'evaluation')
+
+#: The cost of each operator under the ``'evaluation'`` cost model: the
+#: number of bitvector operations with which
+#: `~propositions.bitparallel.run_program` evaluates it.
+EVALUATION_COSTS = {'~': 1, '&': 1, '|': 1, '+': 1, '->': 2,
+                    '<->': 2, '-&': 2, '-|': 2}
+
+#: Functions from an operator and the bitvectors of its operands, and a mask,
+#: to the bitvector of the operator applied to them.
+_BITVECTOR_OPERATORS = {
+    '~': lambda now, next, mask: mask ^ now,
+    '&': lambda now, next, mask: now & next,
+    '|': lambda now, next, mask: now | next,
+    '->': lambda now, next, mask: (mask ^ now) | next,
+    '+': lambda now, next, mask: now ^ next,
+    '<->': lambda now, next, mask: mask ^ now ^ next,
+    '-&': lambda now, next, mask: mask ^ (now & next),
+    '-|': lambda now, next, mask: mask ^ (now | next)}
+
+_optimal_templates: Dict[Tuple[AbstractSet[str], str], Dict[str, str]] = {}
+
+def _cheapest_expressions(operators: AbstractSet[str], cost_model: str,
+                          leaves: Mapping[str, int], mask: int) -> \
+        Dict[int, Tuple[Tuple[int, int, int, int], str]]:
+    """Finds a cheapest expression of each truth function of the given leaves
+    that can be expressed with the given constants and operators. The size
+    and evaluation cost of an expression count each of its distinct
+    subexpressions once, as `_convert` constructs them only once, and
+    constants not at all, as they are leaves like variable names. Among
+    equally cheap expressions, ones with fewer subexpressions that depend on
+    more than one leaf are preferred, as subexpressions of a single operand
+    are more likely to be shared with the templates of other operators.
+
+    Parameters:
+        operators: constants and operators that the expressions may contain.
+        cost_model: cost model out of `COST_MODELS` to minimize.
+        leaves: mapping from each variable name that the expressions may
+            contain to the bitvector of its truth values.
+        mask: bitvector whose bits are set exactly in all models.
+
+    Returns:
+        A mapping from the bitvector of each expressible truth function to a
+        pair of its cost, as a quadruplet of the cost under the given model,
+        the size, the number of subexpressions that depend on more than one
+        leaf, and the depth of the expression, and the standard string
+        representation of the expression.
+    """
+    # The truth functions that depend on at most one leaf
+    simple = {0, mask}
+    for pattern in leaves.values():
+        simple.update((pattern, mask ^ pattern))
+    # The best expression of each truth function found so far, with its
+    # depth and the triplets of each of its distinct operator subexpressions,
+    # their roots, and whether they depend on more than one leaf, where
+    # remaining ties are broken by the expressions
+    best: Dict[int, Tuple[Tuple[int, int, int, int], int,
+                          FrozenSet[Tuple[str, str, bool]], str]] = {}
+
+    def offer(bits: int, depth: int, nodes: FrozenSet[Tuple[str, str, bool]],
+              expression: str) -> bool:
+        size = len(nodes)
+        evaluation = sum(EVALUATION_COSTS[root] for _, root, _ in nodes)
+        mixed = sum(1 for _, _, compound in nodes if compound)
+        primary = {'size': size, 'depth': depth,
+                   'evaluation': evaluation}[cost_model]
+        cost = (primary, size, mixed, depth)
+        if bits in best and \
+                (best[bits][0], best[bits][3]) <= (cost, expression):
+            return False
+        best[bits] = (cost, depth, nodes, expression)
+        return True
+
+    for name, bits in leaves.items():
+        offer(bits, 0, frozenset(), name)
+    for constant, bits in (('T', mask), ('F', 0)):
+        if constant in operators:
+            offer(bits, 0, frozenset(), constant)
+    # Every strict improvement lowers the cost of some truth function, so
+    # relaxing until nothing improves terminates
+    improved = True
+    while improved:
+        improved = False
+        entries = list(best.items())
+        for operator in sorted(operators):
+            if is_unary(operator):
+                for bits, (_, depth, nodes, expression) in entries:
+                    expression = operator + expression
+                    bits = _BITVECTOR_OPERATORS[operator](bits, 0, mask)
+                    improved |= offer(
+                        bits, depth + 1,
+                        nodes | {(expression, operator, bits not in simple)},
+                        expression)
+            elif is_binary(operator):
+                function = _BITVECTOR_OPERATORS[operator]
+                for first, (_, depth1, nodes1, expression1) in entries:
+                    for second, (_, depth2, nodes2, expression2) in entries:
+                        expression = \
+                            '(' + expression1 + operator + expression2 + ')'
+                        bits = function(first, second, mask)
+                        improved |= offer(
+                            bits, max(depth1, depth2) + 1,
+                            nodes1 | nodes2 |
+                            {(expression, operator, bits not in simple)},
+                            expression)
+    return {bits: (cost, expression)
+            for bits, (cost, _, _, expression) in best.items()}
+
+def optimal_templates(operators: AbstractSet[str],
+                      cost_model: str = 'size') -> Dict[str, str]:
+    """Computes, for each constant and operator that is not among the given
+    ones, a cheapest template that expresses it with the given constants and
+    operators, in the form of `_convert` (and of the substitution maps of
+    `~propositions.syntax.Formula.substitute_operators`). The templates are
+    cached per set of constants and operators and cost model.
+
+    Parameters:
+        operators: constants and operators that the templates may contain.
+        cost_model: cost model out of `COST_MODELS` to minimize.
+
+    Returns:
+        A mapping from each constant and operator that is not among the given
+        ones, and that can be expressed with them, to the standard string
+        representation of a cheapest template for it, over the operands ``p``
+        (for unary and binary operators, and for constants if needed) and
+        ``q`` (for binary operators).
+
+    Examples:
+        >>> optimal_templates({'->', 'F'})['|']
+        '((p->F)->q)'
+    """
+    assert cost_model in COST_MODELS
+    operators = frozenset(operators)
+    for operator in operators:
+        assert is_constant(operator) or is_unary(operator) or \
+               is_binary(operator)
+    cached = _optimal_templates.get((operators, cost_model))
+    if cached is not None:
+        return cached
+    # Constants and unary operators are expressed over p alone, and binary
+    # operators over p and q
+    unary = _cheapest_expressions(operators, cost_model, {'p': 0b10}, 0b11)
+    binary = _cheapest_expressions(operators, cost_model,
+                                   {'p': 0b1100, 'q': 0b1010}, 0b1111)
+    templates = {}
+    for source in ('T', 'F') + tuple(EVALUATION_COSTS):
+        if source in operators or not is_constant(source) and \
+                not is_unary(source) and not is_binary(source):
+            continue
+        if source == 'T' or source == 'F':
+            best = unary.get(0b11 if source == 'T' else 0)
+        elif is_unary(source):
+            best = unary.get(_BITVECTOR_OPERATORS[source](0b10, 0, 0b11))
+        else:
+            best = binary.get(_BITVECTOR_OPERATORS[source](0b1100, 0b1010,
+                                                           0b1111))
+        if best is not None:
+            templates[source] = best[1]
+    _optimal_templates[operators, cost_model] = templates
+    return templates
+
+def to_basis(formula: Formula, operators: AbstractSet[str],
+             cost_model: str = 'size') -> Formula:
+    """Syntactically converts the given formula to an equivalent formula that
+    contains no constants or operators beyond the given ones, by replacing
+    each constant and operator that is not among them with its template from
+    `optimal_templates`, in a single pass over the distinct subformulas of the
+    given formula.
+
+    Parameters:
+        formula: formula to convert.
+        operators: constants and operators that the converted formula may
+            contain.
+        cost_model: cost model out of `COST_MODELS` by which to choose the
+            templates.
+
+    Returns:
+        A formula that has the same truth table as the given formula, but
+        contains no constants or operators beyond the given ones.
+    """
+    templates = optimal_templates(operators, cost_model)
+    for operator in formula.operators():
+        assert operator in operators or operator in templates, \
+               operator + ' cannot be expressed with the given operators'
+    return _convert(formula, templates)
@@ -85,6 +85,88 @@ def test_to_implies_false(debug=False):
                str(ff) + ' contains wrong operators'
         assert is_tautology(Formula('<->', f, ff))
 
+_basis_operators = {'~&|': {'~', '&', '|'}, '~&': {'~', '&'}, '-&': {'-&'},
+                    '->~': {'->', '~'}, '->F': {'->', 'F'}}
+
+def test_dag_conversion(debug=False):
+    # Nested biconditionals and exclusive ors, whose conversions use each of
+    # their operands more than once
+    f = Formula('x0')
+    for i in range(1, 40):
+        f = Formula('<->' if i % 2 == 1 else '+', f, Formula('x' + str(i % 5)))
+    sizes = conversion_sizes(f)
+    assert set(sizes) == set(BASES)
+    for basis, convert in BASES.items():
+        if debug:
+            print('Testing conversion of nested biconditionals to basis',
+                  basis)
+        ff = convert(f)
+        assert node_count(ff) == sizes[basis] <= 8 * node_count(f)
+        assert ff.operators().issubset(_basis_operators[basis])
+        assert is_tautology(Formula('<->', f, ff))
+
+def test_basis_definitions(debug=False):
+    for basis in BASES:
+        for f in many_fs:
+            if debug:
+                print('Testing definitions of', f, 'in basis', basis)
+            f = Formula.parse(f)
+            root, definitions = basis_definitions(f, basis)
+            expansions = {}
+            for name, definition in definitions:
+                assert name not in f.variables()
+                assert definition.operators().issubset(
+                    _basis_operators[basis])
+                operands = [expansions.get(str(operand), operand)
+                            for operand in (definition.now,
+                                            getattr(definition, 'next', None))
+                            if operand is not None]
+                expansions[name] = Formula(definition.root, *operands)
+            ff = expansions.get(str(root), root)
+            assert is_tautology(Formula('<->', f, ff))
+
+def _template_size(template):
+    formula = Formula.parse(template)
+    stack = [formula]
+    size = 0
+    while len(stack) > 0:
+        current = stack.pop()
+        if not is_variable(current.root):
+            size += 1
+            stack.extend(operand for operand in (getattr(current, 'now', None),
+                                                 getattr(current, 'next', None))
+                         if operand is not None)
+    return size
+
+def test_optimal_templates(debug=False):
+    from propositions import operators
+    for basis, fixed in [('~&|', operators._NOT_AND_OR_TEMPLATES),
+                         ('~&', operators._NOT_AND_TEMPLATES),
+                         ('-&', operators._NAND_TEMPLATES),
+                         ('->~', operators._IMPLIES_NOT_TEMPLATES),
+                         ('->F', operators._IMPLIES_FALSE_TEMPLATES)]:
+        if debug:
+            print('Testing optimal templates for basis', basis)
+        templates = optimal_templates(_basis_operators[basis])
+        assert set(templates) == set(fixed)
+        for source, template in templates.items():
+            assert _template_size(template) <= _template_size(fixed[source])
+        assert optimal_templates(_basis_operators[basis]) is templates
+
+def test_to_basis(debug=False):
+    for basis in [{'~', '&', '|'}, {'~', '&'}, {'-&'}, {'-|'}, {'->', '~'},
+                  {'->', 'F'}, {'&', '+', 'T'}]:
+        for cost_model in COST_MODELS:
+            for f in many_fs:
+                if debug:
+                    print('Testing conversion of', f, 'to', sorted(basis),
+                          'minimizing', cost_model)
+                f = Formula.parse(f)
+                ff = to_basis(f, basis, cost_model)
+                assert ff.operators().issubset(basis), \
+                       str(ff) + ' contains wrong operators'
+                assert is_tautology(Formula('<->', f, ff))
+
 def test_ex3(debug=False):
     assert is_binary('+'), 'Change is_binary() before testing Chapter 3 tasks.'
     test_operators_defined(debug)
@@ -93,6 +175,10 @@ def test_ex3(debug=False):
     test_to_nand(debug)
     test_to_implies_not(debug)
     test_to_implies_false(debug)
+    test_dag_conversion(debug)
+    test_basis_definitions(debug)
+    test_optimal_templates(debug)
+    test_to_basis(debug)
 
 def test_all(debug=False):
     test_ex3(debug)
@@ -0,0 +1,231 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/parallel.py
+
+"""Multi-process search of the models of propositional formulas."""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import Event
+from typing import Mapping, Optional, Sequence
+
+from propositions.syntax import *
+from propositions.bitparallel import CompiledFormula, Program, \
+                                     compile_formula, compile_program, \
+                                     compile_program_function, \
+                                     variable_pattern
+
+#: The minimal number of variable names for which `find_model` searches in
+#: worker processes, rather than in the current process.
+PARALLEL_VARIABLES = 20
+
+#: The number of shards per worker process that `find_model` splits the models
+#: into by default, so that processes that finish their shards early take over
+#: further ones.
+SHARDS_PER_PROCESS = 4
+
+#: The number of variable names whose models are evaluated together in each
+#: step of a shard, between checks of whether the search is already decided.
+SHARD_CHUNK_VARIABLES = 16
+
+# The event that a worker process checks between steps, and the formula that
+# it searches, compiled once per worker process
+_stop = None
+_function = None
+
+def _initialize_worker(stop: Event, program: Program,
+                       variables: Sequence[str]) -> None:
+    """Initializes a worker process of `find_model`.
+
+    Parameters:
+        stop: event that is set once the search is decided.
+        program: program of the formula to search the models of.
+        variables: variable names of the models, a superset of those of the
+            given program.
+    """
+    global _stop, _function
+    _stop = stop
+    _function = compile_program_function(program, variables)
+
+def _search_worker_shard(n_variables: int, n_fixed: int, shard: int,
+                         value: bool) -> Optional[int]:
+    """Searches the models of a shard via `_search_shard`, in a worker process
+    initialized by `_initialize_worker`.
+
+    Parameters:
+        n_variables: number of variable names of the models.
+        n_fixed: number of first variable names whose truth values are fixed
+            in each shard.
+        shard: the truth values of the fixed variable names in the shard to
+            search.
+        value: truth value to search for.
+
+    Returns:
+        The index of the first model of the shard in which the formula of the
+        worker process has the given truth value, or ``None``.
+    """
+    return _search_shard(_function, n_variables, n_fixed, shard, value)
+
+def _search_shard(function: CompiledFormula, n_variables: int, n_fixed: int,
+                  shard: int, value: bool) -> Optional[int]:
+    """Searches the models of a shard for one in which the given compiled
+    formula has the given truth value, bit-parallel.
+
+    Parameters:
+        function: compiled formula to search the models of.
+        n_variables: number of variable names of the models, the arguments of
+            the given compiled formula.
+        n_fixed: number of first variable names whose truth values are fixed
+            in each shard.
+        shard: the truth values of the fixed variable names in the shard to
+            search, as the bits of an index in the order of
+            `~propositions.semantics.all_models`.
+        value: truth value to search for.
+
+    Returns:
+        The index, in the order of
+        `~propositions.semantics.all_models` of the variable names, of the
+        first model of the shard in which the given compiled formula has the
+        given truth value, or ``None`` if there is no such model or if the
+        search was decided by another worker process in the meantime.
+    """
+    n_free = n_variables - n_fixed
+    n_chunk = min(n_free, SHARD_CHUNK_VARIABLES)
+    n_high = n_variables - n_chunk
+    width = 1 << n_chunk
+    mask = (1 << width) - 1
+    values = [0] * n_high + [variable_pattern(i, n_chunk)
+                             for i in range(n_chunk)]
+    first = shard << (n_free - n_chunk)
+    for chunk in range(first, first + (1 << (n_free - n_chunk))):
+        if _stop is not None and _stop.is_set():
+            return None
+        for i in range(n_high):
+            values[i] = mask if chunk >> (n_high - 1 - i) & 1 else 0
+        bits = function(values, mask)
+        if not value:
+            bits ^= mask
+        if bits != 0:
+            return (chunk << n_chunk) + (bits & -bits).bit_length() - 1
+    return None
+
+def _search_in_processes(formula: Formula, variables: Sequence[str],
+                         n_fixed: int, value: bool,
+                         processes: int) -> Optional[int]:
+    """Searches all shards for a model in which the given formula has the
+    given truth value, in worker processes, and cancels the remaining shards
+    as soon as such a model is found.
+
+    Parameters:
+        formula: formula to search the models of.
+        variables: variable names of the models, a superset of those of the
+            given formula.
+        n_fixed: number of first variable names whose truth values are fixed
+            in each shard.
+        value: truth value to search for.
+        processes: number of worker processes.
+
+    Returns:
+        The index, in the order of
+        `~propositions.semantics.all_models`\\ ``(``\\ `variables`\\ ``)``, of
+        some model in which the given formula has the given truth value, or
+        ``None`` if there is no such model.
+    """
+    # The program shares equal subformulas, so that a formula with many
+    # shared subformulas is shipped and compiled in time linear in their number
+    program = compile_program(formula)
+    stop = Event()
+    with ProcessPoolExecutor(processes, initializer=_initialize_worker,
+                             initargs=(stop, program, variables)) as executor:
+        pending = {executor.submit(_search_worker_shard, len(variables),
+                                   n_fixed, shard, value)
+                   for shard in range(1 << n_fixed)}
+        try:
+            while len(pending) > 0:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = future.result()
+                    if index is not None:
+                        return index
+            return None
+        finally:
+            # Shards that have not started are cancelled, and those that are
+            # running stop at their next step
+            stop.set()
+            for future in pending:
+                future.cancel()
+
+def find_model(formula: Formula, value: bool,
+               processes: Optional[int] = None,
+               shard_variables: Optional[int] = None) -> \
+        Optional[Mapping[str, bool]]:
+    """Searches for a model in which the given formula has the given truth
+    value, by fixing the truth values of its first variable names in every
+    possible way to split its models into shards, and searching the shards
+    bit-parallel in worker processes (for formulas with at least
+    `PARALLEL_VARIABLES` variable names). The formula is shipped to the worker
+    processes as a `~propositions.bitparallel.Program`, and compiled once in
+    each of them.
+
+    Parameters:
+        formula: formula to search the models of.
+        value: truth value to search for.
+        processes: number of worker processes, or ``None`` for the number of
+            processors.
+        shard_variables: number of variable names whose truth values are fixed
+            in each shard, or ``None`` for enough variable names to have
+            `SHARDS_PER_PROCESS` shards per worker process.
+
+    Returns:
+        A model over the variable names of the given formula in which it has
+        the given truth value, or ``None`` if there is no such model.
+    """
+    variables = sorted(formula.variables())
+    if processes is None:
+        processes = os.cpu_count() or 1
+    assert processes > 0
+    if shard_variables is None:
+        shard_variables = (processes * SHARDS_PER_PROCESS - 1).bit_length()
+    n_fixed = min(shard_variables, len(variables))
+    if len(variables) < PARALLEL_VARIABLES:
+        index = _search_shard(compile_formula(formula, variables),
+                              len(variables), 0, 0, value)
+    else:
+        index = _search_in_processes(formula, variables, n_fixed, value,
+                                     processes)
+    if index is None:
+        return None
+    return {variable: index >> (len(variables) - 1 - i) & 1 == 1
+            for i, variable in enumerate(variables)}
+
+def counterexample(formula: Formula, processes: Optional[int] = None) -> \
+        Optional[Mapping[str, bool]]:
+    """Checks if the given formula is a tautology, via `find_model`.
+
+    Parameters:
+        formula: formula to check.
+        processes: number of worker processes, or ``None`` for the number of
+            processors.
+
+    Returns:
+        A model over the variable names of the given formula in which it does
+        not hold, or ``None`` if the given formula is a tautology.
+    """
+    return find_model(formula, False, processes)
+
+def satisfying_model(formula: Formula, processes: Optional[int] = None) -> \
+        Optional[Mapping[str, bool]]:
+    """Checks if the given formula is satisfiable, via `find_model`.
+
+    Parameters:
+        formula: formula to check.
+        processes: number of worker processes, or ``None`` for the number of
+            processors.
+
+    Returns:
+        A model over the variable names of the given formula in which it
+        holds, or ``None`` if the given formula is not satisfiable.
+    """
+    return find_model(formula, True, processes)
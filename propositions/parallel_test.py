@@ -0,0 +1,116 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/parallel_test.py
+
+"""Tests for the propositions.parallel module."""
+
+from random import Random
+
+from propositions import parallel
+from propositions.parallel import *
+from propositions.bitparallel import evaluate_model, truth_table_bits
+from propositions.semantics import is_satisfiable, is_tautology, set_backend
+from propositions.workloads import balanced_formula, random_cnf, \
+                                   random_formula
+
+def _check(formula, value, model):
+    variables = sorted(formula.variables())
+    bits = truth_table_bits(formula, variables)
+    if not value:
+        bits ^= (1 << (1 << len(variables))) - 1
+    if bits == 0:
+        assert model is None, str(formula)
+    else:
+        assert model is not None, str(formula)
+        assert set(model) == set(variables)
+        assert evaluate_model(formula, model) == value
+
+def test_find_model(debug=False):
+    rng = Random(0)
+    for string in ['p', '~p', 'T', 'F', '(p|~p)', '(p&~p)', '(p->q)']:
+        for value in (False, True):
+            if debug:
+                print('Testing find_model of', string, 'with value', value)
+            _check(Formula.parse(string), value,
+                   find_model(Formula.parse(string), value))
+    for _ in range(100):
+        formula = random_formula(rng, 8, 6, constant_probability=0.05)
+        if debug:
+            print('Testing find_model of', formula)
+        _check(formula, True, satisfying_model(formula))
+        _check(formula, False, counterexample(formula))
+
+def test_processes(debug=False):
+    rng = Random(1)
+    previous = parallel.PARALLEL_VARIABLES
+    parallel.PARALLEL_VARIABLES = 0
+    try:
+        for shard_variables in (0, 1, 3, 12):
+            formula = random_cnf(rng, 10, rng.randrange(30, 50))
+            for value in (False, True):
+                if debug:
+                    print('Testing find_model of', formula, 'in', 2,
+                          'processes with', shard_variables,
+                          'shard variable names')
+                _check(formula, value, find_model(formula, value, 2,
+                                                  shard_variables))
+        # A tautology has no counterexample in any of the shards
+        names = [Formula('x' + str(i)) for i in range(1, 11)]
+        formula = Formula('|', balanced_formula('&', names),
+                          balanced_formula('|', [Formula('~', name)
+                                                 for name in names]))
+        if debug:
+            print('Testing counterexample of', formula, 'in 3 processes')
+        assert counterexample(formula, 3) is None
+    finally:
+        parallel.PARALLEL_VARIABLES = previous
+
+def test_shared_subformulas(debug=False):
+    previous = parallel.PARALLEL_VARIABLES
+    parallel.PARALLEL_VARIABLES = 0
+    try:
+        # A formula with 60 distinct subformulas but 2**60 tree nodes
+        names = [Formula('x' + str(i)) for i in range(1, 11)]
+        formula = balanced_formula('|', names)
+        for i in range(60):
+            formula = Formula('&' if i % 2 == 0 else '|', formula, formula)
+        formula = Formula('->', formula, names[0])
+        if debug:
+            print('Testing find_model of a formula with shared subformulas in',
+                  2, 'processes')
+        for value in (False, True):
+            _check(formula, value, find_model(formula, value, 2))
+    finally:
+        parallel.PARALLEL_VARIABLES = previous
+
+def test_large_instance(debug=False):
+    # Exactly the model in which all variable names are true falsifies it,
+    # and it is in the last shard
+    names = [Formula('x' + str(i)) for i in range(1, 25)]
+    formula = Formula('->', balanced_formula('&', names),
+                      Formula('~', names[-1]))
+    if debug:
+        print('Testing counterexample of a formula with 24 variable names')
+    model = counterexample(formula, 2)
+    assert model == {'x' + str(i): True for i in range(1, 25)}
+
+def test_backend(debug=False):
+    if debug:
+        print('Testing the parallel backend')
+    previous = set_backend('parallel')
+    try:
+        assert is_tautology(Formula.parse('((p->q)|(q->p))'))
+        assert not is_tautology(Formula.parse('(p->q)'))
+        assert is_satisfiable(Formula.parse('(p&~q)'))
+        assert not is_satisfiable(Formula.parse('(p&~p)'))
+    finally:
+        set_backend(previous)
+
+def test_all(debug=False):
+    test_find_model(debug)
+    test_processes(debug)
+    test_shared_subformulas(debug)
+    test_large_instance(debug)
+    test_backend(debug)
@@ -10,15 +10,14 @@ from __future__ import annotations
 from typing import AbstractSet, FrozenSet, List, Mapping, Optional, Sequence, \
                    Set, Tuple, Union
 
-from logic_utils import frozen, memoized_parameterless_method
+from logic_utils import Immutable, memoized_parameterless_method
 
 from propositions.syntax import *
 
 #: A mapping from variable names to formulas.
 SpecializationMap = Mapping[str, Formula]
 
-@frozen
-class InferenceRule:
+class InferenceRule(Immutable):
     """An immutable inference rule in Propositional Logic, comprised of zero
     or more assumed propositional formulas, and a conclusion propositional
     formula.
@@ -79,7 +78,7 @@ class InferenceRule:
         return not self == other
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return hash((self.assumptions, self.conclusion))
         
     def variables(self) -> Set[str]:
         """Finds all variable names in the current inference rule.
@@ -176,8 +175,7 @@ class InferenceRule:
         """
         return general.specialization_map(self) is not None
 
-@frozen
-class Proof:
+class Proof(Immutable):
     """An immutable deductive proof in Propositional Logic, comprised of a
     statement in the form of an inference rule, a set of inference rules that
     may be used in the proof, and a list of lines that prove the statement via
@@ -208,8 +206,7 @@ class Proof:
         self.rules = frozenset(rules)
         self.lines = tuple(lines)
 
-    @frozen
-    class Line:
+    class Line(Immutable):
         """An immutable line in a deductive proof, comprised of a formula that
         is justified either as an assumption of the proof, or as the conclusion
         of a specialization of an allowed inference rule of the proof, the
@@ -7,10 +7,11 @@
 """Reduction between computational search problems."""
 
 from __future__ import annotations
-from typing import AbstractSet, Mapping, Tuple, Union
+from typing import AbstractSet, Iterator, List, Mapping, TextIO, Tuple, Union
 
 from propositions.syntax import *
 from propositions.semantics import *
+from propositions.sat import Clause
 
 #: A graph on a vertex set of the form ``(1,``...\ ``,``\ `n_vertices`\ ``)``,
 #: represented by the number of vertices `n_vertices` and a set of edges over
@@ -59,6 +60,89 @@ def is_valid_3coloring(graph: Graph, coloring: Mapping[int, int]) -> bool:
             return False
     return True
 
+def coloring_variable(vertex: int, color: int) -> int:
+    """Numbers the variable of the reduction of `graph3coloring_clauses` that
+    states that the given vertex has the given color.
+
+    Parameters:
+        vertex: vertex of a graph.
+        color: color out of 1, 2, and 3.
+
+    Returns:
+        The number of the variable, so that the variables of the vertices
+        ``1``, ..., `n_vertices` are numbered consecutively from ``1`` to
+        ``3*``\\ `n_vertices`.
+    """
+    assert vertex >= 1 and color in {1, 2, 3}
+    return 3 * (vertex - 1) + color
+
+def graph3coloring_clauses(graph: Graph) -> Iterator[Clause]:
+    """Lazily reduces the 3-coloring problem of the given graph into a
+    satisfiability problem in conjunctive normal form, in time linear in the
+    size of the graph.
+
+    Parameters:
+        graph: graph whose 3-coloring problem to reduce.
+
+    Returns:
+        An iterator over clauses over the variables numbered by
+        `coloring_variable`: a clause stating that each vertex has some
+        color, followed by three clauses for each edge stating that its ends
+        do not both have each of the colors. The clauses are satisfiable if
+        and only if the given graph is 3-colorable.
+    """
+    n_vertices, edges = graph
+    for vertex in range(1, n_vertices + 1):
+        yield [3 * vertex - 2, 3 * vertex - 1, 3 * vertex]
+    for first, second in edges:
+        for color in (1, 2, 3):
+            yield [-(3 * first - 3 + color), -(3 * second - 3 + color)]
+
+def graph3coloring_dimacs(graph: Graph) -> Iterator[str]:
+    """Lazily reduces the 3-coloring problem of the given graph into a
+    satisfiability problem in the DIMACS CNF format.
+
+    Parameters:
+        graph: graph whose 3-coloring problem to reduce.
+
+    Returns:
+        An iterator over the lines (each ending with a newline) of the DIMACS
+        CNF representation of
+        `graph3coloring_clauses`\\ ``(``\\ `graph`\\ ``)``, starting with its
+        problem line.
+    """
+    assert is_graph(graph)
+    n_vertices, edges = graph
+    yield 'p cnf ' + str(3 * n_vertices) + ' ' + \
+          str(n_vertices + 3 * len(edges)) + '\n'
+    for clause in graph3coloring_clauses(graph):
+        yield ' '.join(map(str, clause)) + ' 0\n'
+
+def write_graph3coloring_dimacs(graph: Graph, file: TextIO,
+                                buffer_size: int = 65536) -> int:
+    """Writes the reduction of the 3-coloring problem of the given graph into a
+    satisfiability problem to the given file in the DIMACS CNF format, without
+    building it in memory as a whole.
+
+    Parameters:
+        graph: graph whose 3-coloring problem to reduce.
+        file: text file to write to.
+        buffer_size: number of lines to collect before each write.
+
+    Returns:
+        The number of clauses written.
+    """
+    buffer: List[str] = []
+    n_lines = 0
+    for line in graph3coloring_dimacs(graph):
+        buffer.append(line)
+        n_lines += 1
+        if len(buffer) >= buffer_size:
+            file.write(''.join(buffer))
+            buffer.clear()
+    file.write(''.join(buffer))
+    return n_lines - 1
+
 def graph3coloring_to_formula(graph: Graph) -> Formula:
     """Efficiently reduces the 3-coloring problem of the given graph into a
     satisfiability problem.
@@ -72,6 +156,18 @@ def graph3coloring_to_formula(graph: Graph) -> Formula:
     """
     assert is_graph(graph)
     # Optional Task 2.10a
+    # The clauses of graph3coloring_clauses, over the variable names x1, x2,
+    # ..., combined into balanced trees so that the depth stays logarithmic
+    n_vertices, _ = graph
+    if n_vertices == 0:
+        return Formula('T')
+    literals = {}
+    for variable in range(1, 3 * n_vertices + 1):
+        literals[variable] = Formula('x' + str(variable))
+        literals[-variable] = Formula('~', literals[variable])
+    return balanced_formula('&', [balanced_formula('|', [literals[literal]
+                                                         for literal in clause])
+                                  for clause in graph3coloring_clauses(graph)])
 
 def assignment_to_3coloring(graph: Graph, assignment: Model) -> \
         Mapping[int, int]:
@@ -94,6 +190,11 @@ def assignment_to_3coloring(graph: Graph, assignment: Model) -> \
     formula = graph3coloring_to_formula(graph)
     assert evaluate(formula, assignment)
     # Optional Task 2.10b
+    n_vertices, _ = graph
+    return {vertex: next(color for color in (1, 2, 3)
+                         if assignment['x' + str(coloring_variable(vertex,
+                                                                   color))])
+            for vertex in range(1, n_vertices + 1)}
 
 def tricolor_graph(graph: Graph) -> Union[Mapping[int, int], None]:
     """Computes a 3-coloring of the given graph.
@@ -56,6 +56,44 @@ def test_tricolor_graph(debug=False):
                 print("Graph", graph, "can be 3-colored as", coloring)
             assert is_valid_3coloring(graph, coloring)
 
+def test_graph3coloring_dimacs(debug=False):
+    from io import StringIO
+    from random import Random
+    from propositions.sat import solve
+    from propositions.workloads import random_graph
+
+    for (graph, satisfiable) in TEST_GRAPHS:
+        if debug:
+            print("Testing graph3coloring_dimacs on", graph)
+        file = StringIO()
+        n_clauses = write_graph3coloring_dimacs(graph, file, 2)
+        lines = file.getvalue().splitlines()
+        assert lines[0] == 'p cnf ' + str(3 * graph[0]) + ' ' + \
+               str(n_clauses)
+        clauses = [[int(literal) for literal in line.split()[:-1]]
+                   for line in lines[1:]]
+        assert all(line.endswith(' 0') for line in lines[1:])
+        assert clauses == list(graph3coloring_clauses(graph))
+        assert len(clauses) == n_clauses
+        values = solve(clauses, 3 * graph[0])
+        assert (values is not None) == satisfiable
+        if values is not None:
+            coloring = assignment_to_3coloring(
+                graph, {'x' + str(variable): values[variable]
+                        for variable in range(1, 3 * graph[0] + 1)})
+            assert is_valid_3coloring(graph, coloring)
+
+    # A graph with 10^5 edges is streamed without building a formula
+    graph = random_graph(Random(0), 450, 0.99)
+    if debug:
+        print("Testing graph3coloring_dimacs on a graph with", len(graph[1]),
+              "edges")
+    assert len(graph[1]) >= 10 ** 5
+    n_lines = 0
+    for line in graph3coloring_dimacs(graph):
+        n_lines += 1
+    assert n_lines == 1 + graph[0] + 3 * len(graph[1])
+
 def test_ex2_opt(debug=False):
     test_graph3coloring_to_formula(debug)
     test_assignment_to_3coloring(debug)
@@ -63,3 +101,4 @@ def test_ex2_opt(debug=False):
 
 def test_all(debug=False):
     test_ex2_opt(debug)
+    test_graph3coloring_dimacs(debug)
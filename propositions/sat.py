@@ -0,0 +1,452 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/sat.py
+
+"""A conflict-driven clause-learning SAT solver for propositional formulas."""
+
+from heapq import heapify, heappop, heappush
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from propositions.syntax import *
+from propositions.bitparallel import compile_program
+
+#: A clause: a list of nonzero literals, where the literal ``v`` stands for the
+#: variable numbered ``v`` and the literal ``-v`` for its negation.
+Clause = List[int]
+
+def tseitin(formula: Formula) -> \
+        Tuple[List[Clause], Dict[str, int], int, int]:
+    """Encodes the given formula as an equisatisfiable set of clauses, by
+    introducing a fresh variable for each distinct binary subformula.
+
+    Parameters:
+        formula: formula to encode.
+
+    Returns:
+        A quadruplet of the clauses, which hold in a model if and only if every
+        fresh variable equals the subformula that it stands for; the mapping
+        from each variable name of the given formula to its variable number;
+        the literal that stands for the given formula; and the number of
+        variables, which are numbered consecutively from ``1``.
+    """
+    clauses: List[Clause] = []
+    ids: Dict[str, int] = {}
+    literals: List[int] = []
+    n_variables = 0
+    true = 0
+    for root, first, second, _ in compile_program(formula):
+        if first < 0:
+            if root == 'T' or root == 'F':
+                if true == 0:
+                    n_variables += 1
+                    true = n_variables
+                    clauses.append([true])
+                literals.append(true if root == 'T' else -true)
+            else:
+                if root not in ids:
+                    n_variables += 1
+                    ids[root] = n_variables
+                literals.append(ids[root])
+            continue
+        if second < 0:
+            literals.append(-literals[first])
+            continue
+        a, b = literals[first], literals[second]
+        negated = root in ('<->', '-&', '-|')
+        operator = {'<->': '+', '-&': '&', '-|': '|'}.get(root, root)
+        n_variables += 1
+        g = n_variables
+        if operator == '&':
+            clauses.extend(([-g, a], [-g, b], [g, -a, -b]))
+        elif operator == '|':
+            clauses.extend(([g, -a], [g, -b], [-g, a, b]))
+        elif operator == '->':
+            clauses.extend(([g, a], [g, -b], [-g, -a, b]))
+        else:
+            assert operator == '+'
+            clauses.extend(([-g, a, b], [-g, -a, -b], [g, -a, b], [g, a, -b]))
+        literals.append(-g if negated else g)
+    return clauses, ids, literals[-1], n_variables
+
+def luby(i: int) -> int:
+    """Computes an element of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, ... .
+
+    Parameters:
+        i: index of the element, starting from ``1``.
+
+    Returns:
+        The requested element.
+    """
+    size = 1
+    while size < i + 1:
+        size = 2 * size + 1
+    while size > i:
+        size //= 2
+        if size == i:
+            return (size + 1) // 2
+        if size < i:
+            i -= size
+            size = 2 * size + 1
+    return 1
+
+class Solver:
+    """A CDCL SAT solver with two-watched-literal unit propagation, first-UIP
+    clause learning, VSIDS decisions with phase saving, Luby restarts, and
+    periodic deletion of long learned clauses.
+
+    Values and watch lists are indexed directly by literals: a list of length
+    ``2*``\\ `n_variables`\\ ``+1`` maps the literal ``v`` to index ``v`` and
+    the literal ``-v`` to index ``2*``\\ `n_variables`\\ ``+1-v``.
+
+    Attributes:
+        n_variables (`int`): the number of variables.
+        decisions (`int`): the number of decisions made so far.
+        conflicts (`int`): the number of conflicts encountered so far.
+        propagations (`int`): the number of literals assigned so far.
+        restarts (`int`): the number of restarts so far.
+    """
+    #: The number of conflicts between restarts, per unit of the Luby
+    #: sequence.
+    RESTART_UNIT = 100
+
+    #: The activity decay factor of VSIDS.
+    DECAY = 0.95
+
+    def __init__(self, n_variables: int, clauses: Iterable[Clause] = ()):
+        """Initializes a `Solver` over the given number of variables.
+
+        Parameters:
+            n_variables: number of variables, numbered ``1``, ...,
+                `n_variables`.
+            clauses: initial clauses to add.
+        """
+        self.n_variables = n_variables
+        self.decisions = self.conflicts = self.propagations = self.restarts = 0
+        self._values = [0] * (2 * n_variables + 1)
+        self._watches: List[List[Clause]] = \
+            [[] for _ in range(2 * n_variables + 1)]
+        self._level = [0] * (n_variables + 1)
+        self._reason: List[Optional[Clause]] = [None] * (n_variables + 1)
+        self._trail: List[int] = []
+        self._trail_limits: List[int] = []
+        self._head = 0
+        self._activity = [0.0] * (n_variables + 1)
+        self._increment = 1.0
+        self._phase = [False] * (n_variables + 1)
+        self._heap = [(0.0, v) for v in range(1, n_variables + 1)]
+        self._seen = [False] * (n_variables + 1)
+        self._learned: List[Clause] = []
+        self._unsatisfiable = False
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def add_clause(self, clause: Iterable[int]) -> None:
+        """Adds the given clause. Must be called before `solve` or after it
+        returns.
+
+        Parameters:
+            clause: clause to add, over variables numbered ``1``, ...,
+                `n_variables`.
+        """
+        self._backtrack(0)
+        literals: Clause = []
+        for literal in clause:
+            assert 0 < abs(literal) <= self.n_variables
+            if -literal in literals or self._values[literal] == 1:
+                return
+            if literal not in literals and self._values[literal] == 0:
+                literals.append(literal)
+        if len(literals) == 0:
+            self._unsatisfiable = True
+        elif len(literals) == 1:
+            self._assign(literals[0], None)
+            if self._propagate() is not None:
+                self._unsatisfiable = True
+        else:
+            self._watches[literals[0]].append(literals)
+            self._watches[literals[1]].append(literals)
+
+    def _assign(self, literal: int, reason: Optional[Clause]) -> None:
+        """Assigns ``True`` to the given unassigned literal.
+
+        Parameters:
+            literal: literal to assign.
+            reason: clause that implied the literal, as its first literal, or
+                ``None`` for a decision or a unit clause.
+        """
+        values = self._values
+        values[literal] = 1
+        values[-literal] = -1
+        variable = abs(literal)
+        self._level[variable] = len(self._trail_limits)
+        self._reason[variable] = reason
+        self._trail.append(literal)
+
+    def _propagate(self) -> Optional[Clause]:
+        """Assigns all literals implied by unit propagation.
+
+        Returns:
+            A clause all of whose literals are ``False``, or ``None`` if there
+            is no conflict.
+        """
+        values, watches, trail = self._values, self._watches, self._trail
+        while self._head < len(trail):
+            false = -trail[self._head]
+            self._head += 1
+            self.propagations += 1
+            watching = watches[false]
+            i = j = 0
+            n = len(watching)
+            while i < n:
+                clause = watching[i]
+                i += 1
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], false
+                first = clause[0]
+                if values[first] == 1:
+                    watching[j] = clause
+                    j += 1
+                    continue
+                for k in range(2, len(clause)):
+                    literal = clause[k]
+                    if values[literal] != -1:
+                        clause[1], clause[k] = literal, false
+                        watches[literal].append(clause)
+                        break
+                else:
+                    watching[j] = clause
+                    j += 1
+                    if values[first] == -1:
+                        watching[j:] = watching[i:n]
+                        return clause
+                    self._assign(first, clause)
+            del watching[j:]
+        return None
+
+    def _bump(self, variable: int) -> None:
+        """Increases the VSIDS activity of the given variable.
+
+        Parameters:
+            variable: variable to bump.
+        """
+        activity = self._activity
+        activity[variable] += self._increment
+        if activity[variable] > 1e100:
+            for v in range(1, self.n_variables + 1):
+                activity[v] *= 1e-100
+            self._increment *= 1e-100
+            self._heap = [(-activity[v], v)
+                          for v in range(1, self.n_variables + 1)
+                          if self._values[v] == 0]
+            heapify(self._heap)
+
+    def _analyze(self, conflict: Clause) -> Tuple[Clause, int]:
+        """Learns a clause from the given conflict by first-UIP resolution.
+
+        Parameters:
+            conflict: clause all of whose literals are ``False``.
+
+        Returns:
+            A pair of the learned clause, whose first literal is the only one
+            of the current decision level, and the decision level to
+            backtrack to, at which the learned clause is unit.
+        """
+        seen, level, trail = self._seen, self._level, self._trail
+        current = len(self._trail_limits)
+        learned = [0]
+        pending = 0
+        index = len(trail) - 1
+        clause = conflict
+        literal = 0
+        while True:
+            for other in clause:
+                variable = abs(other)
+                if other != literal and not seen[variable] and \
+                   level[variable] > 0:
+                    seen[variable] = True
+                    self._bump(variable)
+                    if level[variable] == current:
+                        pending += 1
+                    else:
+                        learned.append(other)
+            while not seen[abs(trail[index])]:
+                index -= 1
+            literal = trail[index]
+            index -= 1
+            clause = self._reason[abs(literal)]
+            seen[abs(literal)] = False
+            pending -= 1
+            if pending == 0:
+                break
+        learned[0] = -literal
+        for other in learned[1:]:
+            seen[abs(other)] = False
+        backtrack_level = 0
+        if len(learned) > 1:
+            highest = max(range(1, len(learned)),
+                          key=lambda k: level[abs(learned[k])])
+            learned[1], learned[highest] = learned[highest], learned[1]
+            backtrack_level = level[abs(learned[1])]
+        return learned, backtrack_level
+
+    def _backtrack(self, level: int) -> None:
+        """Unassigns all literals of decision levels greater than the given
+        one.
+
+        Parameters:
+            level: decision level to backtrack to.
+        """
+        if len(self._trail_limits) <= level:
+            return
+        values, trail, activity = self._values, self._trail, self._activity
+        start = self._trail_limits[level]
+        for literal in trail[start:]:
+            variable = abs(literal)
+            values[literal] = values[-literal] = 0
+            self._phase[variable] = literal > 0
+            heappush(self._heap, (-activity[variable], variable))
+        del trail[start:]
+        del self._trail_limits[level:]
+        self._head = len(trail)
+        if len(self._heap) > 4 * self.n_variables + 64:
+            self._heap = [(-activity[v], v)
+                          for v in range(1, self.n_variables + 1)
+                          if values[v] == 0]
+            heapify(self._heap)
+
+    def _decide(self) -> bool:
+        """Assigns the saved phase to an unassigned variable of maximal
+        activity, at a new decision level.
+
+        Returns:
+            ``True`` if a variable was assigned, ``False`` if all variables are
+            already assigned.
+        """
+        heap, values = self._heap, self._values
+        while len(heap) > 0:
+            _, variable = heappop(heap)
+            if values[variable] == 0:
+                self.decisions += 1
+                self._trail_limits.append(len(self._trail))
+                self._assign(variable if self._phase[variable] else -variable,
+                             None)
+                return True
+        return False
+
+    def _reduce(self) -> None:
+        """Deletes the longer half of the learned clauses of more than two
+        literals. Must be called at decision level ``0``.
+        """
+        long = [clause for clause in self._learned if len(clause) > 2]
+        if len(long) < 2:
+            return
+        long.sort(key=len)
+        deleted = {id(clause) for clause in long[len(long) // 2:]}
+        self._learned = [clause for clause in self._learned
+                         if id(clause) not in deleted]
+        for watching in self._watches:
+            watching[:] = [clause for clause in watching
+                           if id(clause) not in deleted]
+
+    def solve(self, assumptions: Sequence[int] = ()) -> Optional[List[bool]]:
+        """Searches for a satisfying assignment of the clauses added so far.
+
+        Parameters:
+            assumptions: literals that are to be ``True``, without being added
+                as clauses.
+
+        Returns:
+            A list whose ``v``\\ th element is the value of variable ``v`` (and
+            whose zeroth element is unused) in a satisfying assignment that
+            satisfies the given assumptions, or ``None`` if there is none.
+        """
+        if self._unsatisfiable:
+            return None
+        self._backtrack(0)
+        if self._propagate() is not None:
+            self._unsatisfiable = True
+            return None
+        conflicts_until_restart = luby(self.restarts + 1) * self.RESTART_UNIT
+        max_learned = max(1000, self.n_variables)
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if len(self._trail_limits) <= len(assumptions):
+                    if len(self._trail_limits) == 0:
+                        self._unsatisfiable = True
+                    self._backtrack(0)
+                    return None
+                learned, level = self._analyze(conflict)
+                self._backtrack(max(level, 0))
+                if len(learned) == 1:
+                    self._backtrack(0)
+                    self._assign(learned[0], None)
+                else:
+                    self._watches[learned[0]].append(learned)
+                    self._watches[learned[1]].append(learned)
+                    self._learned.append(learned)
+                    self._assign(learned[0], learned)
+                self._increment /= self.DECAY
+                conflicts_until_restart -= 1
+                continue
+            if conflicts_until_restart <= 0:
+                self.restarts += 1
+                conflicts_until_restart = \
+                    luby(self.restarts + 1) * self.RESTART_UNIT
+                self._backtrack(0)
+                if len(self._learned) > max_learned:
+                    self._reduce()
+                    max_learned += max_learned // 10
+                continue
+            level = len(self._trail_limits)
+            if level < len(assumptions):
+                literal = assumptions[level]
+                if self._values[literal] == -1:
+                    self._backtrack(0)
+                    return None
+                self._trail_limits.append(len(self._trail))
+                if self._values[literal] == 0:
+                    self._assign(literal, None)
+                continue
+            if not self._decide():
+                values = self._values
+                model = [False] + [values[v] == 1
+                                   for v in range(1, self.n_variables + 1)]
+                self._backtrack(0)
+                return model
+
+def solve(clauses: Iterable[Clause], n_variables: int) -> \
+        Optional[List[bool]]:
+    """Searches for a satisfying assignment of the given clauses.
+
+    Parameters:
+        clauses: clauses over variables numbered ``1``, ..., `n_variables`.
+        n_variables: number of variables.
+
+    Returns:
+        A list whose ``v``\\ th element is the value of variable ``v`` (and
+        whose zeroth element is unused) in a satisfying assignment, or ``None``
+        if there is none.
+    """
+    return Solver(n_variables, clauses).solve()
+
+def satisfying_model(formula: Formula) -> Optional[Mapping[str, bool]]:
+    """Searches for a model in which the given formula holds, via its
+    `tseitin` encoding.
+
+    Parameters:
+        formula: formula to satisfy.
+
+    Returns:
+        A model over the variable names of the given formula in which it
+        holds, or ``None`` if it is not satisfiable.
+    """
+    clauses, ids, root, n_variables = tseitin(formula)
+    clauses.append([root])
+    assignment = solve(clauses, n_variables)
+    if assignment is None:
+        return None
+    return {variable: assignment[ids[variable]] for variable in ids}
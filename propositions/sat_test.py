@@ -0,0 +1,144 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/sat_test.py
+
+"""Tests for the propositions.sat module."""
+
+from itertools import product
+from random import Random
+
+from propositions.sat import *
+from propositions.compact import CompactFormula
+from propositions.semantics import *
+from propositions.workloads import random_cnf, random_formula
+
+def _brute_force(clauses, n_variables):
+    for values in product([False, True], repeat=n_variables):
+        if all(any(values[abs(literal) - 1] == (literal > 0)
+                   for literal in clause) for clause in clauses):
+            return True
+    return False
+
+def test_luby(debug=False):
+    if debug:
+        print('Testing the Luby sequence')
+    assert [luby(i) for i in range(1, 16)] == \
+           [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+def test_tseitin(debug=False):
+    for infix in ['p', '~p', 'T', '~F', '(p&~p)', '(p->(q|~r))',
+                  '((p&q)->(~q|T))']:
+        if debug:
+            print('Testing Tseitin encoding of', infix)
+        formula = Formula.parse(infix)
+        clauses, ids, root, n_variables = tseitin(formula)
+        assert set(ids) == formula.variables()
+        compact = CompactFormula.from_formula(formula)
+        for model in all_models(sorted(ids)):
+            assumptions = [ids[variable] if model[variable] else
+                           -ids[variable] for variable in ids]
+            solver = Solver(n_variables, clauses)
+            assert (solver.solve(assumptions + [root]) is not None) == \
+                   compact.evaluate(model)
+
+def test_solver(debug=False):
+    rng = Random(0)
+    for _ in range(300):
+        n_variables = rng.randint(1, 10)
+        clauses = [[rng.choice((-1, 1)) * rng.randint(1, n_variables)
+                    for _ in range(rng.randint(1, 3))]
+                   for _ in range(rng.randint(1, 5 * n_variables))]
+        if debug:
+            print('Testing solver on', clauses)
+        solver = Solver(n_variables, clauses)
+        assignment = solver.solve()
+        assert (assignment is not None) == _brute_force(clauses, n_variables)
+        if assignment is not None:
+            for clause in clauses:
+                assert any(assignment[abs(literal)] == (literal > 0)
+                           for literal in clause)
+    solver = Solver(3, [[1, 2], [-1, 3]])
+    assert solver.solve([-3, -2]) is None
+    assert solver.solve([-3])[2]
+    solver.add_clause([-2])
+    assert solver.solve() == [False, True, False, True]
+    assert Solver(1, [[1], [-1]]).solve() is None
+
+def test_satisfying_model(debug=False):
+    rng = Random(1)
+    for _ in range(300):
+        formula = random_formula(rng, 5, 5, constant_probability=0.05)
+        if debug:
+            print('Testing satisfying model of', formula)
+        model = satisfying_model(formula)
+        if model is None:
+            assert not is_satisfiable(formula)
+        else:
+            assert set(model) == formula.variables()
+            assert CompactFormula.from_formula(formula).evaluate(model)
+
+def test_backends(debug=False):
+    previous = set_backend('sat')
+    try:
+        rng = Random(2)
+        for n_variables in (5, 10, 60):
+            formula = random_cnf(rng, n_variables, 3 * n_variables)
+            if debug:
+                print('Testing backends on a 3-CNF formula over', n_variables,
+                      'variables')
+            results = []
+            for backend in BACKENDS:
+                set_backend(backend)
+                if n_variables > 20 and \
+                        backend in ('truth_table', 'gray_code', 'parallel'):
+                    continue
+                model = satisfying_model(formula)
+                results.append((is_satisfiable(formula),
+                                is_contradiction(formula),
+                                is_tautology(formula), model is not None))
+                if model is not None:
+                    assert evaluate(formula, model)
+            assert len(set(results)) == 1
+        set_backend('sat')
+        rule = InferenceRule([Formula.parse('(p->q)'), Formula.parse('(q->r)')],
+                             Formula.parse('(p->r)'))
+        assert is_sound_inference(rule)
+        assert not is_sound_inference(InferenceRule(rule.assumptions,
+                                                    Formula.parse('(r->p)')))
+    finally:
+        set_backend(previous)
+
+def test_inference_counterexample(debug=False):
+    previous = set_backend('auto')
+    try:
+        # A chain of implications over 40 variable names, whose conclusion
+        # only fails when all of the variable names are true
+        names = [Formula('x' + str(i)) for i in range(1, 41)]
+        assumptions = [Formula('->', names[i], names[i + 1])
+                       for i in range(len(names) - 1)]
+        for conclusion, sound in [(Formula('->', names[0], names[-1]), True),
+                                  (Formula('~', names[-1]), False)]:
+            rule = InferenceRule(assumptions + [names[0]], conclusion)
+            if debug:
+                print('Testing counterexample to a rule over 40 variable names'
+                      ' with conclusion', conclusion)
+            model = inference_counterexample(rule)
+            if sound:
+                assert model is None
+                assert is_sound_inference(rule)
+            else:
+                assert model == {str(name): True for name in names}
+                assert not evaluate_inference(rule, model)
+                assert not is_sound_inference(rule)
+    finally:
+        set_backend(previous)
+
+def test_all(debug=False):
+    test_luby(debug)
+    test_tseitin(debug)
+    test_solver(debug)
+    test_satisfying_model(debug)
+    test_backends(debug)
+    test_inference_counterexample(debug)
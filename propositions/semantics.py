@@ -6,15 +6,145 @@
 
 """Semantic analysis of propositional-logic constructs."""
 
-from typing import AbstractSet, Iterable, Iterator, Mapping, Sequence, Tuple
+import sys
+from itertools import product
+from typing import AbstractSet, Iterable, Iterator, List, Mapping, Optional, \
+                   Sequence, Tuple
+
+from logic_utils import Immutable
 
 from propositions.syntax import *
 from propositions.proofs import *
+from propositions.bitparallel import evaluate_model, evaluate_models, \
+                                     is_constant_function, truth_table_chunks
+from propositions.graycode import gray_code_truth_table, gray_code_values
+from propositions.sat import satisfying_model as sat_satisfying_model
+from propositions.counting import count_models as exact_count_models
+from propositions.truth_table_writer import write_truth_table
+from propositions.minimize import minimal_cover
+from propositions.truthtable import TruthTable, truth_table
+from propositions.parallel import find_model
 
 #: A model for propositional-logic formulas, a mapping from variable names to
 #: truth values.
 Model = Mapping[str, bool]
 
+#: The decision procedures that may back `is_tautology`, `is_contradiction`,
+#: `is_satisfiable`, `satisfying_model`, `count_models`,
+#: `inference_counterexample`, and `is_sound_inference`, and (over
+#: `all_models`) `truth_values` and `print_truth_table`: ``'truth_table'`` for
+#: bit-parallel evaluation over all models, ``'gray_code'`` for incremental
+#: evaluation over all models in Gray-code order, ``'sat'`` for the CDCL solver
+#: of `propositions.sat` (and the exact model counter of
+#: `propositions.counting`) in the semantic checks only, ``'parallel'`` for the
+#: sharded multi-process search of `propositions.parallel` in the semantic
+#: checks other than `count_models` and for ``'truth_table'`` otherwise, or
+#: ``'auto'`` for ``'truth_table'`` over at most `AUTO_SAT_VARIABLES` variable
+#: names and ``'sat'`` otherwise.
+BACKENDS = ('auto', 'truth_table', 'gray_code', 'sat', 'parallel')
+
+#: The number of variable names above which the ``'auto'`` backend uses the
+#: SAT solver.
+AUTO_SAT_VARIABLES = 16
+
+_backend = 'auto'
+
+def set_backend(backend: str) -> str:
+    """Sets the decision procedure of the semantic checks of this module.
+
+    Parameters:
+        backend: backend out of `BACKENDS` to use from now on.
+
+    Returns:
+        The backend that was used until now.
+    """
+    global _backend
+    assert backend in BACKENDS
+    previous = _backend
+    _backend = backend
+    return previous
+
+def _uses_sat(formula: Formula) -> bool:
+    """Checks if the semantic checks of the given formula are to use the SAT
+    solver.
+
+    Parameters:
+        formula: formula to check.
+
+    Returns:
+        ``True`` if the current backend is ``'sat'``, or if it is ``'auto'`` and
+        the given formula has more than `AUTO_SAT_VARIABLES` variable names;
+        ``False`` otherwise.
+    """
+    return _backend == 'sat' or \
+           (_backend == 'auto' and
+            len(formula.variables()) > AUTO_SAT_VARIABLES)
+
+def _gray_code_any(formula: Formula, value: bool) -> bool:
+    """Checks if the given formula has the given truth value in some model
+    over its variable names, via `~propositions.graycode.gray_code_values`.
+
+    Parameters:
+        formula: formula to check.
+        value: truth value to check for.
+
+    Returns:
+        ``True`` if the given formula evaluates to the given truth value in
+        some model, ``False`` otherwise.
+    """
+    return any(current == value for _, current in
+               gray_code_values(formula, sorted(formula.variables())))
+
+def _model_at(variables: Sequence[str], index: int) -> Model:
+    """Computes a model by its index in the order of `all_models`.
+
+    Parameters:
+        variables: variable names of the model.
+        index: index of the model in the order returned by
+            `all_models`\\ ``(``\\ `variables`\\ ``)``.
+
+    Returns:
+        The model at the given index.
+    """
+    return {variable: index >> (len(variables) - 1 - i) & 1 == 1
+            for i, variable in enumerate(variables)}
+
+class AllModels(Immutable):
+    """An immutable iterable over all models over a sequence of variable
+    names, in the order documented in `all_models`, which lets `truth_values`
+    evaluate formulas over all of these models at once.
+
+    Attributes:
+        variables (`~typing.Tuple`\\[`str`, ...]): the variable names of the
+            models.
+    """
+    variables: Tuple[str, ...]
+
+    def __init__(self, variables: Sequence[str]):
+        """Initializes an `AllModels` iterable from its variable names.
+
+        Parameters:
+            variables: the variable names of the models.
+        """
+        self.variables = tuple(variables)
+
+    def __iter__(self) -> Iterator[Model]:
+        """Lazily computes the models.
+
+        Returns:
+            An iterator over the models.
+        """
+        for values in product((False, True), repeat=len(self.variables)):
+            yield dict(zip(self.variables, values))
+
+    def __len__(self) -> int:
+        """Computes the number of models.
+
+        Returns:
+            ``2``\\ ``**``\\ ``len(``\\ `variables`\\ ``)``.
+        """
+        return 1 << len(self.variables)
+
 def is_model(model: Model) -> bool:
     """Checks if the given dictionary is a model over some set of variable
     names.
@@ -64,6 +194,7 @@ def evaluate(formula: Formula, model: Model) -> bool:
     assert is_model(model)
     assert formula.variables().issubset(variables(model))
     # Task 2.1
+    return evaluate_model(formula, model)
 
 def all_models(variables: Sequence[str]) -> Iterable[Model]:
     """Calculates all possible models over the given variable names.
@@ -86,6 +217,7 @@ def all_models(variables: Sequence[str]) -> Iterable[Model]:
     for v in variables:
         assert is_variable(v)
     # Task 2.2
+    return AllModels(variables)
 
 def truth_values(formula: Formula, models: Iterable[Model]) -> Iterable[bool]:
     """Calculates the truth value of the given formula in each of the given
@@ -104,6 +236,53 @@ def truth_values(formula: Formula, models: Iterable[Model]) -> Iterable[bool]:
         [True, True, True, False]
     """
     # Task 2.3
+    if isinstance(models, AllModels) and \
+       formula.variables().issubset(models.variables):
+        return _all_truth_values(formula, models.variables)
+    return evaluate_models(formula, models)
+
+def _all_truth_values(formula: Formula, variables: Sequence[str]) -> \
+        Iterator[bool]:
+    """Lazily evaluates the given formula in all models over the given variable
+    names, bit-parallel or (with the ``'gray_code'`` backend) in Gray-code
+    order.
+
+    Parameters:
+        formula: formula to evaluate.
+        variables: variable names, a superset of those of the given formula.
+
+    Returns:
+        An iterator over the truth values of the given formula in all models
+        over the given variable names, in the order returned by
+        `all_models`\\ ``(``\\ `variables`\\ ``)``.
+    """
+    for width, bits in _all_truth_value_chunks(formula, variables):
+        for digit in reversed(format(bits, '0' + str(width) + 'b')):
+            yield digit == '1'
+
+def _all_truth_value_chunks(formula: Formula, variables: Sequence[str]) -> \
+        Iterator[Tuple[int, int]]:
+    """Lazily evaluates the given formula in all models over the given variable
+    names, in chunks of models, bit-parallel or (with the ``'gray_code'``
+    backend) in Gray-code order.
+
+    Parameters:
+        formula: formula to evaluate.
+        variables: variable names, a superset of those of the given formula.
+
+    Returns:
+        An iterator over pairs of a number of consecutive models and the bits
+        of the truth values of the given formula in them, as in
+        `~propositions.bitparallel.truth_table_chunks`.
+    """
+    if _backend == 'gray_code':
+        table = gray_code_truth_table(formula, variables)
+        yield len(table), int(table.translate(_DIGITS)[::-1], 2)
+        return
+    yield from truth_table_chunks(formula, variables)
+
+#: Translation of the truth values of `gray_code_truth_table` to binary digits.
+_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
 
 def print_truth_table(formula: Formula) -> None:
     """Prints the truth table of the given formula, with variable-name columns
@@ -122,6 +301,9 @@ def print_truth_table(formula: Formula) -> None:
         | T | T   | F        |
     """
     # Task 2.4
+    variables = sorted(formula.variables())
+    write_truth_table(formula, sys.stdout, variables=variables,
+                      chunks=_all_truth_value_chunks(formula, variables))
 
 def is_tautology(formula: Formula) -> bool:
     """Checks if the given formula is a tautology.
@@ -133,6 +315,13 @@ def is_tautology(formula: Formula) -> bool:
         ``True`` if the given formula is a tautology, ``False`` otherwise.
     """
     # Task 2.5a
+    if _uses_sat(formula):
+        return sat_satisfying_model(Formula('~', formula)) is None
+    if _backend == 'gray_code':
+        return not _gray_code_any(formula, False)
+    if _backend == 'parallel':
+        return find_model(formula, False) is None
+    return is_constant_function(formula, True)
 
 def is_contradiction(formula: Formula) -> bool:
     """Checks if the given formula is a contradiction.
@@ -144,6 +333,13 @@ def is_contradiction(formula: Formula) -> bool:
         ``True`` if the given formula is a contradiction, ``False`` otherwise.
     """
     # Task 2.5b
+    if _uses_sat(formula):
+        return sat_satisfying_model(formula) is None
+    if _backend == 'gray_code':
+        return not _gray_code_any(formula, True)
+    if _backend == 'parallel':
+        return find_model(formula, True) is None
+    return is_constant_function(formula, False)
 
 def is_satisfiable(formula: Formula) -> bool:
     """Checks if the given formula is satisfiable.
@@ -155,6 +351,73 @@ def is_satisfiable(formula: Formula) -> bool:
         ``True`` if the given formula is satisfiable, ``False`` otherwise.
     """
     # Task 2.5c
+    if _uses_sat(formula):
+        return sat_satisfying_model(formula) is not None
+    if _backend == 'gray_code':
+        return _gray_code_any(formula, True)
+    if _backend == 'parallel':
+        return find_model(formula, True) is not None
+    return not is_constant_function(formula, False)
+
+def satisfying_model(formula: Formula) -> Optional[Model]:
+    """Finds a model in which the given formula holds.
+
+    Parameters:
+        formula: formula to satisfy.
+
+    Returns:
+        A model over the variable names of the given formula in which it holds,
+        or ``None`` if the given formula is not satisfiable.
+    """
+    if _uses_sat(formula):
+        return sat_satisfying_model(formula)
+    if _backend == 'parallel':
+        return find_model(formula, True)
+    variables = sorted(formula.variables())
+    if _backend == 'gray_code':
+        for index, value in gray_code_values(formula, variables):
+            if value:
+                return _model_at(variables, index)
+        return None
+    offset = 0
+    for width, bits in truth_table_chunks(formula, variables):
+        if bits != 0:
+            return _model_at(variables,
+                             offset + (bits & -bits).bit_length() - 1)
+        offset += width
+    return None
+
+def count_models(formula: Formula) -> int:
+    """Counts the models in which the given formula holds.
+
+    Parameters:
+        formula: formula to count the models of.
+
+    Returns:
+        The number of models over the variable names of the given formula in
+        which it holds.
+    """
+    if _uses_sat(formula):
+        return exact_count_models(formula)
+    variables = sorted(formula.variables())
+    if _backend == 'gray_code':
+        return sum(value for _, value in gray_code_values(formula, variables))
+    return sum(bin(bits).count('1')
+               for _, bits in truth_table_chunks(formula, variables))
+
+def _literal(variable: str, value: bool) -> Formula:
+    """Synthesizes the literal of the given variable name that holds exactly
+    when it has the given truth value.
+
+    Parameters:
+        variable: variable name of the literal.
+        value: truth value in which the literal is to hold.
+
+    Returns:
+        The given variable name as a formula if the given value is ``True``,
+        or its negation otherwise.
+    """
+    return Formula(variable) if value else Formula('~', Formula(variable))
 
 def _synthesize_for_model(model: Model) -> Formula:
     """Synthesizes a propositional formula in the form of a single conjunctive
@@ -171,8 +434,84 @@ def _synthesize_for_model(model: Model) -> Formula:
     assert is_model(model)
     assert len(model.keys()) > 0
     # Task 2.6
+    return balanced_formula('&', [_literal(variable, model[variable])
+                                  for variable in model])
 
-def synthesize(variables: Sequence[str], values: Iterable[bool]) -> Formula:
+#: The translation of bytes ``0`` and ``1`` to the binary digits ``'0'`` and
+#: ``'1'``.
+_BINARY_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+
+def _values_bits(variables: Sequence[str], values: Iterable[bool]) -> int:
+    """Packs the given truth table into a bitvector.
+
+    Parameters:
+        variables: nonempty set of variable names of the truth table.
+        values: iterable over truth values in every possible model over the
+            given variable names, in the order returned by
+            `all_models`\\ ``(``\\ `~_values_bits.variables`\\ ``)``, or
+            a `~propositions.truthtable.TruthTable` over these variable names
+            in any order.
+
+    Returns:
+        The bitvector whose ``m``\\ th bit is set if and only if the ``m``\\ th
+        given truth value is ``True``.
+    """
+    if isinstance(values, TruthTable):
+        return values.reorder(variables).bits
+    flags = bytes(map(bool, values))
+    assert len(flags) == 1 << len(variables)
+    return int(flags.translate(_BINARY_DIGITS)[::-1], 2)
+
+def _synthesize_clauses(variables: Sequence[str], bits: int, minimize: bool,
+                        clause_counts: Optional[List[int]], cnf: bool) -> \
+        Formula:
+    """Synthesizes a propositional formula in DNF, or in CNF, over the given
+    variable names, with a clause for each of a set of cubes that cover the
+    given models.
+
+    Parameters:
+        variables: nonempty set of variable names for the synthesized formula.
+        bits: bitvector of the models to cover, in which the synthesized
+            formula is to hold if it is to be in DNF, or to not hold if it is
+            to be in CNF.
+        minimize: whether to cover the given models via
+            `~propositions.minimize.minimal_cover`, rather than with a cube for
+            each of them.
+        clause_counts: list to which to append the number of given models and
+            then the number of clauses of the synthesized formula, or ``None``.
+        cnf: whether to synthesize a formula in CNF rather than in DNF.
+
+    Returns:
+        The synthesized formula, a `balanced_formula` of balanced clauses.
+    """
+    n_variables = len(variables)
+    if minimize:
+        cubes = minimal_cover(n_variables, bits)
+    else:
+        full = (1 << n_variables) - 1
+        cubes = [(full, m) for m in range(1 << n_variables) if bits >> m & 1]
+    if clause_counts is not None:
+        clause_counts.append(bin(bits).count('1'))
+        clause_counts.append(max(len(cubes), 1))
+    if len(cubes) == 0 or cubes[0][0] == 0:
+        # No models (a contradiction in DNF, a tautology in CNF), or all of them
+        p = Formula(variables[0])
+        return Formula('|' if (len(cubes) == 0) == cnf else '&', p,
+                       Formula('~', p))
+    clauses = []
+    for mask, value in cubes:
+        literals = []
+        for i, variable in enumerate(variables):
+            k = n_variables - 1 - i
+            if mask >> k & 1:
+                literals.append(_literal(variable,
+                                         (value >> k & 1 == 1) != cnf))
+        clauses.append(balanced_formula('|' if cnf else '&', literals))
+    return balanced_formula('&' if cnf else '|', clauses)
+
+def synthesize(variables: Sequence[str], values: Iterable[bool],
+               minimize: bool = False,
+               clause_counts: Optional[List[int]] = None) -> Formula:
     """Synthesizes a propositional formula in DNF over the given variable names,
     that has the specified truth table.
 
@@ -180,7 +519,15 @@ def synthesize(variables: Sequence[str], values: Iterable[bool]) -> Formula:
         variables: nonempty set of variable names for the synthesized formula.
         values: iterable over truth values for the synthesized formula in every
             possible model over the given variable names, in the order returned
-            by `all_models`\\ ``(``\\ `~synthesize.variables`\\ ``)``.
+            by `all_models`\\ ``(``\\ `~synthesize.variables`\\ ``)``, or
+            a `~propositions.truthtable.TruthTable` over these variable names
+            in any order.
+        minimize: whether to synthesize a small DNF via
+            `~propositions.minimize.minimal_cover`, rather than the DNF with a
+            clause for every model in which the formula is to hold.
+        clause_counts: list to which to append the number of clauses of the
+            DNF with a clause for every such model and then that of the
+            synthesized DNF, or ``None``.
 
     Returns:
         The synthesized formula.
@@ -196,6 +543,8 @@ def synthesize(variables: Sequence[str], values: Iterable[bool]) -> Formula:
     """
     assert len(variables) > 0
     # Task 2.7
+    return _synthesize_clauses(variables, _values_bits(variables, values),
+                               minimize, clause_counts, False)
 
 def _synthesize_for_all_except_model(model: Model) -> Formula:
     """Synthesizes a propositional formula in the form of a single disjunctive
@@ -212,8 +561,12 @@ def _synthesize_for_all_except_model(model: Model) -> Formula:
     assert is_model(model)
     assert len(model.keys()) > 0
     # Optional Task 2.8
+    return balanced_formula('|', [_literal(variable, not model[variable])
+                                  for variable in model])
 
-def synthesize_cnf(variables: Sequence[str], values: Iterable[bool]) -> Formula:
+def synthesize_cnf(variables: Sequence[str], values: Iterable[bool],
+                   minimize: bool = False,
+                   clause_counts: Optional[List[int]] = None) -> Formula:
     """Synthesizes a propositional formula in CNF over the given variable names,
     that has the specified truth table.
 
@@ -221,7 +574,15 @@ def synthesize_cnf(variables: Sequence[str], values: Iterable[bool]) -> Formula:
         variables: nonempty set of variable names for the synthesized formula.
         values: iterable over truth values for the synthesized formula in every
             possible model over the given variable names, in the order returned
-            by `all_models`\\ ``(``\\ `~synthesize.variables`\\ ``)``.
+            by `all_models`\\ ``(``\\ `~synthesize.variables`\\ ``)``, or
+            a `~propositions.truthtable.TruthTable` over these variable names
+            in any order.
+        minimize: whether to synthesize a small CNF via
+            `~propositions.minimize.minimal_cover`, rather than the CNF with a
+            clause for every model in which the formula is not to hold.
+        clause_counts: list to which to append the number of clauses of the
+            CNF with a clause for every such model and then that of the
+            synthesized CNF, or ``None``.
 
     Returns:
         The synthesized formula.
@@ -237,6 +598,11 @@ def synthesize_cnf(variables: Sequence[str], values: Iterable[bool]) -> Formula:
     """
     assert len(variables) > 0
     # Optional Task 2.9
+    n_models = 1 << len(variables)
+    return _synthesize_clauses(variables,
+                               ((1 << n_models) - 1) ^
+                               _values_bits(variables, values),
+                               minimize, clause_counts, True)
 
 def evaluate_inference(rule: InferenceRule, model: Model) -> bool:
     """Checks if the given inference rule holds in the given model.
@@ -260,6 +626,37 @@ def evaluate_inference(rule: InferenceRule, model: Model) -> bool:
     """
     assert is_model(model)
     # Task 4.2
+    return not all(evaluate(assumption, model)
+                   for assumption in rule.assumptions) or \
+           evaluate(rule.conclusion, model)
+
+def inference_counterexample(rule: InferenceRule) -> Optional[Model]:
+    """Searches for a model in which the given inference rule does not hold,
+    via `satisfying_model` of the conjunction of its assumptions and the
+    negation of its conclusion, so that the ``'sat'`` backend (and the
+    ``'auto'`` backend over many variable names) decides it by a single query
+    to the SAT solver, without enumerating models.
+
+    Parameters:
+        rule: inference rule to search a counterexample to.
+
+    Returns:
+        A model over the variable names of the given inference rule in which
+        all of its assumptions hold but its conclusion does not, or ``None``
+        if the given inference rule is sound.
+
+    Examples:
+        >>> inference_counterexample(InferenceRule([Formula('p')],
+        ...                                        Formula('q')))
+        {'p': True, 'q': False}
+
+        >>> inference_counterexample(InferenceRule([Formula('p')],
+        ...                                        Formula('p')))
+    """
+    formula = Formula('~', rule.conclusion)
+    for assumption in reversed(rule.assumptions):
+        formula = Formula('&', assumption, formula)
+    return satisfying_model(formula)
 
 def is_sound_inference(rule: InferenceRule) -> bool:
     """Checks if the given inference rule is sound, i.e., whether its
@@ -272,3 +669,4 @@ def is_sound_inference(rule: InferenceRule) -> bool:
         ``True`` if the given inference rule is sound, ``False`` otherwise.
     """
     # Task 4.3
+    return inference_counterexample(rule) is None
@@ -49,3 +49,14 @@ def nonsound_rule_of_nonsound_proof(proof: Proof, model: Model) -> \
     assert proof.is_valid()
     assert not evaluate_inference(proof.statement, model)
     # Task 4.10
+    # Variable names of the lines that the model lacks get fixed truth values
+    model = dict(model)
+    for line in proof.lines:
+        for variable in line.formula.variables():
+            model.setdefault(variable, False)
+    # The first line that does not hold is justified by a non-sound rule
+    for line in proof.lines:
+        if not evaluate(line.formula, model):
+            counterexample = inference_counterexample(line.rule)
+            assert counterexample is not None
+            return line.rule, counterexample
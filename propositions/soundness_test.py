@@ -82,6 +82,22 @@ def test_nonsound_rule_of_nonsound_proof(debug=False):
     assert rule in proof.rules
     assert not evaluate_inference(rule, model)
 
+    # Test with proof whose lines have variables that the model does not have
+    R1 = InferenceRule([Formula.parse('p')], Formula.parse('(q|p)'))
+    R2 = InferenceRule([Formula.parse('(q|p)')], Formula.parse('~p'))
+    proof = Proof(InferenceRule([Formula.parse('x')], Formula.parse('~x')),
+                  {R1, R2},
+                  [Proof.Line(Formula.parse('x')),
+                   Proof.Line(Formula.parse('(y|x)'), R1, [0]),
+                   Proof.Line(Formula.parse('~x'), R2, [1])])
+    if debug:
+        print('\nTesting nonsound_rule_of_nonsound_proof on the following '
+              'deductive proof:\n' + str(proof))
+    rule, model = nonsound_rule_of_nonsound_proof(proof, frozendict(
+        {'x': True}))
+    assert rule == R2
+    assert not evaluate_inference(rule, model)
+
     # Test with proof with two rules with large numbers of variables: one of
     # them sound, one not
     R1 = InferenceRule(
@@ -7,13 +7,66 @@
 """Syntactic handling of propositional formulas."""
 
 from __future__ import annotations
-from functools import lru_cache
-from typing import Mapping, Optional, Set, Tuple, Union
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
+from typing import FrozenSet, Iterable, Iterator, List, Mapping, Optional, \
+                   Sequence, TextIO, Tuple, Union
+from weakref import WeakValueDictionary
 
-from logic_utils import frozen, memoized_parameterless_method
+from logic_utils import Immutable, SymbolTable, \
+                        memoized_parameterless_method, \
+                        memoized_parameterless_set_method
+
+
+def _classify(string: str) -> Optional[str]:
+    """Computes the kind of the given string in propositional logic.
+
+    Parameters:
+        string: string to classify.
+
+    Returns:
+        ``'variable'``, ``'constant'``, ``'unary'``, or ``'binary'`` if the
+        given string is a variable res, a constant, a unary operator, or a
+        binary operator, respectively; ``None`` otherwise.
+    """
+    if string[0] >= 'p' and string[0] <= 'z' and \
+        (len(string) == 1 or string[1:].isdecimal()):
+        return 'variable'
+    if string == 'T' or string == 'F':
+        return 'constant'
+    if string == '~':
+        return 'unary'
+    if string == '&' or string == '|' or string == '->':
+        return 'binary'
+    # For Chapter 3:
+    # if string in {'&', '|',  '->', '+', '<->', '-&', '-|'}:
+    #     return 'binary'
+    return None
+
+
+#: The symbol table of propositional logic, in which the kind of each variable
+#: res, constant, and operator is computed once.
+SYMBOLS = SymbolTable(_classify)
+
+_symbol_kinds = SYMBOLS.kinds
+
+
+def symbol_kind(string: str) -> Optional[str]:
+    """Finds the kind of the given string in propositional logic.
+
+    Parameters:
+        string: string to check.
+
+    Returns:
+        ``'variable'``, ``'constant'``, ``'unary'``, or ``'binary'`` if the
+        given string is a variable res, a constant, a unary operator, or a
+        binary operator, respectively; ``None`` otherwise.
+    """
+    return _symbol_kinds.get(string) or SYMBOLS.kind(string)
 
 
-@lru_cache(maxsize=100)  # Cache the return value of is_variable
 def is_variable(string: str) -> bool:
     """Checks if the given string is a variable res.
 
@@ -23,11 +76,9 @@ def is_variable(string: str) -> bool:
     Returns:
         ``True`` if the given string is a variable res, ``False`` otherwise.
     """
-    return string[0] >= 'p' and string[0] <= 'z' and \
-        (len(string) == 1 or string[1:].isdecimal())
+    return (_symbol_kinds.get(string) or SYMBOLS.kind(string)) == 'variable'
 
 
-@lru_cache(maxsize=100)  # Cache the return value of is_constant
 def is_constant(string: str) -> bool:
     """Checks if the given string is a constant.
 
@@ -37,10 +88,9 @@ def is_constant(string: str) -> bool:
     Returns:
         ``True`` if the given string is a constant, ``False`` otherwise.
     """
-    return string == 'T' or string == 'F'
+    return (_symbol_kinds.get(string) or SYMBOLS.kind(string)) == 'constant'
 
 
-@lru_cache(maxsize=100)  # Cache the return value of is_unary
 def is_unary(string: str) -> bool:
     """Checks if the given string is a unary operator.
 
@@ -50,10 +100,9 @@ def is_unary(string: str) -> bool:
     Returns:
         ``True`` if the given string is a unary operator, ``False`` otherwise.
     """
-    return string == '~'
+    return (_symbol_kinds.get(string) or SYMBOLS.kind(string)) == 'unary'
 
 
-@lru_cache(maxsize=100)  # Cache the return value of is_binary
 def is_binary(string: str) -> bool:
     """Checks if the given string is a binary operator.
 
@@ -63,13 +112,43 @@ def is_binary(string: str) -> bool:
     Returns:
         ``True`` if the given string is a binary operator, ``False`` otherwise.
     """
-    return string == '&' or string == '|' or string == '->'
-    # For Chapter 3:
-    # return string in {'&', '|',  '->', '+', '<->', '-&', '-|'}
+    return (_symbol_kinds.get(string) or SYMBOLS.kind(string)) == 'binary'
+
+
+#: The binary operator tokens, ordered so that no token is preceded by a
+#: proper prefix of it.
+_BINARY_OPERATOR_TOKENS = ('<->', '-&', '->', '-|', '&', '|', '+')
+
+#: Whether newly constructed formulas are interned (hash-consed), see
+#: `set_interning`.
+_interning_enabled = False
+
+#: The interned formulas, keyed by their root and root operands.
+_interned_formulas: WeakValueDictionary = WeakValueDictionary()
+
+
+def set_interning(enabled: bool) -> bool:
+    """Turns interning (hash-consing) of newly constructed formulas on or off.
 
+    While interning is on, constructing a formula (directly, or indirectly,
+    e.g., via `Formula.parse`) that is structurally equal to an existing
+    interned formula returns that existing formula rather than a new object, so
+    that equality of interned formulas is an identity check. Formulas
+    constructed while interning is off are never interned, but still compare
+    equal to structurally equal interned formulas.
 
-@frozen
-class Formula:
+    Parameters:
+        enabled: whether to intern newly constructed formulas.
+
+    Returns:
+        Whether interning was on before the call.
+    """
+    global _interning_enabled
+    previous, _interning_enabled = _interning_enabled, enabled
+    return previous
+
+
+class Formula(Immutable):
     """An immutable propositional formula in tree representation, composed from
     variable names, and operators applied to them.
 
@@ -84,6 +163,29 @@ class Formula:
     root: str
     now: Optional[Formula]
     next: Optional[Formula]
+    _hash: int
+    _interned: bool
+
+    def __new__(cls, root: Optional[str] = None, now: Optional[Formula] = None,
+                next: Optional[Formula] = None):
+        """Allocates a `Formula`, or, if interning is on, returns the interned
+        formula with the given root and root operands if there is one.
+
+        Parameters:
+            root: the root for the formula tree.
+            now: the now operand for the root, if the root is a unary or
+                binary operator.
+            next: the next operand for the root, if the root is a binary
+                operator.
+
+        Returns:
+            The interned formula, or a new uninitialized formula.
+        """
+        if _interning_enabled and root is not None:
+            formula = _interned_formulas.get((root, now, next))
+            if formula is not None:
+                return formula
+        return super().__new__(cls)
 
     def __init__(self, root: str, now: Optional[Formula] = None,
                  next: Optional[Formula] = None):
@@ -96,16 +198,35 @@ class Formula:
             next: the next operand for the root, if the root is a binary
                 operator.
         """
-        if is_variable(root) or is_constant(root):
+        kind = _symbol_kinds.get(root) or SYMBOLS.kind(root)
+        if kind == 'variable' or kind == 'constant':
             assert now is None and next is None
             self.root = root
-        elif is_unary(root):
+        elif kind == 'unary':
             assert now is not None and next is None
             self.root, self.now = root, now
         else:
-            assert is_binary(root)
+            assert kind == 'binary'
             assert now is not None and next is not None
             self.root, self.now, self.next = root, now, next
+        self._hash = hash((root, now, next))
+        self._interned = _interning_enabled
+        if _interning_enabled:
+            _interned_formulas[root, now, next] = self
+
+    def __reduce__(self):
+        """Reduces the current formula for pickling, so that unpickling
+        reconstructs it (and rehashes and possibly interns it) via `Formula`.
+
+        Returns:
+            The `Formula` class and the root and root operands of the current
+            formula.
+        """
+        if is_unary(self.root):
+            return Formula, (self.root, self.now)
+        if is_binary(self.root):
+            return Formula, (self.root, self.now, self.next)
+        return Formula, (self.root,)
 
     @memoized_parameterless_method
     def __repr__(self) -> str:
@@ -115,12 +236,69 @@ class Formula:
             The standard string representation of the current formula.
         """
         # Task 1.1
-        if is_unary(self.root):
-            return self.root + repr(self.now)
-        if is_constant(self.root) or is_variable(self.root):
-            return self.root
-        
-        return '(' + repr(self.now) + self.root + repr(self.next) + ')'
+        return ''.join(self._tokens(False))
+
+    def _tokens(self, polish: bool) -> Iterator[str]:
+        """Lists the tokens of the standard string representation or of the
+        polish notation representation of the current formula, using an
+        explicit stack rather than recursion.
+
+        Parameters:
+            polish: whether to list the tokens of the polish notation
+                representation rather than of the standard string
+                representation.
+
+        Returns:
+            An iterator over the tokens of the requested representation of the
+            current formula, in order. Subformulas whose standard string
+            representation is already memoized are listed as a single token.
+        """
+        # Subformulas still to render, and tokens (strings) still to list
+        stack: List[Union[Formula, str]] = [self]
+        while len(stack) > 0:
+            formula = stack.pop()
+            if type(formula) is str:
+                yield formula
+                continue
+            if not polish:
+                memoized = getattr(formula, '_memoized___repr__', None)
+                if memoized is not None:
+                    yield memoized
+                    continue
+            root = formula.root
+            kind = _symbol_kinds.get(root) or SYMBOLS.kind(root)
+            if kind == 'unary':
+                yield root
+                stack.append(formula.now)
+            elif kind != 'binary':
+                yield root
+            elif polish:
+                yield root
+                stack.append(formula.next)
+                stack.append(formula.now)
+            else:
+                yield '('
+                stack.extend((')', formula.next, root, formula.now))
+
+    def write(self, file: TextIO, polish: bool = False,
+              buffer_size: int = 65536) -> None:
+        """Writes the standard string representation or the polish notation
+        representation of the current formula to the given file, without
+        building it in memory as a whole.
+
+        Parameters:
+            file: text file to write to.
+            polish: whether to write the polish notation representation rather
+                than the standard string representation.
+            buffer_size: number of tokens to collect before each write.
+        """
+        buffer: List[str] = []
+        for token in self._tokens(polish):
+            buffer.append(token)
+            if len(buffer) == buffer_size:
+                file.write(''.join(buffer))
+                buffer.clear()
+        file.write(''.join(buffer))
 
     def __eq__(self, other: object) -> bool:
         """Compares the current formula with the given one.
@@ -132,7 +310,11 @@ class Formula:
             ``True`` if the given object is a `Formula` object that equals the
             current formula, ``False`` otherwise.
         """
-        return isinstance(other, Formula) and str(self) == str(other)
+        if self is other:
+            return True
+        return isinstance(other, Formula) and self._hash == other._hash and \
+            not (self._interned and other._interned) and \
+            str(self) == str(other)
 
     def __ne__(self, other: object) -> bool:
         """Compares the current formula with the given one.
@@ -147,10 +329,10 @@ class Formula:
         return not self == other
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return self._hash
 
-    @memoized_parameterless_method
-    def variables(self) -> Set[str]:
+    @memoized_parameterless_set_method
+    def variables(self) -> FrozenSet[str]:
         """Finds all variable names in the current formula.
 
         Returns:
@@ -166,8 +348,8 @@ class Formula:
             return self.now.variables()
         return self.now.variables() | self.next.variables()
 
-    @memoized_parameterless_method
-    def operators(self) -> Set[str]:
+    @memoized_parameterless_set_method
+    def operators(self) -> FrozenSet[str]:
         """Finds all operators in the current formula.
 
         Returns:
@@ -201,49 +383,83 @@ class Formula:
             is a string with some human-readable content.
         """
         # Task 1.4
-        if string == '':
-            return None, 'End of input'
-        sym = string[0]
-        if is_constant(sym):
-            return Formula(sym), string[1:]
-        if sym == '(':
-            now, ost = Formula._parse_prefix(string[1:])
-            if now is None:
-                return None, ost
-            if ost == '':
-                return None, 'Missing operator'
-            chr = None
-            for i in ['<->', '-&', '->', '-|', '&', '|', '+']:
-                if ost.startswith(i):
-                    chr = i
-                    ost = ost[len(i):]
+        formula, end = Formula._parse_from(string, 0)
+        if formula is None:
+            return None, end
+        return formula, string[end:]
+
+    @staticmethod
+    def _parse_from(string: str, position: int) -> \
+            Tuple[Union[Formula, None], Union[int, str]]:
+        """Parses the longest formula of the given string that starts at the
+        given position, in a single left-to-right pass with an explicit stack
+        of pending operators, so that parsing takes linear time and does not
+        recurse however deeply the formula is nested.
+
+        Parameters:
+            string: string to parse.
+            position: index in the given string at which to start parsing.
+
+        Returns:
+            A pair of the parsed formula and the index in the given string just
+            past its end, or, if no formula starts at the given position, a
+            pair of ``None`` and an error message (the same message that
+            `_parse_prefix` returns for the suffix that starts at the given
+            position).
+        """
+        length = len(string)
+        # Each pending entry is either '~', '(' (awaiting the now operand and
+        # then a binary operator), or an (operator, now operand) pair
+        # (awaiting the next operand and then ')').
+        pending = []
+        while True:
+            if position == length:
+                return None, 'End of input'
+            sym = string[position]
+            if sym == '~' or sym == '(':
+                pending.append(sym)
+                position += 1
+                continue
+            if is_constant(sym):
+                formula = Formula(sym)
+                position += 1
+            elif 'p' <= sym <= 'z':
+                end = position + 1
+                while end < length and string[end].isdecimal():
+                    end += 1
+                res = string[position:end]
+                if not is_variable(res):
+                    return None, 'Invalid'
+                formula = Formula(res)
+                position = end
+            else:
+                return None, 'Invalid pref'
+            while len(pending) > 0:
+                top = pending[-1]
+                if top == '~':
+                    pending.pop()
+                    formula = Formula('~', formula)
+                elif top == '(':
+                    if position == length:
+                        return None, 'Missing operator'
+                    chr = None
+                    for i in _BINARY_OPERATOR_TOKENS:
+                        if string.startswith(i, position):
+                            chr = i
+                            break
+                    if chr is None or not is_binary(chr):
+                        return None, 'Invalid operator'
+                    pending[-1] = (chr, formula)
+                    position += len(chr)
                     break
-            if chr is None:
-                return None, 'Invalid operator'
-            if not is_binary(chr):
-                return None, 'Invalid operator'
-            next, ost = Formula._parse_prefix(ost)
-            if next is None:
-                return None, ost
-            if ost == '' or ost[0] != ')':
-                return None, 'Not closed'
-            return Formula(chr, now, next), ost[1:]
-    
-        if sym == '~':
-            leaf, ost = Formula._parse_prefix(string[1:])
-            if leaf is None:
-                return None, ost
-            return Formula('~', leaf), ost
-
-        if 'p' <= sym <= 'z':
-            num = 1
-            while num < len(string) and string[num].isdecimal():
-                num += 1
-            res = string[:num]
-            if not is_variable(res):
-                return None, 'Invalid'
-            return Formula(res), string[num:]
-        return None, 'Invalid pref'
+                else:
+                    if position == length or string[position] != ')':
+                        return None, 'Not closed'
+                    pending.pop()
+                    formula = Formula(top[0], top[1], formula)
+                    position += 1
+            else:
+                return formula, position
 
     @staticmethod
     def is_formula(string: str) -> bool:
@@ -257,9 +473,8 @@ class Formula:
             representation of a formula, ``False`` otherwise.
         """
         # Task 1.5
-        formula, ost = Formula._parse_prefix(string)
-        fl = formula is not None and ost == ''
-        return fl
+        formula, end = Formula._parse_from(string, 0)
+        return formula is not None and end == len(string)
 
     @staticmethod
     def parse(string: str) -> Formula:
@@ -271,11 +486,9 @@ class Formula:
         Returns:
             A formula whose standard string representation is the given string.
         """
-        assert Formula.is_formula(string)
         # Task 1.6
-        formula, ost = Formula._parse_prefix(string)
-        fl = formula is not None and ost == ''
-        assert fl
+        formula, end = Formula._parse_from(string, 0)
+        assert formula is not None and end == len(string)
         return formula
 
     def polish(self) -> str:
@@ -285,11 +498,7 @@ class Formula:
             The polish notation representation of the current formula.
         """
         # Optional Task 1.7
-        if is_constant(self.root) or is_variable(self.root):
-            return self.root
-        if is_unary(self.root):
-            return self.root + self.now.polish()
-        return self.root + self.now.polish() + self.next.polish()
+        return ''.join(self._tokens(True))
 
     @staticmethod
     def parse_polish(string: str) -> Formula:
@@ -424,3 +633,121 @@ class Formula:
                 is_binary(operator)
             assert substitution_map[operator].variables().issubset({'p', 'q'})
         # Task 3.4
+
+
+def _parse_numbered_lines(numbered_lines: Iterable[Tuple[int, str]]) -> \
+        List[Tuple[int, Optional[Formula], Optional[str]]]:
+    """Parses each of the given lines into a formula.
+
+    Parameters:
+        numbered_lines: pairs of line number and line to parse.
+
+    Returns:
+        A list with a triplet for each given nonblank line: its line number,
+        the formula that it represents or ``None`` if it is not a valid
+        standard string representation of a formula, and ``None`` or an error
+        message, respectively.
+    """
+    results = []
+    for line_number, line in numbered_lines:
+        line = line.strip()
+        if line == '':
+            continue
+        formula, end = Formula._parse_from(line, 0)
+        if formula is None:
+            results.append((line_number, None, end))
+        elif end != len(line):
+            results.append((line_number, None,
+                            'Unparsed suffix ' + repr(line[end:])))
+        else:
+            results.append((line_number, formula, None))
+    return results
+
+
+def load_formulas(source: Union[str, os.PathLike, TextIO],
+                  errors: Optional[List[Tuple[int, str]]] = None,
+                  processes: Optional[int] = None, chunk_size: int = 10000) \
+        -> Iterator[Formula]:
+    """Lazily parses the formulas in the given newline-delimited source, one
+    standard string representation of a formula per line.
+
+    Parameters:
+        source: path of a text file, or a text stream, to read from. Blank
+            lines are skipped.
+        errors: list to which to append, for each line that is not a valid
+            standard string representation of a formula, a pair of its line
+            number (counting from 1) and an error message; or ``None`` to
+            silently skip such lines.
+        processes: number of worker processes among which to parse chunks of
+            lines in parallel, or ``None`` to parse in the current process.
+        chunk_size: number of lines per chunk sent to a worker process.
+
+    Returns:
+        An iterator over the formulas represented by the valid lines, in the
+        order of these lines.
+    """
+    assert processes is None or processes > 0
+    assert chunk_size > 0
+    if isinstance(source, (str, os.PathLike)):
+        with open(source) as stream:
+            yield from load_formulas(stream, errors, processes, chunk_size)
+        return
+    numbered_lines = enumerate(source, 1)
+    chunks = iter(lambda: list(islice(numbered_lines, chunk_size)), [])
+    if processes is None:
+        chunk_results = map(_parse_numbered_lines, chunks)
+    else:
+        chunk_results = _parse_chunks_in_processes(chunks, processes)
+    for results in chunk_results:
+        for line_number, formula, error in results:
+            if formula is not None:
+                yield formula
+            elif errors is not None:
+                errors.append((line_number, error))
+
+
+def _parse_chunks_in_processes(chunks: Iterator[List[Tuple[int, str]]],
+                               processes: int) -> \
+        Iterator[List[Tuple[int, Optional[Formula], Optional[str]]]]:
+    """Parses the given chunks of lines in a pool of worker processes, reading
+    ahead only a bounded number of chunks.
+
+    Parameters:
+        chunks: chunks of pairs of line number and line to parse.
+        processes: number of worker processes.
+
+    Returns:
+        An iterator over the results of `_parse_numbered_lines` for the given
+        chunks, in the order of the chunks.
+    """
+    with ProcessPoolExecutor(processes) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_parse_numbered_lines, chunk))
+            if len(pending) > 2 * processes:
+                yield pending.popleft().result()
+        while len(pending) > 0:
+            yield pending.popleft().result()
+
+
+def balanced_formula(operator: str, operands: Sequence[Formula]) -> Formula:
+    """Combines the given formulas with the given binary operator into a
+    balanced tree.
+
+    Parameters:
+        operator: binary operator to combine with.
+        operands: nonempty sequence of formulas to combine.
+
+    Returns:
+        A formula of depth logarithmic in the number of given formulas, whose
+        leaves from left to right are the given formulas.
+    """
+    assert is_binary(operator) and len(operands) > 0
+    level = list(operands)
+    while len(level) > 1:
+        paired = [Formula(operator, level[i], level[i + 1])
+                  for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2 == 1:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
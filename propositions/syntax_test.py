@@ -6,7 +6,14 @@
 
 """Tests for the propositions.syntax module."""
 
-from logic_utils import frozendict
+import copy
+import io
+import os
+import pickle
+import tempfile
+
+from logic_utils import frozendict, memoization_statistics, \
+                        set_memoization_statistics
 
 from propositions.syntax import *
 
@@ -156,6 +163,193 @@ def test_parse_polish(debug=False):
             print("Testing polish parsing of formula", polish)
         assert Formula.parse_polish(polish).polish() == polish
 
+# Tests for interning
+
+def test_hash_and_equality(debug=False):
+    for s1, s2, equal in [('p', 'p', True), ('p', 'q', False),
+                          ('~(p&q7)', '~(p&q7)', True),
+                          ('(p->q)', '(q->p)', False),
+                          ('((p|q)&~T)', '((p|q)&~T)', True)]:
+        if debug:
+            print('Testing hash and equality of', s1, 'and', s2)
+        f1, f2 = Formula.parse(s1), Formula.parse(s2)
+        assert (f1 == f2) == equal
+        assert (f1 != f2) != equal
+        if equal:
+            assert hash(f1) == hash(f2)
+        assert len({f1, f2}) == (1 if equal else 2)
+
+def test_interning(debug=False):
+    previous = set_interning(True)
+    try:
+        for s in ['p', 'T', '~x12', '(p|p)', '((p->q)->(~q->~p))']:
+            if debug:
+                print('Testing interning of', s)
+            f1 = Formula.parse(s)
+            f2 = Formula.parse(s)
+            assert f1 is f2
+        f = Formula('&', Formula('p'), Formula('q'))
+        assert f is Formula.parse('(p&q)')
+        assert f.now is Formula('p')
+        assert Formula.parse('(p&q)') is not Formula.parse('(q&p)')
+        assert Formula.parse('(p&q)') != Formula.parse('(q&p)')
+        set_interning(False)
+        g = Formula.parse('(p&q)')
+        assert g is not f and g == f and hash(g) == hash(f)
+        set_interning(True)
+        assert Formula('~', g) is Formula.parse('~(p&q)')
+    finally:
+        set_interning(previous)
+
+def test_immutability(debug=False):
+    formula = Formula.parse('(p&~q)')
+    str(formula), formula.variables()
+    for name in ['root', 'now', 'next', 'new_field']:
+        if debug:
+            print('Testing assignment to and deletion of field', name)
+        for modify in [lambda: setattr(formula, name, Formula('r')),
+                       lambda: delattr(formula, name)]:
+            try:
+                modify()
+                assert False, 'Modified field ' + name
+            except Exception as e:
+                assert 'immutable' in str(e)
+    for duplicate in [copy.copy, copy.deepcopy,
+                      lambda f: pickle.loads(pickle.dumps(f))]:
+        if debug:
+            print('Testing duplication of', formula)
+        duplicated = duplicate(formula)
+        assert type(duplicated) is Formula
+        assert duplicated == formula and hash(duplicated) == hash(formula)
+        assert str(duplicated) == '(p&~q)'
+
+def test_memoization(debug=False):
+    set_memoization_statistics(True)
+    try:
+        formula = Formula.parse('~(p&(q|~F))')
+        for method, expected in [(formula.variables, {'p', 'q'}),
+                                 (formula.operators, {'~', '&', '|', 'F'})]:
+            if debug:
+                print('Testing memoization of', method.__name__, 'of', formula)
+            value = method()
+            assert type(value) is frozenset and value == expected
+            assert method() is value
+        statistics = memoization_statistics()
+        assert statistics['Formula.variables'] == (1, 7)
+        assert statistics['Formula.operators'] == (1, 7)
+    finally:
+        set_memoization_statistics(False)
+
+def test_symbol_table(debug=False):
+    if debug:
+        print('Testing classification of many fresh variable names')
+    names = ['z' + str(i) for i in range(1, 50001)]
+    for name in names:
+        assert is_variable(name) and symbol_kind(name) == 'variable'
+    ids = [SYMBOLS.id(name) for name in names]
+    assert len(set(ids)) == len(names)
+    for name, id in zip(names, ids):
+        assert SYMBOLS.id(name) == id and SYMBOLS.name(id) == name
+    for string, kind in [('p', 'variable'), ('x12', 'variable'),
+                         ('T', 'constant'), ('~', 'unary'), ('->', 'binary'),
+                         ('a', None), ('x1y', None), ('(', None)]:
+        if debug:
+            print('Testing the kind of', string)
+        assert symbol_kind(string) == kind
+        assert is_variable(string) == (kind == 'variable')
+        assert is_constant(string) == (kind == 'constant')
+        assert is_unary(string) == (kind == 'unary')
+        assert is_binary(string) == (kind == 'binary')
+
+# Tests for deeply nested formulas
+
+def test_parse_deep(debug=False):
+    depth = 100000
+    if debug:
+        print('Testing parsing of', depth, 'nested negations')
+    formula = Formula.parse('~' * depth + 'x12')
+    for _ in range(depth):
+        assert formula.root == '~'
+        formula = formula.now
+    assert formula.root == 'x12'
+    if debug:
+        print('Testing parsing of', depth, 'nested conjunctions')
+    string = '(p&' * depth + 'q' + ')' * depth
+    assert Formula.is_formula(string)
+    formula = Formula.parse(string)
+    for _ in range(depth):
+        assert formula.root == '&' and formula.now.root == 'p'
+        formula = formula.next
+    assert formula.root == 'q'
+    for string, error in [(string[:-1], 'Not closed'),
+                          ('(' * depth + 'p', 'Missing operator'),
+                          ('~' * depth, 'End of input'),
+                          ('(' * depth + 'p#q', 'Invalid operator')]:
+        if debug:
+            print('Testing parsing prefix of a deeply nested invalid formula')
+        assert not Formula.is_formula(string)
+        assert Formula._parse_prefix(string) == (None, error)
+
+def test_repr_and_polish_deep(debug=False):
+    depth = 100000
+    if debug:
+        print('Testing representations of', depth, 'left-nested implications')
+    formula = Formula('p')
+    for i in range(depth):
+        formula = Formula('->', formula, Formula('~', Formula('q')))
+    string = '(' * depth + 'p' + '->~q)' * depth
+    polish = '->' * depth + 'p' + '~q' * depth
+    assert str(formula) == string
+    assert formula.polish() == polish
+    for as_polish, expected in [(False, string), (True, polish)]:
+        for buffer_size in [1, 1000, 65536]:
+            file = io.StringIO()
+            formula.write(file, as_polish, buffer_size)
+            assert file.getvalue() == expected
+    assert Formula.parse(string) == formula
+    assert Formula.parse_polish(polish) == formula
+    if debug:
+        print('Testing writing representations of small formulas')
+    for string in ['x12', '~~F', '((p->q)->(~q->~p))']:
+        formula = Formula.parse(string)
+        file = io.StringIO()
+        formula.write(file)
+        formula.write(file, True)
+        assert file.getvalue() == string + formula.polish()
+
+# Tests for bulk loading
+
+def test_load_formulas(debug=False):
+    lines = ['(p|x13)', '', 'x&', '~~~x', '(x&&y)', '((p->q)->(~q->~p))',
+             'T', '(T)']
+    expected_formulas = ['(p|x13)', '~~~x', '((p->q)->(~q->~p))', 'T']
+    expected_error_lines = [3, 5, 8]
+    text = '\n'.join(lines) + '\n'
+    handle, path = tempfile.mkstemp(suffix='.txt')
+    with os.fdopen(handle, 'w') as file:
+        file.write(text * 50)
+    try:
+        for source, processes, chunk_size, repeat in \
+                [(io.StringIO(text), None, 10000, 1),
+                 (path, None, 7, 50),
+                 (path, 2, 7, 50)]:
+            if debug:
+                print('Testing loading formulas from', type(source).__name__,
+                      'with processes', processes, 'and chunk size',
+                      chunk_size)
+            errors = []
+            formulas = load_formulas(source, errors, processes, chunk_size)
+            assert [str(formula) for formula in formulas] == \
+                   expected_formulas * repeat
+            assert [line_number for line_number, error in errors] == \
+                   [line_number + len(lines) * i for i in range(repeat)
+                    for line_number in expected_error_lines]
+            for line_number, error in errors:
+                assert type(error) is str
+        assert len(list(load_formulas(io.StringIO(text)))) == 4
+    finally:
+        os.remove(path)
+
 # Tests for Chapter 3
 
 def test_repr_all_operators(debug=False):
@@ -333,6 +527,20 @@ def test_ex1_opt(debug=False):
     test_polish(debug)
     test_parse_polish(debug)
 
+def test_bulk(debug=False):
+    test_load_formulas(debug)
+
+def test_deep(debug=False):
+    test_parse_deep(debug)
+    test_repr_and_polish_deep(debug)
+
+def test_interned(debug=False):
+    test_hash_and_equality(debug)
+    test_interning(debug)
+    test_immutability(debug)
+    test_memoization(debug)
+    test_symbol_table(debug)
+
 def test_ex3(debug=False):
     assert is_binary('+'), "Change is_binary() before testing Chapter 3 tasks."
     test_repr_all_operators(debug)
@@ -347,4 +555,7 @@ def test_ex3(debug=False):
 def test_all(debug=False):
     test_ex1(debug)
     test_ex1_opt(debug)
+    test_interned(debug)
+    test_deep(debug)
+    test_bulk(debug)
     test_ex3(debug) 
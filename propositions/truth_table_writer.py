@@ -0,0 +1,111 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/truth_table_writer.py
+
+"""Streaming export of truth tables of propositional formulas."""
+
+from typing import BinaryIO, Iterable, List, Optional, Sequence, TextIO, \
+                   Tuple, Union
+
+from propositions.syntax import *
+from propositions.bitparallel import truth_table_chunks
+
+#: The supported output formats: ``'markdown'`` for the table printed by
+#: `~propositions.semantics.print_truth_table`, ``'csv'`` for comma-separated
+#: values with a header row, and ``'bitmap'`` for the truth values of the
+#: formula packed one bit per row, row ``m`` being bit ``m % 8`` (counting from
+#: the least significant bit) of byte ``m // 8``.
+FORMATS = ('markdown', 'csv', 'bitmap')
+
+#: The maximal number of variable names whose rows' cells are precomputed.
+_PRECOMPUTED_VARIABLES = 10
+
+def write_truth_table(formula: Formula, file: Union[TextIO, BinaryIO],
+                      output_format: str = 'markdown',
+                      variables: Optional[Sequence[str]] = None,
+                      buffer_size: int = 65536,
+                      chunks: Optional[Iterable[Tuple[int, int]]] = None) -> \
+        int:
+    """Writes the truth table of the given formula to the given file, one chunk
+    of rows at a time, without building it in memory as a whole.
+
+    Parameters:
+        formula: formula to write the truth table of.
+        file: text file to write a ``'markdown'`` or ``'csv'`` table to, or
+            binary file to write a ``'bitmap'`` to.
+        output_format: output format out of `FORMATS`.
+        variables: variable names of the table columns (a superset of those of
+            the given formula), in the order of
+            `~propositions.semantics.all_models`, or ``None`` for the variable
+            names of the given formula, sorted alphabetically.
+        buffer_size: number of rows to collect before each text write.
+        chunks: the truth values of the given formula in all models over the
+            given variable names, as pairs of a number of consecutive models
+            and the bits of the truth values in them (in the order of
+            `~propositions.bitparallel.truth_table_chunks`), or ``None`` to
+            compute them via `~propositions.bitparallel.truth_table_chunks`.
+
+    Returns:
+        The number of rows written, not counting header rows.
+    """
+    assert output_format in FORMATS
+    if variables is None:
+        variables = sorted(formula.variables())
+    n_variables = len(variables)
+    if chunks is None:
+        chunks = truth_table_chunks(formula, variables)
+    if output_format == 'bitmap':
+        pending = 0
+        pending_width = 0
+        for width, bits in chunks:
+            pending |= bits << pending_width
+            pending_width += width
+            n_bytes = pending_width // 8
+            if n_bytes > 0:
+                file.write(pending.to_bytes(n_bytes, 'little'))
+                pending >>= 8 * n_bytes
+                pending_width -= 8 * n_bytes
+        if pending_width > 0:
+            file.write(pending.to_bytes(1, 'little'))
+        return 1 << n_variables
+
+    headers = list(variables) + [str(formula)]
+    if output_format == 'markdown':
+        file.write('| ' + ' | '.join(headers) + ' |\n')
+        file.write('|' + '|'.join('-' * (len(header) + 2)
+                                  for header in headers) + '|\n')
+        cells = [('| ' + 'F'.ljust(len(header)) + ' ',
+                  '| ' + 'T'.ljust(len(header)) + ' ') for header in headers]
+        end = '|\n'
+    else:
+        file.write(','.join(headers) + '\n')
+        cells = [('F,', 'T,') for _ in variables] + [('F', 'T')]
+        end = '\n'
+    # Rows are a prefix for the first variable names, a precomputed infix for
+    # the last ones, and a suffix for the formula
+    n_low = min(n_variables, _PRECOMPUTED_VARIABLES)
+    n_high = n_variables - n_low
+    infixes = ['']
+    for column in range(n_high, n_variables):
+        infixes = [infix + cell for infix in infixes for cell in cells[column]]
+    suffixes = [cells[-1][0] + end, cells[-1][1] + end]
+    buffer: List[str] = []
+    row = 0
+    for width, bits in chunks:
+        values = format(bits, '0' + str(width) + 'b')[::-1]
+        for start in range(0, width, len(infixes)):
+            prefix = ''.join(cells[column][row >> (n_variables - 1 - column)
+                                           & 1]
+                             for column in range(n_high))
+            for infix, value in zip(infixes,
+                                    values[start:start + len(infixes)]):
+                buffer.append(prefix + infix +
+                              suffixes[1 if value == '1' else 0])
+            row += len(infixes)
+            if len(buffer) >= buffer_size:
+                file.write(''.join(buffer))
+                buffer.clear()
+    file.write(''.join(buffer))
+    return row
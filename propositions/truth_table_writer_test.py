@@ -0,0 +1,117 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/truth_table_writer_test.py
+
+"""Tests for the propositions.truth_table_writer module."""
+
+from contextlib import redirect_stdout
+from io import BytesIO, StringIO
+from itertools import product
+from random import Random
+
+from propositions.truth_table_writer import *
+from propositions.bitparallel import truth_table_bits
+from propositions.semantics import BACKENDS, print_truth_table, set_backend
+from propositions.workloads import random_formula
+
+def _markdown(formula, variables):
+    headers = list(variables) + [str(formula)]
+    bits = truth_table_bits(formula, variables)
+    lines = ['| ' + ' | '.join(headers) + ' |',
+             '|' + '|'.join('-' * (len(header) + 2) for header in headers) +
+             '|']
+    for m, values in enumerate(product('FT', repeat=len(variables))):
+        cells = list(values) + ['T' if bits >> m & 1 else 'F']
+        lines.append('| ' + ' | '.join(cell.ljust(len(header))
+                                       for cell, header in zip(cells, headers))
+                     + ' |')
+    return '\n'.join(lines) + '\n'
+
+def test_markdown(debug=False):
+    formula = Formula.parse('~(p&q76)')
+    if debug:
+        print('Testing Markdown truth table of', formula)
+    file = StringIO()
+    assert write_truth_table(formula, file) == 4
+    assert file.getvalue() == '| p | q76 | ~(p&q76) |\n' \
+                              '|---|-----|----------|\n' \
+                              '| F | F   | T        |\n' \
+                              '| F | T   | T        |\n' \
+                              '| T | F   | T        |\n' \
+                              '| T | T   | F        |\n'
+    rng = Random(0)
+    for n_variables in [1, 3, 12]:
+        formula = random_formula(rng, n_variables, 5,
+                                 constant_probability=0.05)
+        variables = sorted(formula.variables() | {'x1'})
+        if debug:
+            print('Testing Markdown truth table of', formula)
+        file = StringIO()
+        assert write_truth_table(formula, file, variables=variables,
+                                 buffer_size=100) == 2 ** len(variables)
+        assert file.getvalue() == _markdown(formula, variables)
+    file = StringIO()
+    write_truth_table(Formula.parse('~F'), file)
+    assert file.getvalue() == '| ~F |\n|----|\n| T  |\n'
+
+def test_csv(debug=False):
+    formula = Formula.parse('(p->q)')
+    if debug:
+        print('Testing CSV truth table of', formula)
+    file = StringIO()
+    assert write_truth_table(formula, file, 'csv', ['q', 'p']) == 4
+    assert file.getvalue() == 'q,p,(p->q)\nF,F,T\nF,T,F\nT,F,T\nT,T,T\n'
+
+def test_bitmap(debug=False):
+    rng = Random(1)
+    for n_variables in [0, 2, 3, 10]:
+        formula = random_formula(rng, n_variables, 5,
+                                 constant_probability=0.05) \
+                  if n_variables > 0 else Formula('T')
+        variables = sorted(formula.variables())
+        if debug:
+            print('Testing bitmap truth table of', formula)
+        file = BytesIO()
+        assert write_truth_table(formula, file, 'bitmap') == \
+               2 ** len(variables)
+        assert file.getvalue() == \
+               truth_table_bits(formula, variables).to_bytes(
+                   (2 ** len(variables) + 7) // 8, 'little')
+    formula = Formula.parse('((x1&x2)|x22)')
+    variables = ['x' + str(i) for i in range(1, 23)]
+    if debug:
+        print('Testing bitmap truth table of', formula, 'over', variables)
+    file = BytesIO()
+    write_truth_table(formula, file, 'bitmap', variables)
+    assert file.getvalue() == \
+           truth_table_bits(formula, variables).to_bytes(2 ** 19, 'little')
+
+def test_backends(debug=False):
+    rng = Random(2)
+    formula = random_formula(rng, 5, 5, constant_probability=0.05)
+    variables = sorted(formula.variables())
+    file = StringIO()
+    write_truth_table(formula, file, 'csv', variables,
+                      chunks=[(1 << len(variables), 0)])
+    assert all(line.endswith(',F')
+               for line in file.getvalue().splitlines()[1:])
+    for backend in BACKENDS:
+        if debug:
+            print('Testing printing truth table of', formula, 'with backend',
+                  backend)
+        previous = set_backend(backend)
+        try:
+            output = StringIO()
+            with redirect_stdout(output):
+                print_truth_table(formula)
+        finally:
+            set_backend(previous)
+        assert output.getvalue() == _markdown(formula, variables)
+
+def test_all(debug=False):
+    test_markdown(debug)
+    test_csv(debug)
+    test_bitmap(debug)
+    test_backends(debug)
@@ -0,0 +1,411 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/truthtable.py
+
+"""Packed truth tables of Boolean functions over fixed variable orders."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import weakref
+from typing import Iterator, Optional, Sequence, Tuple, Union
+
+from logic_utils import Immutable
+
+from propositions.syntax import *
+from propositions.bitparallel import truth_table_bits, variable_pattern
+
+#: The first line of files written by `TruthTable.save`.
+_MAGIC = b'truth table\n'
+
+#: The number of truth values unpacked at a time when iterating over a table.
+_ITERATION_CHUNK = 1 << 16
+
+def _index_bit_pattern(k: int, n_variables: int) -> int:
+    """Computes the bitvector of the model indices whose ``k``\\ th bit is set,
+    i.e., in which the ``(n-1-k)``\\ th of ``n`` variable names is ``True``.
+
+    Parameters:
+        k: index bit.
+        n_variables: number of variable names.
+
+    Returns:
+        The bitvector whose ``m``\\ th bit is set if and only if bit ``k`` of
+        ``m`` is set.
+    """
+    return variable_pattern(n_variables - 1 - k, n_variables)
+
+class TruthTable(Immutable):
+    """An immutable truth table of a Boolean function over a fixed sequence of
+    variable names, packed one bit per model.
+
+    Attributes:
+        variables (`~typing.Tuple`\\[`str`, ...]): the variable names of the
+            table, in the order of `~propositions.semantics.all_models`.
+        bits (`int`): the bitvector whose ``m``\\ th bit is set if and only if
+            the function is ``True`` in the ``m``\\ th model over the variable
+            names of the table.
+    """
+    variables: Tuple[str, ...]
+    bits: int
+
+    def __init__(self, variables: Sequence[str], bits: int):
+        """Initializes a `TruthTable` from its variable names and bits.
+
+        Parameters:
+            variables: the distinct variable names of the table.
+            bits: the bitvector of the truth values of the function in all
+                models over the given variable names.
+        """
+        assert len(set(variables)) == len(variables)
+        assert 0 <= bits < 1 << (1 << len(variables))
+        self.variables = tuple(variables)
+        self.bits = bits
+
+    def __len__(self) -> int:
+        """Computes the number of rows of the current table.
+
+        Returns:
+            ``2``\\ ``**``\\ ``len(``\\ `variables`\\ ``)``.
+        """
+        return 1 << len(self.variables)
+
+    def __iter__(self) -> Iterator[bool]:
+        """Lazily unpacks the current table.
+
+        Returns:
+            An iterator over the truth values of the function in all models
+            over the variable names of the current table, in the order of
+            `~propositions.semantics.all_models`.
+        """
+        for start in range(0, len(self), _ITERATION_CHUNK):
+            width = min(_ITERATION_CHUNK, len(self) - start)
+            digits = format(self._bits_from(start, width),
+                            '0' + str(width) + 'b')
+            for digit in reversed(digits):
+                yield digit == '1'
+
+    def _bits_from(self, start: int, width: int) -> int:
+        """Extracts the truth values in consecutive rows of the current table.
+
+        Parameters:
+            start: index of the first row.
+            width: number of rows.
+
+        Returns:
+            The bitvector of the truth values of the function in the given
+            rows, the first of which is its least significant bit.
+        """
+        return self.bits >> start & ((1 << width) - 1)
+
+    def __getitem__(self, index: int) -> bool:
+        """Looks up a row of the current table.
+
+        Parameters:
+            index: index of a model in the order of
+                `~propositions.semantics.all_models`.
+
+        Returns:
+            The truth value of the function in the given model.
+        """
+        assert 0 <= index < len(self)
+        return self._bits_from(index, 1) == 1
+
+    def __repr__(self) -> str:
+        """Computes a string representation of the current table.
+
+        Returns:
+            A string that evaluates to the current table.
+        """
+        return 'TruthTable(' + repr(self.variables) + ', ' + \
+               hex(self.bits) + ')'
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the current table with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            ``True`` if the given object is a `TruthTable` object over the same
+            set of variable names, of the same Boolean function, ``False``
+            otherwise.
+        """
+        return isinstance(other, TruthTable) and \
+               set(self.variables) == set(other.variables) and \
+               self.bits == other.reorder(self.variables).bits
+
+    def __ne__(self, other: object) -> bool:
+        """Compares the current table with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            ``True`` if the given object is not a `TruthTable` object or is not
+            a table over the same set of variable names, of the same Boolean
+            function, ``False`` otherwise.
+        """
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self.variables))
+
+    def _aligned_bits(self, other: TruthTable) -> int:
+        """Computes the bits of the given table over the variable order of the
+        current one.
+
+        Parameters:
+            other: table over the same set of variable names as the current
+                one.
+
+        Returns:
+            The bits of `reorder`\\ ``(``\\ `variables`\\ ``)`` of the given
+            table.
+        """
+        assert isinstance(other, TruthTable)
+        return other.reorder(self.variables).bits
+
+    def __invert__(self) -> TruthTable:
+        """Negates the current table.
+
+        Returns:
+            The table of the negation of the function of the current table.
+        """
+        return TruthTable(self.variables, ((1 << len(self)) - 1) ^ self.bits)
+
+    def __and__(self, other: TruthTable) -> TruthTable:
+        """Conjoins the current table with the given one.
+
+        Parameters:
+            other: table over the same set of variable names.
+
+        Returns:
+            The table of the conjunction of the functions of the two tables,
+            over the variable order of the current one.
+        """
+        return TruthTable(self.variables, self.bits & self._aligned_bits(other))
+
+    def __or__(self, other: TruthTable) -> TruthTable:
+        """Disjoins the current table with the given one.
+
+        Parameters:
+            other: table over the same set of variable names.
+
+        Returns:
+            The table of the disjunction of the functions of the two tables,
+            over the variable order of the current one.
+        """
+        return TruthTable(self.variables, self.bits | self._aligned_bits(other))
+
+    def __xor__(self, other: TruthTable) -> TruthTable:
+        """Computes the exclusive or of the current table and the given one.
+
+        Parameters:
+            other: table over the same set of variable names.
+
+        Returns:
+            The table of the exclusive or of the functions of the two tables,
+            over the variable order of the current one.
+        """
+        return TruthTable(self.variables, self.bits ^ self._aligned_bits(other))
+
+    def implies(self, other: TruthTable) -> TruthTable:
+        """Computes the implication from the current table to the given one.
+
+        Parameters:
+            other: table over the same set of variable names.
+
+        Returns:
+            The table of the implication from the function of the current table
+            to that of the given one, over the variable order of the current
+            one.
+        """
+        return ~self | other
+
+    def iff(self, other: TruthTable) -> TruthTable:
+        """Computes the equivalence of the current table and the given one.
+
+        Parameters:
+            other: table over the same set of variable names.
+
+        Returns:
+            The table of the equivalence of the functions of the two tables,
+            over the variable order of the current one.
+        """
+        return ~(self ^ other)
+
+    def reorder(self, variables: Sequence[str]) -> TruthTable:
+        """Reorders the variable names of the current table, by swapping pairs
+        of bits of the model indices.
+
+        Parameters:
+            variables: permutation of the variable names of the current table.
+
+        Returns:
+            The table of the same Boolean function over the given variable
+            order.
+        """
+        if tuple(variables) == self.variables:
+            return self
+        assert sorted(variables) == sorted(self.variables)
+        n_variables = len(self.variables)
+        current = list(self.variables)
+        bits = self.bits
+        for i, variable in enumerate(variables):
+            j = current.index(variable)
+            if j == i:
+                continue
+            # Swap bits n-1-j < n-1-i of all model indices: models with the
+            # former set and the latter clear trade places with their partners
+            low, high = n_variables - 1 - j, n_variables - 1 - i
+            delta = (1 << high) - (1 << low)
+            mask = _index_bit_pattern(low, n_variables) & \
+                   ~_index_bit_pattern(high, n_variables)
+            swapped = (bits >> delta ^ bits) & mask
+            bits ^= swapped ^ swapped << delta
+            current[i], current[j] = current[j], current[i]
+        return TruthTable(variables, bits)
+
+    def cofactor(self, variable: str, value: bool) -> TruthTable:
+        """Restricts the current table to the models in which the given
+        variable name has the given truth value.
+
+        Parameters:
+            variable: variable name of the current table.
+            value: truth value to fix the given variable name to.
+
+        Returns:
+            The table over the other variable names of the current table, in
+            their order, of the Boolean function obtained by fixing the given
+            variable name to the given value.
+        """
+        rest = tuple(other for other in self.variables if other != variable)
+        assert len(rest) == len(self.variables) - 1
+        bits = self.reorder((variable,) + rest).bits
+        half = 1 << len(rest)
+        return TruthTable(rest, bits >> half if value else
+                                bits & ((1 << half) - 1))
+
+    def save(self, file: Union[str, os.PathLike]) -> None:
+        """Writes the current table to the given file: a header line, a line
+        with the space-separated variable names, and the bits in the
+        ``'bitmap'`` format of
+        `~propositions.truth_table_writer.write_truth_table`.
+
+        Parameters:
+            file: path of the file to write to.
+        """
+        with open(file, 'wb') as stream:
+            stream.write(_MAGIC)
+            stream.write(' '.join(self.variables).encode('ascii') + b'\n')
+            stream.write(self.bits.to_bytes((len(self) + 7) // 8, 'little'))
+
+    @staticmethod
+    def load(file: Union[str, os.PathLike]) -> MappedTruthTable:
+        """Maps a table written by `save` into memory, rather than reading it
+        into a buffer.
+
+        Parameters:
+            file: path of the file to map.
+
+        Returns:
+            The mapped table.
+        """
+        with open(file, 'rb') as stream:
+            mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            assert mapped[:len(_MAGIC)] == _MAGIC
+            end = mapped.find(b'\n', len(_MAGIC))
+            variables = mapped[len(_MAGIC):end].decode('ascii').split()
+            assert len(mapped) - end - 1 == ((1 << len(variables)) + 7) // 8
+        except Exception:
+            mapped.close()
+            raise
+        return MappedTruthTable(variables, mapped, end + 1)
+
+class MappedTruthTable(TruthTable):
+    """An immutable truth table, as loaded by `TruthTable.load`, whose rows are
+    unpacked from a file mapped into memory only when they are looked up or
+    iterated over. The bits of the table are unpacked as a whole only by
+    operations that need them all. The mapping is closed by `close`, when the
+    table is used as a context manager, or when the table is garbage collected.
+
+    Attributes:
+        variables (`~typing.Tuple`\\[`str`, ...]): the variable names of the
+            table, in the order of `~propositions.semantics.all_models`.
+    """
+    _mapped: mmap.mmap
+    _offset: int
+
+    def __init__(self, variables: Sequence[str], mapped: mmap.mmap,
+                 offset: int):
+        """Initializes a `MappedTruthTable` from its variable names and the
+        mapping of its bits.
+
+        Parameters:
+            variables: the distinct variable names of the table.
+            mapped: mapping of a file, that contains the bits of the table
+                from the given offset to its end, in the format of
+                `TruthTable.save`. It is closed with the table.
+            offset: offset of the bits of the table in the given mapping.
+        """
+        assert len(set(variables)) == len(variables)
+        self.variables = tuple(variables)
+        self._mapped = mapped
+        self._offset = offset
+        weakref.finalize(self, mapped.close)
+
+    @property
+    def bits(self) -> int:
+        """The bitvector whose ``m``\\ th bit is set if and only if the function
+        is ``True`` in the ``m``\\ th model over the variable names of the
+        table, unpacked from the mapping."""
+        return self._bits_from(0, len(self))
+
+    def _bits_from(self, start: int, width: int) -> int:
+        """Extracts the truth values in consecutive rows of the current table
+        from the mapping.
+
+        Parameters:
+            start: index of the first row.
+            width: number of rows.
+
+        Returns:
+            The bitvector of the truth values of the function in the given
+            rows, the first of which is its least significant bit.
+        """
+        first = self._offset + start // 8
+        last = self._offset + (start + width + 7) // 8
+        return int.from_bytes(self._mapped[first:last], 'little') >> \
+               start % 8 & ((1 << width) - 1)
+
+    def close(self) -> None:
+        """Closes the mapping of the current table."""
+        self._mapped.close()
+
+    def __enter__(self) -> MappedTruthTable:
+        return self
+
+    def __exit__(self, *exception: object) -> None:
+        self.close()
+
+def truth_table(formula: Formula,
+                variables: Optional[Sequence[str]] = None) -> TruthTable:
+    """Computes the truth table of the given formula, bit-parallel.
+
+    Parameters:
+        formula: formula to compute the truth table of.
+        variables: variable names of the table (a superset of those of the
+            given formula), or ``None`` for the variable names of the given
+            formula, sorted alphabetically.
+
+    Returns:
+        The truth table of the given formula over the given variable names.
+    """
+    if variables is None:
+        variables = sorted(formula.variables())
+    return TruthTable(variables, truth_table_bits(formula, variables))
@@ -0,0 +1,127 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/truthtable_test.py
+
+"""Tests for the propositions.truthtable module."""
+
+import os
+import tempfile
+from random import Random
+
+from propositions.truthtable import *
+from propositions.semantics import all_models, evaluate, synthesize, \
+                                   synthesize_cnf, truth_values
+from propositions.workloads import random_formula
+
+def test_truth_table(debug=False):
+    formula = Formula.parse('~(p&q76)')
+    if debug:
+        print('Testing truth_table of', formula)
+    table = truth_table(formula)
+    assert table.variables == ('p', 'q76')
+    assert len(table) == 4
+    assert list(table) == [True, True, True, False]
+    assert [table[m] for m in range(4)] == [True, True, True, False]
+    assert table == TruthTable(['p', 'q76'], 0b0111)
+    assert eval(repr(table)) == table
+    rng = Random(0)
+    for _ in range(20):
+        formula = random_formula(rng, 5, 5, constant_probability=0.05)
+        variables = sorted(formula.variables() | {'x3'})
+        if debug:
+            print('Testing truth_table of', formula)
+        assert list(truth_table(formula, variables)) == \
+               list(truth_values(formula, all_models(variables)))
+    variables = ['x' + str(i) for i in range(17)]
+    table = truth_table(Formula.parse('(x0->x16)'), variables)
+    assert list(table) == [not m >> 16 or m & 1 == 1
+                           for m in range(2 ** 17)]
+
+def test_operators(debug=False):
+    if debug:
+        print('Testing operators of truth tables')
+    p, q = Formula.parse('p'), Formula.parse('q')
+    tp, tq = truth_table(p, ['p', 'q']), truth_table(q, ['p', 'q'])
+    for table, string in [(tp & tq, '(p&q)'), (tp | tq, '(p|q)'),
+                          (~tp, '~p'), (tp.implies(tq), '(p->q)')]:
+        assert table == truth_table(Formula.parse(string), ['p', 'q']), \
+               string
+    assert tp.iff(tq) == TruthTable(['p', 'q'], 0b1001)
+    assert tp ^ tq == TruthTable(['p', 'q'], 0b0110)
+    assert tp != tq
+    assert tp == truth_table(p, ['q', 'p'])
+    assert tp & truth_table(q, ['q', 'p']) == \
+           truth_table(Formula.parse('(q&p)'), ['q', 'p'])
+    assert tp != truth_table(p)
+    assert tp != 'p'
+
+def test_reorder_and_cofactor(debug=False):
+    rng = Random(1)
+    for _ in range(20):
+        formula = random_formula(rng, 6, 6)
+        variables = sorted(formula.variables())
+        table = truth_table(formula, variables)
+        permuted = list(variables)
+        rng.shuffle(permuted)
+        if debug:
+            print('Testing reordering', formula, 'to', permuted)
+        reordered = table.reorder(permuted)
+        assert reordered.variables == tuple(permuted)
+        assert reordered.bits == truth_table(formula, permuted).bits
+        assert reordered == table
+        if len(variables) == 0:
+            continue
+        variable = rng.choice(variables)
+        rest = [other for other in variables if other != variable]
+        for value in [False, True]:
+            if debug:
+                print('Testing cofactoring', formula, 'by', variable, '=',
+                      value)
+            cofactor = table.cofactor(variable, value)
+            assert cofactor.variables == tuple(rest)
+            assert list(cofactor) == \
+                   [evaluate(formula, dict(model, **{variable: value}))
+                    for model in all_models(rest)]
+
+def test_synthesize(debug=False):
+    formula = Formula.parse('((p|q)->~(r&p))')
+    table = truth_table(formula, ['r', 'p', 'q'])
+    for synthesizer in [synthesize, synthesize_cnf]:
+        for minimize in [False, True]:
+            if debug:
+                print('Testing', synthesizer.__qualname__, 'of', table)
+            synthesized = synthesizer(['p', 'q', 'r'], table, minimize)
+            assert truth_table(synthesized, ['p', 'q', 'r']) == table
+
+def test_save_and_load(debug=False):
+    rng = Random(2)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'table.bin')
+        for n_variables in [0, 1, 3, 4, 12, 18]:
+            variables = ['x' + str(i) for i in range(n_variables)]
+            table = TruthTable(variables, rng.getrandbits(2 ** n_variables))
+            if debug:
+                print('Testing saving and loading a table over', variables)
+            table.save(path)
+            assert os.path.getsize(path) > (2 ** n_variables) // 8
+            with TruthTable.load(path) as loaded:
+                assert loaded.variables == table.variables
+                assert loaded.bits == table.bits
+                assert list(loaded) == list(table)
+                assert all(loaded[index] == table[index]
+                           for index in range(0, len(table), 7))
+                assert loaded == table and (loaded & ~table).bits == 0
+            try:
+                loaded[0]
+                assert False, 'Expected the closed mapping to be unreadable'
+            except ValueError:
+                pass
+
+def test_all(debug=False):
+    test_truth_table(debug)
+    test_operators(debug)
+    test_reorder_and_cofactor(debug)
+    test_synthesize(debug)
+    test_save_and_load(debug)
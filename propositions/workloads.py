@@ -0,0 +1,279 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/workloads.py
+
+"""Seeded random workloads of propositional formulas, proofs, and graphs."""
+
+from random import Random
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, Optional, \
+                   Sequence, TextIO, Union
+
+from propositions.syntax import *
+from propositions.proofs import *
+from propositions.axiomatic_systems import MP
+from propositions.reductions import Graph
+
+#: The default operator mix of random formulas, mapping each operator to its
+#: relative weight.
+DEFAULT_OPERATORS: Mapping[str, float] = {'~': 1, '&': 1, '|': 1, '->': 1}
+
+def variable_names(n_variables: int) -> List[str]:
+    """Computes the variable names used by random formulas.
+
+    Parameters:
+        n_variables: number of variable names.
+
+    Returns:
+        The variable names ``'x1'``, ..., ``'x``\\ `n_variables`\\ ``'``.
+    """
+    return ['x' + str(i) for i in range(1, n_variables + 1)]
+
+def random_formula(rng: Random, n_variables: int = 4, depth: int = 5,
+                   operators: Mapping[str, float] = DEFAULT_OPERATORS,
+                   leaf_probability: float = 0.25,
+                   constant_probability: float = 0.0) -> Formula:
+    """Generates a random formula.
+
+    Parameters:
+        rng: source of randomness.
+        n_variables: number of variable names, out of `variable_names`, that
+            the formula may contain.
+        depth: maximal depth of the formula. The formula is built without
+            recursion, so this may be arbitrarily large.
+        operators: mapping from each unary or binary operator that the formula
+            may contain to its relative weight.
+        leaf_probability: probability that a non-root node whose depth is
+            smaller than `depth` is a leaf rather than an operator.
+        constant_probability: probability that a leaf is a constant rather than
+            a variable name.
+
+    Returns:
+        The generated formula.
+    """
+    assert n_variables > 0 and depth >= 0
+    for operator in operators:
+        assert is_unary(operator) or is_binary(operator)
+    names = variable_names(n_variables)
+    choices, weights = list(operators), list(operators.values())
+    # Triplets of a pending operator, the maximal depth of its operands, and
+    # its operands that were already generated
+    stack: List[list] = []
+    remaining = depth
+    while True:
+        if remaining == 0 or \
+           (len(stack) > 0 and rng.random() < leaf_probability):
+            if rng.random() < constant_probability:
+                node = Formula(rng.choice(('T', 'F')))
+            else:
+                node = Formula(rng.choice(names))
+            while True:
+                if len(stack) == 0:
+                    return node
+                operator, remaining, operands = stack[-1]
+                operands.append(node)
+                if len(operands) < (1 if is_unary(operator) else 2):
+                    break
+                stack.pop()
+                node = Formula(operator, *operands)
+        else:
+            remaining -= 1
+            stack.append([rng.choices(choices, weights)[0], remaining, []])
+
+#: Tautology schemas over two formulas.
+TAUTOLOGY_SCHEMAS: Sequence[Callable[[Formula, Formula], Formula]] = (
+    lambda p, q: Formula('|', p, Formula('~', p)),
+    lambda p, q: Formula('->', p, p),
+    lambda p, q: Formula('->', p, Formula('->', q, p)),
+    lambda p, q: Formula('->', Formula('&', p, q), q),
+    lambda p, q: Formula('->', Formula('~', Formula('~', p)), p),
+    lambda p, q: Formula('->', Formula('->', p, q),
+                         Formula('->', Formula('~', q), Formula('~', p))))
+
+def random_tautology(rng: Random, n_variables: int = 4, depth: int = 5,
+                     operators: Mapping[str, float] = DEFAULT_OPERATORS,
+                     leaf_probability: float = 0.25) -> Formula:
+    """Generates a random tautology by instantiating a random schema out of
+    `TAUTOLOGY_SCHEMAS` with random formulas.
+
+    Parameters:
+        rng: source of randomness.
+        n_variables: number of variable names that the tautology may contain.
+        depth: maximal depth of the formulas with which the schema is
+            instantiated.
+        operators: operator mix of the formulas with which the schema is
+            instantiated.
+        leaf_probability: leaf probability of the formulas with which the
+            schema is instantiated.
+
+    Returns:
+        The generated tautology.
+    """
+    schema = rng.choice(TAUTOLOGY_SCHEMAS)
+    return schema(
+        random_formula(rng, n_variables, depth, operators, leaf_probability),
+        random_formula(rng, n_variables, depth, operators, leaf_probability))
+
+def random_proof(rng: Random, length: int = 10, n_variables: int = 4,
+                 depth: int = 3,
+                 operators: Mapping[str, float] = DEFAULT_OPERATORS) -> Proof:
+    """Generates a random valid proof via `~propositions.axiomatic_systems.MP`
+    of a random chain of implications.
+
+    Parameters:
+        rng: source of randomness.
+        length: number of formulas in the chain.
+        n_variables: number of variable names that the formulas may contain.
+        depth: maximal depth of the formulas in the chain.
+        operators: operator mix of the formulas in the chain.
+
+    Returns:
+        A proof of the inference rule with the assumptions `phi1`,
+        ``'(``\\ `phi1`\\ ``->``\\ `phi2`\\ ``)'``, ...,
+        ``'(``\\ `phi(length-1)`\\ ``->``\\ `phi(length)`\\ ``)'`` and the
+        conclusion `phi(length)`, for random formulas `phi1`, ...,
+        `phi(length)`, via the rule `~propositions.axiomatic_systems.MP`.
+    """
+    assert length > 0
+    chain = [random_formula(rng, n_variables, depth, operators)
+             for _ in range(length)]
+    assumptions = [chain[0]]
+    lines = [Proof.Line(chain[0])]
+    for i in range(1, length):
+        implication = Formula('->', chain[i - 1], chain[i])
+        assumptions.append(implication)
+        lines.append(Proof.Line(implication))
+        lines.append(Proof.Line(chain[i], MP, [len(lines) - 2,
+                                               len(lines) - 1]))
+    return Proof(InferenceRule(assumptions, chain[-1]), {MP}, lines)
+
+def random_cnf(rng: Random, n_variables: int, n_clauses: int,
+               clause_size: int = 3) -> Formula:
+    """Generates a random CNF formula, each of whose clauses is a disjunction
+    of literals of distinct variable names, each negated with probability
+    one half. For `clause_size` 3, such formulas with about ``4.26`` clauses
+    per variable name are the hardest to decide.
+
+    Parameters:
+        rng: source of randomness.
+        n_variables: number of variable names, out of `variable_names`, that
+            the formula may contain.
+        n_clauses: number of clauses.
+        clause_size: number of literals in each clause.
+
+    Returns:
+        The generated formula, a `balanced_formula` of the clauses.
+    """
+    assert 0 < clause_size <= n_variables and n_clauses > 0
+    names = variable_names(n_variables)
+    clauses = []
+    for _ in range(n_clauses):
+        literals = []
+        for name in rng.sample(names, clause_size):
+            literal = Formula(name)
+            literals.append(Formula('~', literal) if rng.random() < 0.5
+                            else literal)
+        clauses.append(balanced_formula('|', literals))
+    return balanced_formula('&', clauses)
+
+def random_graph(rng: Random, n_vertices: int, edge_probability: float,
+                 planted_colors: Optional[int] = None) -> Graph:
+    """Generates a random graph in which every edge is present independently.
+
+    Parameters:
+        rng: source of randomness.
+        n_vertices: number of vertices of the graph.
+        edge_probability: probability of each possible edge to be present.
+        planted_colors: if not ``None``, the vertices are first randomly
+            colored with this many colors, and only edges between vertices of
+            different colors may be present, so that the graph is colorable
+            with this many colors.
+
+    Returns:
+        The generated graph, each of whose edges ``(``\\ `u`\\ ``,``\\ `v`\\
+        ``)`` has `u` < `v`.
+    """
+    if planted_colors is not None:
+        colors = [rng.randrange(planted_colors) for _ in range(n_vertices + 1)]
+    edges = set()
+    for u in range(1, n_vertices + 1):
+        for v in range(u + 1, n_vertices + 1):
+            if (planted_colors is None or colors[u] != colors[v]) and \
+               rng.random() < edge_probability:
+                edges.add((u, v))
+    return n_vertices, frozenset(edges)
+
+def graph_to_string(graph: Graph) -> str:
+    """Computes a one-line string representation of the given graph.
+
+    Parameters:
+        graph: graph to represent.
+
+    Returns:
+        The number of vertices of the given graph, followed by its edges
+        ``'``\\ `u`\\ ``-``\\ `v`\\ ``'`` in sorted order, separated by
+        spaces.
+    """
+    n_vertices, edges = graph
+    return ' '.join([str(n_vertices)] +
+                    [str(u) + '-' + str(v) for u, v in sorted(edges)])
+
+def graph_from_string(string: str) -> Graph:
+    """Parses a one-line string representation of a graph.
+
+    Parameters:
+        string: string representation of a graph, as returned by
+            `graph_to_string`.
+
+    Returns:
+        The graph represented by the given string.
+    """
+    n_vertices, *edges = string.split()
+    return int(n_vertices), \
+           frozenset(tuple(int(vertex) for vertex in edge.split('-'))
+                     for edge in edges)
+
+def stream(generator: Callable[..., Any], seed: int, count: int,
+           **parameters: Any) -> Iterator[Any]:
+    """Lazily generates a reproducible corpus of random objects.
+
+    Parameters:
+        generator: function that generates a random object from a source of
+            randomness and the given keyword parameters, such as
+            `random_formula`.
+        seed: seed of the source of randomness.
+        count: number of objects to generate.
+        parameters: keyword parameters for the generator.
+
+    Returns:
+        An iterator over the `count` objects generated by successive calls to
+        the generator with a single source of randomness seeded by `seed`.
+    """
+    rng = Random(seed)
+    for _ in range(count):
+        yield generator(rng, **parameters)
+
+def write_lines(objects: Iterable[Any], file: Union[str, TextIO],
+                render: Callable[[Any], str] = str) -> int:
+    """Writes the given objects to a file, one per line, without collecting
+    them in memory.
+
+    Parameters:
+        objects: objects to write, e.g., as returned by `stream`.
+        file: name of the file to write to, or a text stream to write to.
+        render: function that computes the single-line string representation
+            of each object, e.g., `graph_to_string` for graphs.
+
+    Returns:
+        The number of objects written.
+    """
+    if isinstance(file, str):
+        with open(file, 'w') as output:
+            return write_lines(objects, output, render)
+    count = 0
+    for obj in objects:
+        file.write(render(obj))
+        file.write('\n')
+        count += 1
+    return count
@@ -0,0 +1,111 @@
+# This file is part of the materials accompanying the book
+# "Mathematical Logic through Python" by Gonczarowski and Nisan,
+# Cambridge University Press. Book site: www.LogicThruPython.org
+# (c) Yannai A. Gonczarowski and Noam Nisan, 2017-2022
+# File name: propositions/workloads_test.py
+
+"""Tests for the propositions.workloads module."""
+
+import io
+import os
+import tempfile
+from itertools import product
+from random import Random
+
+from propositions.compact import CompactFormula
+from propositions.reductions import is_graph
+from propositions.workloads import *
+
+def _depth(formula):
+    depth = 0
+    stack = [(formula, 0)]
+    while len(stack) > 0:
+        current, current_depth = stack.pop()
+        depth = max(depth, current_depth)
+        if hasattr(current, 'now'):
+            stack.append((current.now, current_depth + 1))
+        if hasattr(current, 'next'):
+            stack.append((current.next, current_depth + 1))
+    return depth
+
+def test_random_formula(debug=False):
+    for seed in range(20):
+        if debug:
+            print('Testing random formula with seed', seed)
+        formula = random_formula(Random(seed), 3, 6, {'~': 1, '->': 2})
+        assert formula == random_formula(Random(seed), 3, 6, {'~': 1, '->': 2})
+        assert _depth(formula) <= 6
+        assert formula.variables() <= {'x1', 'x2', 'x3'}
+        assert formula.operators() <= {'~', '->'}
+        assert Formula.parse(str(formula)) == formula
+    assert random_formula(Random(0), 1, 0) == Formula('x1')
+    deep = random_formula(Random(0), 2, 10000, {'~': 1}, 0)
+    assert _depth(deep) == 10000
+    assert random_formula(Random(0), 2, 3, constant_probability=1).variables() \
+           == set()
+
+def test_random_tautology(debug=False):
+    for seed in range(20):
+        if debug:
+            print('Testing random tautology with seed', seed)
+        compact = CompactFormula.from_formula(
+            random_tautology(Random(seed), 3, 3))
+        variables = sorted(compact.variables())
+        for values in product([False, True], repeat=len(variables)):
+            assert compact.evaluate(dict(zip(variables, values)))
+
+def test_random_proof(debug=False):
+    if debug:
+        print('Testing random proof')
+    proof = random_proof(Random(1), 5)
+    assert len(proof.lines) == 9
+    assert len(proof.statement.assumptions) == 5
+    assert proof.lines[-1].formula == proof.statement.conclusion
+    for number, line in enumerate(proof.lines):
+        if line.rule is None:
+            assert line.formula in proof.statement.assumptions
+        else:
+            first, second = line.assumptions
+            assert first < number and second < number
+            assert proof.lines[second].formula == \
+                   Formula('->', proof.lines[first].formula, line.formula)
+
+def test_random_graph(debug=False):
+    for seed in range(10):
+        if debug:
+            print('Testing random graph with seed', seed)
+        graph = random_graph(Random(seed), 12, 0.5)
+        assert is_graph(graph)
+        assert graph == random_graph(Random(seed), 12, 0.5)
+        assert graph_from_string(graph_to_string(graph)) == graph
+    assert random_graph(Random(0), 5, 1) == \
+           (5, {(u, v) for u in range(1, 6) for v in range(u + 1, 6)})
+    assert len(random_graph(Random(0), 20, 1, 1)[1]) == 0
+
+def test_stream(debug=False):
+    if debug:
+        print('Testing streaming random formulas to files')
+    formulas = list(stream(random_formula, 7, 30, n_variables=5, depth=4))
+    assert len(formulas) == 30
+    assert formulas == list(stream(random_formula, 7, 30, n_variables=5,
+                                   depth=4))
+    output = io.StringIO()
+    assert write_lines(formulas, output) == 30
+    assert output.getvalue().splitlines() == [str(formula)
+                                              for formula in formulas]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'graphs.txt')
+        assert write_lines(stream(random_graph, 3, 4, n_vertices=6,
+                                  edge_probability=0.3),
+                           path, graph_to_string) == 4
+        with open(path) as file:
+            assert [graph_from_string(line) for line in file] == \
+                   list(stream(random_graph, 3, 4, n_vertices=6,
+                               edge_probability=0.3))
+
+def test_all(debug=False):
+    test_random_formula(debug)
+    test_random_tautology(debug)
+    test_random_proof(debug)
+    test_random_graph(debug)
+    test_stream(debug)